@@ -1,8 +1,29 @@
-from fastapi.responses import JSONResponse
-from typing import Any, Optional
+import orjson
+from hashlib import blake2b
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from typing import Any, Iterable, Iterator, Optional
 from app.core.logx import logger
 
 
+# 流式列表响应攒够这么多字节再往外写一次，避免每条记录都单独发一个 chunk
+STREAM_CHUNK_BYTES = 64 * 1024
+# 流式列表迭代结束的哨兵
+_STREAM_END = object()
+
+
+def _dumps(content: Any) -> bytes:
+    # Pydantic 模型直接用模型类上建好的 pydantic-core 序列化器输出 JSON 字节，
+    # 不再先 model_dump 成 dict 再交给 orjson 走一遍
+    if isinstance(content, BaseModel):
+        return type(content).__pydantic_serializer__.to_json(content)
+    # orjson 在 C 里直接处理 datetime / UUID / Enum，调用方不必再先 jsonable_encoder；
+    # 嵌在 dict / list 里的 BaseModel 等类型交给 pydantic-core 转换
+    return orjson.dumps(content, default=to_jsonable_python, option=orjson.OPT_NON_STR_KEYS)
+
+
 # 目前先不区分 code/status_code 区别，后续需要更复杂的业务逻辑时再区分
 class BizResponse(JSONResponse):
     def __init__(
@@ -17,3 +38,76 @@ class BizResponse(JSONResponse):
             "code": code
         }
         super().__init__(content=content, status_code=status_code)
+
+    def render(self, content: Any) -> bytes:
+        # data 是模型时单独序列化后拼进外层结构，字段顺序与 dict 版本一致
+        if isinstance(content["data"], BaseModel):
+            return (
+                b'{"data":' + _dumps(content["data"])
+                + b',"msg":' + _dumps(content["msg"])
+                + b',"code":' + _dumps(content["code"]) + b"}"
+            )
+        return _dumps(content)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 可能带多个值 / 弱校验前缀 W/ / 通配符 *"""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def etag_response(request: Request, data: Any, max_age: int = 30) -> Response:
+    """
+    带 ETag 的成功响应（用于变化不频繁、体积较大的 GET 接口）：
+    - ETag 取响应体的 blake2b 摘要，内容不变则 ETag 不变
+    - 客户端带着相同的 If-None-Match 再来时直接返回 304，不再传输响应体
+    - Cache-Control: private，只允许浏览器本地缓存 max_age 秒
+    """
+    response = BizResponse(data=data)
+    etag = f'"{blake2b(response.body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
+
+
+def stream_list_response(total: int, items: Iterable[Any]) -> StreamingResponse:
+    """
+    分页列表的流式成功响应（用于单页可能很大的管理端列表）：
+    - 响应体与 BizResponse(data={"total", "count", "items"}) 结构一致，只是 count 写在 items 之后
+    - items 边迭代边序列化输出，不在内存里拼出完整列表和完整 JSON
+    - items 若依赖数据库会话，会话要活到响应发送完（get_db 默认就是请求级）
+    - 返回响应前先取出第一条：查询本身出错（SQL 错误 / 超时）时异常照常抛给全局处理器返回 500
+    - 状态码发出后中途出错无法再改成 500：记录日志，并以 code=500 的结尾收束，保证响应仍是完整 JSON，
+      客户端按 code 判断这一页不完整
+    """
+    it = iter(items)
+    first = next(it, _STREAM_END)
+
+    def body() -> Iterator[bytes]:
+        buf = bytearray(b'{"data":{"total":' + _dumps(total) + b',"items":[')
+        count = 0
+        item = first
+        try:
+            while item is not _STREAM_END:
+                # 先序列化完整条目再写入，序列化失败时 buf 里不会留下半个条目或多余的逗号
+                chunk = _dumps(item)
+                buf += b"," + chunk if count else chunk
+                count += 1
+                if len(buf) >= STREAM_CHUNK_BYTES:
+                    yield bytes(buf)
+                    buf.clear()
+                item = next(it, _STREAM_END)
+        except Exception as e:
+            logger.exception(f"stream list aborted after {count} items")
+            buf += b'],"count":' + _dumps(count) + b'},"msg":' + _dumps(f"stream aborted: {e}") + b',"code":500}'
+            yield bytes(buf)
+            return
+        buf += b'],"count":' + _dumps(count) + b'},"msg":"success","code":200}'
+        yield bytes(buf)
+
+    return StreamingResponse(body(), media_type="application/json")
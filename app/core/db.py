@@ -1,6 +1,7 @@
 import logging
+import os
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from contextlib import contextmanager
 
 
@@ -33,4 +34,14 @@ def transaction(db: Session):
     except Exception as e:
         logging.exception(e)
         db.rollback()
-        raise
\ No newline at end of file
+        raise
+
+
+# 列表查询的懒加载保护：开启时列表里没有预先加载的关系一旦被访问就直接报错，
+# 防止以后序列化多读一个字段又悄悄变回 N+1；线上如需关闭，设置环境变量 STRICT_LOADING=0
+STRICT_LOADING = os.getenv("STRICT_LOADING", "1") == "1"
+
+
+def strict_loading_options() -> tuple:
+    """返回列表查询追加的 raiseload 选项（STRICT_LOADING 关闭时为空）"""
+    return (raiseload("*"),) if STRICT_LOADING else ()
@@ -0,0 +1,79 @@
+from typing import Dict, Type
+
+from fastapi import FastAPI, Request
+from sqlalchemy.exc import StatementError
+
+from app.core.biz_response import BizResponse
+from app.core.logx import logger
+from app.core.exceptions import (
+    DomainError,
+    UserNotFound,
+    PostNotFound,
+    CommentNotFound,
+    FollowYourselfError,
+    AlreadyFollowingError,
+    NotFollowingError,
+    PasswordMismatchError,
+    InvalidReviewStatusTransition,
+    ForbiddenAction,
+    CommentNotSoftDeletedError,
+    AlreadyLikedError,
+    NotLikedError,
+    HardDeleteFollowRequiresSoftDeleteError,
+    InvalidCursorError,
+)
+
+
+# 业务异常 -> HTTP 状态码（同时作为业务 code 返回）；未列出的 DomainError 子类按 MRO 找最近的父类，兜底 400
+DOMAIN_ERROR_STATUS: Dict[Type[DomainError], int] = {
+    UserNotFound: 404,
+    PostNotFound: 404,
+    CommentNotFound: 404,
+    FollowYourselfError: 400,
+    AlreadyFollowingError: 400,
+    NotFollowingError: 400,
+    PasswordMismatchError: 400,
+    InvalidReviewStatusTransition: 400,
+    ForbiddenAction: 400,
+    CommentNotSoftDeletedError: 400,
+    HardDeleteFollowRequiresSoftDeleteError: 400,
+    InvalidCursorError: 400,
+    AlreadyLikedError: 409,
+    NotLikedError: 409,
+}
+
+
+def _status_of(exc: DomainError) -> int:
+    for cls in type(exc).__mro__:
+        status_code = DOMAIN_ERROR_STATUS.get(cls)
+        if status_code is not None:
+            return status_code
+    return 400
+
+
+async def domain_error_handler(_: Request, exc: DomainError) -> BizResponse:
+    """可预期的业务异常：直接按映射返回，不打印堆栈"""
+    return BizResponse(data=None, msg=str(exc), status_code=_status_of(exc))
+
+
+async def statement_error_handler(request: Request, exc: StatementError) -> BizResponse:
+    """绑定参数阶段的 ValueError（如 UUIDBinary 收到非法的 UUID 字符串）按参数错误返回 400，其余仍按未预期异常处理"""
+    if isinstance(exc.orig, ValueError):
+        return BizResponse(data=None, msg=f"invalid parameter: {exc.orig}", status_code=400)
+    return await unhandled_error_handler(request, exc)
+
+
+async def unhandled_error_handler(request: Request, exc: Exception) -> BizResponse:
+    """未预期的异常：记录堆栈后统一返回 500"""
+    logger.exception(f"{request.method} {request.url.path} error")
+    return BizResponse(data=None, msg=str(exc), status_code=500)
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """
+    注册全局异常处理：路由函数只管调用业务层并返回 BizResponse，
+    不再在每个接口里重复 try/except
+    """
+    app.add_exception_handler(DomainError, domain_error_handler)
+    app.add_exception_handler(StatementError, statement_error_handler)
+    app.add_exception_handler(Exception, unhandled_error_handler)
@@ -1,132 +1,175 @@
 # domain_exceptions.py
-from fastapi import HTTPException, status
-from typing import Optional
+from typing import Any, Optional
 
-class UserNotFound(Exception):
+
+class DomainError(Exception):
+    """
+    业务异常基类：
+    - __init__ 只保存原始字段，不做字符串格式化
+    - 错误信息在 __str__ / message 被真正读取时才生成
+    - 固定的默认信息定义为类属性 _DEFAULT_MSG，所有实例共享同一个字符串
+    - 子类把自己的原始字段按构造参数顺序传给 fields，与 message 一起存进 args，
+      这样 repr(e) 能看到字段，pickle 时 cls(*args) 也能重建实例
+      （因此子类构造参数统一是「字段..., message=None」的顺序）
+    """
+
+    _DEFAULT_MSG = ""
+
+    def __init__(self, message: Optional[str] = None, *fields: Any):
+        self._message = message
+        super().__init__(*fields, message)
+
+    def _default_message(self) -> str:
+        return self._DEFAULT_MSG
+
+    def __str__(self) -> str:
+        return self._message or self._default_message()
+
+    @property
+    def message(self) -> str:
+        return str(self)
+
+
+class UserNotFound(DomainError):
     """
     在需要用户存在的场景下未找到对应用户时抛出：
     - 例如 get_user_by_uid / get_user_profile 等
     """
 
+    _DEFAULT_MSG = "User not found."
+
     def __init__(self, user_id: Optional[str] = None, message: Optional[str] = None):
-        if message:
-            self.message = message
-        elif user_id is not None:
-            self.message = f"User with id '{user_id}' not found."
-        else:
-            self.message = "User not found."
+        self.user_id = user_id
+        super().__init__(message, user_id)
 
-        super().__init__(self.message)
+    def _default_message(self) -> str:
+        if self.user_id is not None:
+            return f"User with id '{self.user_id}' not found."
+        return self._DEFAULT_MSG
 
 
-class FollowYourselfError(Exception):
+class FollowYourselfError(DomainError):
     """
     尝试关注自己时抛出：
     - current_uid == target_uid
     """
 
+    _DEFAULT_MSG = "You cannot follow yourself."
+
     def __init__(self, user_id: Optional[str] = None, message: Optional[str] = None):
-        if message:
-            self.message = message
-        elif user_id is not None:
-            self.message = f"User '{user_id}' cannot follow themselves."
-        else:
-            self.message = "You cannot follow yourself."
+        self.user_id = user_id
+        super().__init__(message, user_id)
 
-        super().__init__(self.message)
+    def _default_message(self) -> str:
+        if self.user_id is not None:
+            return f"User '{self.user_id}' cannot follow themselves."
+        return self._DEFAULT_MSG
 
 
-class AlreadyFollowingError(Exception):
+class AlreadyFollowingError(DomainError):
     """
     重复关注同一个用户时抛出：
     - 在业务上你不希望“幂等返回”，而是明确提示已经关注
     """
 
+    _DEFAULT_MSG = "Already following this user."
+
     def __init__(
         self,
         user_id: Optional[str] = None,
         target_id: Optional[str] = None,
         message: Optional[str] = None,
     ):
-        if message:
-            self.message = message
-        elif user_id is not None and target_id is not None:
-            self.message = f"User '{user_id}' is already following '{target_id}'."
-        else:
-            self.message = "Already following this user."
+        self.user_id = user_id
+        self.target_id = target_id
+        super().__init__(message, user_id, target_id)
 
-        super().__init__(self.message)
+    def _default_message(self) -> str:
+        if self.user_id is not None and self.target_id is not None:
+            return f"User '{self.user_id}' is already following '{self.target_id}'."
+        return self._DEFAULT_MSG
 
 
-class NotFollowingError(Exception):
+class NotFollowingError(DomainError):
     """
     在取消关注时发现当前并未关注目标用户时抛出：
     - 用于区分“正常取消成功”和“本来就没关注”
     """
 
+    _DEFAULT_MSG = "Not following this user."
+
     def __init__(
         self,
         user_id: Optional[str] = None,
         target_id: Optional[str] = None,
         message: Optional[str] = None,
     ):
-        if message:
-            self.message = message
-        elif user_id is not None and target_id is not None:
-            self.message = f"User '{user_id}' is not following '{target_id}'."
-        else:
-            self.message = "Not following this user."
+        self.user_id = user_id
+        self.target_id = target_id
+        super().__init__(message, user_id, target_id)
 
-        super().__init__(self.message)
+    def _default_message(self) -> str:
+        if self.user_id is not None and self.target_id is not None:
+            return f"User '{self.user_id}' is not following '{self.target_id}'."
+        return self._DEFAULT_MSG
 
-class PasswordMismatchError(Exception):
+class PasswordMismatchError(DomainError):
     """旧密码校验失败"""
-    def __init__(self, message="Old password does not match"):
-        super().__init__(message)
+    _DEFAULT_MSG = "Old password does not match"
 
-class PostNotFound(Exception):
+class PostNotFound(DomainError):
     """找不到帖子"""
+    _DEFAULT_MSG = "post not found"
+
     def __init__(self, pid: Optional[str] = None, message: Optional[str] = None):
-        if message:
-            super().__init__(message)
-        else:
-            super().__init__(f"post {pid} not found")
+        self.pid = pid
+        super().__init__(message, pid)
 
+    def _default_message(self) -> str:
+        if self.pid is None:
+            return self._DEFAULT_MSG
+        return f"post {self.pid} not found"
 
-class InvalidReviewStatusTransition(Exception):
+
+class InvalidReviewStatusTransition(DomainError):
     """帖子审核状态非法流转"""
     def __init__(self, message: str):
         super().__init__(message)
 
-class ForbiddenAction(Exception):
+class ForbiddenAction(DomainError):
     """帖子发布状态非法流转"""
-    def __init__(self, message="Cannot change the publish status of published."):
-        super().__init__(message)
+    _DEFAULT_MSG = "Cannot change the publish status of published."
+
+class CommentNotFound(DomainError):
+    """找不到评论"""
+    _DEFAULT_MSG = "comment not found"
 
-class CommentNotFound(Exception):
-    """找不到帖子"""
     def __init__(self, cid: Optional[str] = None, message: Optional[str] = None):
-        if message:
-            super().__init__(message)
-        else:
-            super().__init__(f"comment {cid} not found")
+        self.cid = cid
+        super().__init__(message, cid)
+
+    def _default_message(self) -> str:
+        if self.cid is None:
+            return self._DEFAULT_MSG
+        return f"comment {self.cid} not found"
 
-class CommentNotSoftDeletedError(Exception):
+class CommentNotSoftDeletedError(DomainError):
     """只有已软删除的评论才允许被硬删除"""
-    def __init__(self, message: str = "comment must be soft-deleted before hard delete"):
-        self.message = message
-        super().__init__(message)
+    _DEFAULT_MSG = "comment must be soft-deleted before hard delete"
 
-class AlreadyLikedError(Exception):
+class AlreadyLikedError(DomainError):
     """用户已经对该目标点过赞（未取消），用于阻止重复点赞导致的计数增加"""
-    def __init__(self, user_id: str, target_type, target_id: str):
+    def __init__(self, user_id: str, target_type, target_id: str, message: Optional[str] = None):
         self.user_id = user_id
         self.target_type = target_type
         self.target_id = target_id
-        super().__init__(f"user {user_id} already liked {target_type} {target_id}")
+        super().__init__(message, user_id, target_type, target_id)
+
+    def _default_message(self) -> str:
+        return f"user {self.user_id} already liked {self.target_type} {self.target_id}"
 
 
-class NotLikedError(Exception):
+class NotLikedError(DomainError):
     """
     取消点赞操作失败：
     - 情况 1：用户从未对该目标点赞
@@ -134,17 +177,18 @@ class NotLikedError(Exception):
     """
 
     def __init__(self, user_id: str, target_type, target_id: str, message: str = None):
-        if message is None:
-            message = (
-                f"user {user_id} has not liked target_type={target_type}, "
-                f"target_id={target_id}"
-            )
         self.user_id = user_id
         self.target_type = target_type
         self.target_id = target_id
-        super().__init__(message)
+        super().__init__(message, user_id, target_type, target_id)
+
+    def _default_message(self) -> str:
+        return (
+            f"user {self.user_id} has not liked target_type={self.target_type}, "
+            f"target_id={self.target_id}"
+        )
 
-class HardDeleteFollowRequiresSoftDeleteError(Exception):
+class HardDeleteFollowRequiresSoftDeleteError(DomainError):
     """
     当管理员尝试硬删除关注记录时：
     - 若该关注关系未处于软删除状态（deleted_at is NULL）
@@ -153,9 +197,21 @@ class HardDeleteFollowRequiresSoftDeleteError(Exception):
     用于业务层阻止不正确的删除流程
     """
 
-    def __init__(self, user_id: str, followed_user_id: str):
+    def __init__(self, user_id: str, followed_user_id: str, message: Optional[str] = None):
         self.user_id = user_id
         self.followed_user_id = followed_user_id
-        super().__init__(
-            f"follow relation {user_id} -> {followed_user_id} must be soft-deleted before hard delete"
+        super().__init__(message, user_id, followed_user_id)
+
+    def _default_message(self) -> str:
+        return (
+            f"follow relation {self.user_id} -> {self.followed_user_id} "
+            "must be soft-deleted before hard delete"
         )
+
+
+class InvalidCursorError(DomainError):
+    """
+    分页游标无法解析时抛出（被篡改 / 截断的 cursor 参数）
+    """
+
+    _DEFAULT_MSG = "Invalid pagination cursor."
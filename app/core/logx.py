@@ -105,8 +105,11 @@ def logger_initiate(log_level=logging.INFO, is_console=True, is_file=True, is_co
     return _logger
 
 
-# 初始化 logger
-logger = logger_initiate(log_level=logging.INFO, is_console=True, is_file=True, is_colorful=True)
+# 初始化 logger：级别由环境变量 LOG_LEVEL 控制（默认 INFO，排查问题时设为 DEBUG），启动时只设置一次
+LOG_LEVEL = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.INFO
+logger = logger_initiate(log_level=LOG_LEVEL, is_console=True, is_file=True, is_colorful=True)
 
 
 # 动态绑定 is_debug 方法
@@ -0,0 +1,96 @@
+import base64
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import and_, or_, func
+
+from app.core.exceptions import InvalidCursorError
+
+
+""" 游标（keyset）分页:
+
+    OFFSET 分页翻到第 N 页时，数据库要先扫过前面 N * page_size 行再丢掉，越往后越慢；
+    游标分页记住上一页最后一行的 (created_at, _id)，下一页直接从索引上这个位置接着读。
+
+    - cursor 对前端是不透明字符串，由 encode_cursor 生成、decode_cursor 解析
+    - 排序必须是 (created_at, _id)，_id 用来区分同一时间戳的多行
+    - 只按自增 _id 排序的列表（帖子、首页信息流）用 *_id_cursor 系列，游标里只有 _id
+"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """把一行的 (created_at, _id) 编码成游标字符串"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解析游标字符串，格式不对时抛 InvalidCursorError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError as e:
+        raise InvalidCursorError(message=f"invalid cursor: {cursor}") from e
+
+
+def keyset_filter(created_col, id_col, cursor: str, descending: bool = False):
+    """
+    生成“排在游标之后”的过滤条件：
+    - 升序：(created_at, _id) > 游标
+    - 降序：(created_at, _id) < 游标
+    """
+    created_at, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
+    return or_(created_col > created_at, and_(created_col == created_at, id_col > row_id))
+
+
+def next_cursor_of(rows: list, page_size: int, key: Callable = lambda row: row) -> Optional[str]:
+    """
+    rows 是多取一行（limit page_size + 1）的查询结果：
+    - 多出来的那行存在说明还有下一页，返回本页最后一行的游标，并把多的那行删掉
+    - 否则返回 None
+    - key 从结果行里取出带 created_at / _id 的实体（多实体查询时结果行是元组）
+    """
+    if len(rows) <= page_size:
+        return None
+    del rows[page_size:]
+    last = key(rows[-1])
+    return encode_cursor(last.created_at, last._id)
+
+
+def encode_id_cursor(row_id: int) -> str:
+    """把一行的自增 _id 编码成游标字符串"""
+    return base64.urlsafe_b64encode(str(row_id).encode()).decode()
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """解析只含 _id 的游标字符串，格式不对时抛 InvalidCursorError"""
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError as e:
+        raise InvalidCursorError(message=f"invalid cursor: {cursor}") from e
+
+
+def id_keyset_filter(id_col, cursor: str, descending: bool = False):
+    """按唯一自增列排序时的“排在游标之后”条件：升序 _id > 游标，降序 _id < 游标"""
+    row_id = decode_id_cursor(cursor)
+    return id_col < row_id if descending else id_col > row_id
+
+
+def next_id_cursor_of(rows: list, page_size: int, id_of: Callable = lambda row: row._id) -> Optional[str]:
+    """同 next_cursor_of，游标只取本页最后一行的 id_of(row)"""
+    if len(rows) <= page_size:
+        return None
+    del rows[page_size:]
+    return encode_id_cursor(id_of(rows[-1]))
+
+
+def count_total(query, id_col) -> int:
+    """
+    分页返回的 total：去掉排序，只 COUNT 主键
+    - Query.count() 会把整条实体查询（所有列 + ORDER BY）包成子查询再数
+    - 这里直接 SELECT COUNT(_id) ... WHERE ...，InnoDB 二级索引自带主键，条件列都在索引里时不用回表
+    """
+    return query.order_by(None).with_entities(func.count(id_col)).scalar()
@@ -1,8 +1,21 @@
-from argon2 import PasswordHasher
+import os
+
+from argon2 import PasswordHasher, Type
 from argon2.exceptions import VerifyMismatchError
 
+# Argon2 参数，可通过环境变量按部署机器调整（默认取 OWASP 推荐的最低配置）
+# 建议用 scripts/argon2_refine.py 在目标机器上实测后再设置
+_ARGON2_PARAMS = {
+    "time_cost": int(os.getenv("ARGON2_T", "2")),
+    "memory_cost": int(os.getenv("ARGON2_M", "19456")),  # 单位 KiB
+    "parallelism": int(os.getenv("ARGON2_P", "1")),
+    "hash_len": 32,
+    "type": Type.ID,
+}
+
 # 可以全局复用一个实例
-pwd_hasher = PasswordHasher()
+# 校验时参数从已存储的哈希串中解析，调整参数不影响旧哈希的校验
+pwd_hasher = PasswordHasher(**_ARGON2_PARAMS)
 
 def hash_password(plain_password: str) -> str:
     """
@@ -18,4 +31,5 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         pwd_hasher.verify(hashed_password, plain_password)
         return True
     except VerifyMismatchError:
-        return False
\ No newline at end of file
+        return False
+
@@ -1,5 +1,20 @@
 from datetime import datetime, timezone, timedelta
 
-def now_utc8():
-    """返回东八区的当前时间"""
-    return datetime.now(timezone(timedelta(hours=8)))
\ No newline at end of file
+# 东八区时区对象只创建一次，避免每次调用都新建 timezone/timedelta
+_UTC8 = timezone(timedelta(hours=8))
+
+def now_utc() -> datetime:
+    """返回当前 UTC 时间（不带时区），数据库会话 time_zone 为 +00:00，写库统一用它"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def to_utc8(value: datetime) -> datetime:
+    """把库里读出的 UTC 时间转成东八区时间，只在响应出口（schemas）转换一次"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(_UTC8)
+
+def to_db_utc(value: datetime) -> datetime:
+    """把外部传入的时间转成写库用的 UTC 时间；不带时区的按东八区理解"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=_UTC8)
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
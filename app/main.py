@@ -1,7 +1,74 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy.orm import configure_mappers
 from app.routers import users, follows, posts, comments, likes
+from app.service import like_svc, follow_svc
+from app.storage.database import SessionLocal
+from app.storage.post_stats.SQLAlchemyPostStatsRepository import SQLAlchemyPostStatsRepository
+from app.storage.user_stats.SQLAlchemyUserStatsRepository import SQLAlchemyUserStatsRepository
+from app.core.redis_client import redis_client
+from app.core.exception_handlers import register_exception_handlers
+from app.core.logx import logger
+
+# 响应体超过这个字节数才 gzip 压缩：列表 JSON 键名大量重复，压缩率很高；小响应压缩不划算
+GZIP_MINIMUM_SIZE = 1024
+# 压缩级别取中间值：再往上压缩率提升很少，CPU 开销明显增加
+GZIP_COMPRESS_LEVEL = 5
+
+# 异步计数（帖子点赞分片、Redis 里的关注 / 粉丝增量）汇总落库的间隔（秒）
+COUNTER_FLUSH_INTERVAL_SECONDS = 5
+
+
+def _flush_like_shards_once() -> None:
+    db = SessionLocal()
+    try:
+        like_svc.flush_post_like_shards(SQLAlchemyPostStatsRepository(db))
+    finally:
+        db.close()
+
+
+def _flush_user_stats_once() -> None:
+    db = SessionLocal()
+    try:
+        follow_svc.flush_user_stats_deltas(SQLAlchemyUserStatsRepository(db), redis_client)
+    finally:
+        db.close()
+
+
+async def _flush_counters_forever() -> None:
+    while True:
+        await asyncio.sleep(COUNTER_FLUSH_INTERVAL_SECONDS)
+        # 同步数据库 / Redis 调用放到线程里执行，不阻塞事件循环；两类计数互不影响
+        for name, flush_once in (("like shards", _flush_like_shards_once), ("user stats", _flush_user_stats_once)):
+            try:
+                await asyncio.to_thread(flush_once)
+            except Exception as e:
+                logger.warning(f"flush {name} failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # 启动时统一注册全部模型并完成 mapper 配置，避免由第一个请求承担这部分开销
+    import app.models  # noqa: F401
+    configure_mappers()
+    flush_task = asyncio.create_task(_flush_counters_forever())
+    yield
+    flush_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await flush_task
+
+
+# 接口统一返回 BizResponse（内部已用 orjson / pydantic-core 序列化），不再设置默认响应类
+app = FastAPI(title="Forum Management System", lifespan=lifespan)
+
+# 客户端带 Accept-Encoding: gzip 时压缩响应体；流式列表响应边生成边压缩
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
 
-app = FastAPI(title="Forum Management System")
+# 业务异常 / 未预期异常统一在这里转换成 BizResponse
+register_exception_handlers(app)
 
 # 注册路由
 app.include_router(users.users_router)
@@ -7,4 +7,6 @@ import app.models.post_content
 import app.models.post_stats
 import app.models.comment
 import app.models.comment_content
-import app.models.like
\ No newline at end of file
+import app.models.like
+import app.models.feed_item
+import app.models.post_like_shard
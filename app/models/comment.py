@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, UniqueConstraint, Index, SmallInteger
-from sqlalchemy.orm import relationship
-import uuid
+from sqlalchemy import Column, Integer, TIMESTAMP, ForeignKey, UniqueConstraint, Index, SmallInteger, func, text, and_
+from sqlalchemy.orm import relationship, foreign
 from app.models.base import Base
+from app.models.types import UUIDBinary
+from app.models.like import Like, LikeTargetType
 from enum import IntEnum
-from app.core.time import now_utc8
 
 # 评论的审核制度采用 先发后审：用户评论直接展示，后台异步审核，检测到违规在前端折叠或删除
 # 后续可以采用人工加机器结合的方式审
@@ -24,12 +24,12 @@ class Comment(Base):
 
         CREATE TABLE IF NOT EXISTS comments (
             _id INT AUTO_INCREMENT PRIMARY KEY,               -- 系统主键（自增）
-            cid VARCHAR(36) NOT NULL UNIQUE,                  -- 业务主键（UUID，对外使用）
-            post_id VARCHAR(36) NOT NULL,                     -- 评论ID（FK -> posts.pid）
+            cid BINARY(16) NOT NULL UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID 二进制存储，由数据库生成）
+            post_id BINARY(16)  NOT NULL,                     -- 评论ID（FK -> posts.pid）
             comment_count INT DEFAULT 0,                      -- 评论的评论数
-            author_id VARCHAR(36) NOT NULL,                   -- 评论作者业务主键（FK -> users.uid）
-            parent_id VARCHAR(36) NULL,                       -- 父评论业务主键
-            root_id VARCHAR(36) NULL,                         -- 顶级评论业务主键（整楼聚合）
+            author_id BINARY(16)  NOT NULL,                   -- 评论作者业务主键（FK -> users.uid）
+            parent_id BINARY(16) NULL,                        -- 父评论业务主键
+            root_id BINARY(16) NULL,                          -- 顶级评论业务主键（整楼聚合）
             like_count INT NOT NULL DEFAULT 0,                -- 评论点赞数（物化计数）
             status TINYINT NOT NULL DEFAULT 0,                -- 0 正常 / 1 折叠
             review_status TINYINT NOT NULL DEFAULT 0,         -- 0 待审 / 1 通过 / 2 拒绝
@@ -37,7 +37,7 @@ class Comment(Base):
             reviewed_at TIMESTAMP NULL,                                                           -- 审核时间
             deleted_at TIMESTAMP NULL,                                                            -- 软删除
 
-            FOREIGN KEY (post_id) REFERENCES posts(pid),      -- 外键关联到用户表
+            FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE,  -- 外键关联到帖子表（硬删帖子时级联删除评论）
             FOREIGN KEY (author_id) REFERENCES users(uid)     -- 外键关联到用户表
         );
     """
@@ -46,18 +46,18 @@ class Comment(Base):
 
     # 系统主键（自增）
     _id = Column(Integer, primary_key=True, autoincrement=True)
-    # 业务主键（UUID，对外使用）
-    cid = Column(String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    # 业务主键（UUID，对外使用），由 MySQL 在插入时生成，写入后通过 refresh 取回
+    cid = Column(UUIDBinary, nullable=False, server_default=text("(UUID_TO_BIN(UUID()))"))
     # 评论ID
-    post_id = Column(String(36), ForeignKey("posts.pid"), nullable=False)
+    post_id = Column(UUIDBinary, ForeignKey("posts.pid", ondelete="CASCADE"), nullable=False)
     # 评论数
     comment_count = Column(Integer, default=0)
     # 评论作者 ID
-    author_id = Column(String(36), ForeignKey("users.uid"), nullable=False)
+    author_id = Column(UUIDBinary, ForeignKey("users.uid"), nullable=False)
     # 父评论 ID（可为空）
-    parent_id = Column(String(36), nullable=True)
+    parent_id = Column(UUIDBinary, nullable=True)
     # 顶级评论 ID
-    root_id = Column(String(36), nullable=True)
+    root_id = Column(UUIDBinary, nullable=True)
     # 点赞数
     like_count = Column(Integer, default=0, nullable=False)
     # 评论状态（正常/折叠）
@@ -65,23 +65,40 @@ class Comment(Base):
     # 审核状态（待审/通过/拒绝）
     review_status = Column(SmallInteger, default=ReviewStatus.PENDING.value, nullable=False)
     # 审核时间
-    reviewed_at = Column(TIMESTAMP(timezone=True), nullable=True)
-    created_at = Column(TIMESTAMP(timezone=True), default=now_utc8)  # 创建时间
+    reviewed_at = Column(TIMESTAMP, nullable=True)
+    # 创建时间（由数据库 DEFAULT CURRENT_TIMESTAMP 填充）
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
     # 软删除时间戳
-    deleted_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    deleted_at = Column(TIMESTAMP, nullable=True)
 
     # 反向引用：该评论区的作者
-    author = relationship("User", back_populates="comments")
+    # 审核员 / 管理员列表会序列化 author，用 selectin 把一页评论的作者合并成一次 IN 查询
+    author = relationship("User", back_populates="comments", lazy="selectin")
     # 反向引用：该帖子的评论总览信息（包含帖子ID），可能希望通过评论跳转帖子
+    # 目前没有接口序列化 post，保持按需懒加载，避免每次查评论都多查一次帖子
     post = relationship("Post", back_populates="comments")
     # 单向引用：该评论区的评论内容
-    comment_content = relationship("CommentContent", uselist=False, cascade="all, delete-orphan")
+    # passive_deletes：删除评论时交给数据库 ON DELETE CASCADE，不再先 SELECT 出内容逐条 DELETE
+    comment_content = relationship("CommentContent", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
     # 单向引用：该评论区的点赞
-    likes = relationship("Like", primaryjoin="and_(Like.target_id == Comment.cid, Like.target_type == 1)", foreign_keys="Like.target_id", viewonly=True,)
+    # 直接用表达式声明连接条件，避免映射配置时再解析字符串
+    likes = relationship(
+        Like,
+        primaryjoin=and_(foreign(Like.target_id) == cid, Like.target_type == LikeTargetType.COMMENT.value),
+        viewonly=True,
+    )
 
     __table_args__ = (
         UniqueConstraint('cid', name='unique_cid'),
         Index("idx_comments_author", "author_id"),
         Index("idx_comments_parent", "parent_id"),
-        Index("idx_comments_root", "root_id"),
+        # 以下两个索引服务按帖子 / 按楼取评论：
+        # - deleted_at 紧跟等值列：用户 / 审核员查询的 deleted_at IS NULL 直接参与索引定位，
+        #   定位后的区间已按 created_at（及隐含的主键 _id）有序，分页不再 filesort
+        # - status / review_status 放在末尾，剩余可见性条件在索引上判断（ICP），被过滤掉的行不用回表
+        Index("idx_comments_post_cover", "post_id", "deleted_at", "created_at", "status", "review_status"),
+        Index("idx_comments_root_cover", "root_id", "deleted_at", "created_at", "status", "review_status"),
+        # 前台帖子评论列表专用：只取一级评论（parent_id IS NULL）且 status = NORMAL，
+        # 等值条件都排在 created_at 之前，定位后直接按时间顺序读；review_status != REJECTED 是范围条件，放末尾走 ICP
+        Index("idx_comments_listing", "post_id", "parent_id", "status", "deleted_at", "created_at", "review_status"),
     )
\ No newline at end of file
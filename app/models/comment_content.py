@@ -1,20 +1,17 @@
-from sqlalchemy import Column, Integer, String, SmallInteger, TIMESTAMP, Text, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.orm import relationship
-import datetime
-import uuid
+from sqlalchemy import Column, Integer, TIMESTAMP, Text, ForeignKey, FetchedValue, func, text
 from app.models.base import Base
-from app.core.time import now_utc8
+from app.models.types import UUIDBinary
 class CommentContent(Base):
     """ 评论内容表，存储评论的实际内容。
     
         CREATE TABLE IF NOT EXISTS comment_contents (
             _id INT AUTO_INCREMENT PRIMARY KEY,             -- 系统主键（自增）
-            ccid VARCHAR(36) NOT NULL UNIQUE,               -- 业务主键（UUID，对外使用）
-            comment_id VARCHAR(36) NOT NULL,                -- 评论ID（FK -> comments.cid)
+            ccid BINARY(16) NOT NULL UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+            comment_id BINARY(16) NOT NULL,                 -- 评论ID（FK -> comments.cid)
             content TEXT NOT NULL,                          -- 评论内容
             created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,                              -- 创建时间
             updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 更新时间
-            FOREIGN KEY (comment_id) REFERENCES comments(cid)  -- 外键关联评论内容表
+            FOREIGN KEY (comment_id) REFERENCES comments(cid) ON DELETE CASCADE  -- 外键关联评论表
         );
     """
     
@@ -23,9 +20,10 @@ class CommentContent(Base):
     # 系统主键（自增）
     _id = Column(Integer, primary_key=True, autoincrement=True)
     # 业务主键（UUID，对外使用）
-    ccid = Column(String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    ccid = Column(UUIDBinary, unique=True, nullable=False, server_default=text("(UUID_TO_BIN(UUID()))"))
     # 评论区 ID
-    comment_id = Column(String(36), ForeignKey("comments.cid"), nullable=False)
+    comment_id = Column(UUIDBinary, ForeignKey("comments.cid", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)  # 评论内容
-    created_at = Column(TIMESTAMP(timezone=True), default=now_utc8)  # 创建时间
-    updated_at = Column(TIMESTAMP(timezone=True), default=now_utc8, onupdate=now_utc8)  # 更新时间
\ No newline at end of file
+    # 时间戳由数据库生成：DEFAULT CURRENT_TIMESTAMP / ON UPDATE CURRENT_TIMESTAMP
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)  # 创建时间
+    updated_at = Column(TIMESTAMP, server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)  # 更新时间
\ No newline at end of file
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Index, FetchedValue, func
+from app.models.base import Base
+from app.models.types import UUIDBinary
+from app.models.post_content import POST_TITLE_MAX_LEN
+
+class FeedItem(Base):
+    """ 首页信息流物化表，每行就是一张渲染好的帖子卡片。
+
+        只保存「对他人可见」的帖子（未软删 + 已发布 + 审核通过 + 公开），
+        由 posts / post_contents / post_stats 上的触发器维护（见 scripts/init_db.sql），
+        应用代码只读不写；首页列表从多表关联变成单表按 post_seq 倒序的范围扫描。
+
+        CREATE TABLE IF NOT EXISTS feed_items (
+            _id INT AUTO_INCREMENT PRIMARY KEY,              -- 系统主键（自增）
+            pid BINARY(16)  NOT NULL UNIQUE,                 -- 帖子业务主键（FK -> posts.pid）
+            post_seq INT NOT NULL,                           -- 帖子系统主键 posts._id，用于与原列表一致的排序
+            author_id BINARY(16)  NOT NULL,                  -- 作者 ID
+            title VARCHAR(160) NOT NULL DEFAULT '',          -- 帖子标题
+            like_count INT NOT NULL DEFAULT 0,               -- 点赞数
+            comment_count INT NOT NULL DEFAULT 0,            -- 评论数
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 最近一次同步时间
+            FOREIGN KEY (pid) REFERENCES posts(pid) ON DELETE CASCADE,  -- 硬删帖子时一并删除
+            INDEX idx_feed_items_post_seq (post_seq)
+        );
+    """
+
+    __tablename__ = "feed_items"
+
+    # 系统主键（自增）
+    _id = Column(Integer, primary_key=True, autoincrement=True)
+    # 帖子业务主键
+    pid = Column(UUIDBinary, ForeignKey("posts.pid", ondelete="CASCADE"), unique=True, nullable=False)
+    # posts._id，首页按它倒序，与 get_batch_posts 的排序保持一致
+    post_seq = Column(Integer, nullable=False)
+    author_id = Column(UUIDBinary, nullable=False)  # 作者 ID
+    title = Column(String(POST_TITLE_MAX_LEN), nullable=False, server_default="")  # 帖子标题
+    like_count = Column(Integer, nullable=False, server_default="0")  # 点赞数
+    comment_count = Column(Integer, nullable=False, server_default="0")  # 评论数
+    # 时间戳由数据库生成：DEFAULT CURRENT_TIMESTAMP / ON UPDATE CURRENT_TIMESTAMP
+    updated_at = Column(TIMESTAMP, server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_feed_items_post_seq", "post_seq"),
+    )
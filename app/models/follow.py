@@ -1,16 +1,15 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, TIMESTAMP, ForeignKey, UniqueConstraint, Index, func
 from sqlalchemy.orm import relationship
-import datetime
 from app.models.base import Base
-from app.core.time import now_utc8
+from app.models.types import UUIDBinary
 
 class Follow(Base):
     """ 用户关注关系表，记录用户关注了哪些用户 
         
         CREATE TABLE IF NOT EXISTS follows (
             _id INT AUTO_INCREMENT PRIMARY KEY,              -- 系统主键（自增）
-            user_id VARCHAR(36) NOT NULL,                    -- 关注者ID (FK -> users.uid)
-            followed_user_id VARCHAR(36) NOT NULL,           -- 被关注者ID (FK -> users.uid)
+            user_id BINARY(16)  NOT NULL,                    -- 关注者ID (FK -> users.uid)
+            followed_user_id BINARY(16)  NOT NULL,           -- 被关注者ID (FK -> users.uid)
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- 创建时间
             deleted_at TIMESTAMP NULL,                       -- 软删除时间戳（用于取消关注）
 
@@ -20,9 +19,9 @@ class Follow(Base):
             CONSTRAINT uq_user_follow UNIQUE (user_id, followed_user_id)    -- 联合唯一约束：防止用户重复关注
         );
 
-        -- 为了快速查询用户的关注者和粉丝，可以添加以下索引：
-        CREATE INDEX idx_follow_user ON follows (user_id);
-        CREATE INDEX idx_followed_user ON follows (followed_user_id);
+        -- 为了快速查询用户的关注者和粉丝，可以添加以下索引（带上软删除列和排序列）：
+        CREATE INDEX idx_follow_user ON follows (user_id, deleted_at, created_at);
+        CREATE INDEX idx_followed_user ON follows (followed_user_id, deleted_at, created_at);
     
     """
     
@@ -31,23 +30,25 @@ class Follow(Base):
     # 系统主键（自增）
     _id = Column(Integer, primary_key=True, autoincrement=True)
     # 关注者ID
-    user_id = Column(String(36), ForeignKey("users.uid"), nullable=False)
+    user_id = Column(UUIDBinary, ForeignKey("users.uid"), nullable=False)
     # 被关注者ID
-    followed_user_id = Column(String(36), ForeignKey("users.uid"), nullable=False)
+    followed_user_id = Column(UUIDBinary, ForeignKey("users.uid"), nullable=False)
     # 记录创建时间
-    created_at = Column(TIMESTAMP(timezone=True), default=now_utc8)
+    created_at = Column(TIMESTAMP, server_default=func.now())
     # 软删除时间戳（用于取消关注）
-    deleted_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    deleted_at = Column(TIMESTAMP, nullable=True)
 
-    # 反向引用：该关注记录的关注者
-    user = relationship("User", foreign_keys=[user_id], back_populates="followers")
+    # 反向引用：该关注记录的关注者（lazy="raise"：逐行访问会产生 N+1，需要时在查询里显式加载）
+    user = relationship("User", foreign_keys=[user_id], back_populates="followings", lazy="raise")
     # 反向引用：该关注记录的被关注者
-    followed_user = relationship("User", foreign_keys=[followed_user_id], back_populates="followers")
+    followed_user = relationship("User", foreign_keys=[followed_user_id], back_populates="followers", lazy="raise")
 
     __table_args__ = (
         # 联合唯一约束：确保每个用户只能关注一次某个用户
         UniqueConstraint("user_id", "followed_user_id", name="uq_user_follow"),
-        # 索引：加速查询
-        Index("idx_follow_user", "user_id"),
-        Index("idx_followed_user", "followed_user_id"),
+        # 索引：加速查询（deleted_at IS NULL 过滤 + created_at 排序都走索引）
+        # idx_follow_user 与 uq_user_follow 虽同以 user_id 开头，但关注列表按 created_at 排序，
+        # 唯一索引无法避免 filesort，因此两者都保留
+        Index("idx_follow_user", "user_id", "deleted_at", "created_at"),
+        Index("idx_followed_user", "followed_user_id", "deleted_at", "created_at"),
     )
\ No newline at end of file
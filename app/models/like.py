@@ -1,10 +1,7 @@
-from sqlalchemy import Column, Integer, String, SmallInteger, TIMESTAMP, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.orm import relationship
-import datetime
+from sqlalchemy import Column, Integer, SmallInteger, TIMESTAMP, ForeignKey, UniqueConstraint, Index, FetchedValue, func, text
 from app.models.base import Base
-import uuid
+from app.models.types import UUIDBinary
 from enum import IntEnum 
-from app.core.time import now_utc8
 # 点赞目标类型
 class LikeTargetType(IntEnum):
     POST = 0  # 帖子
@@ -15,10 +12,10 @@ class Like(Base):
     
         CREATE TABLE IF NOT EXISTS likes (
             _id INT AUTO_INCREMENT PRIMARY KEY,              -- 系统主键（自增）
-            lid VARCHAR(36) UNIQUE,                          -- 业务主键（UUID）
-            user_id VARCHAR(36) NOT NULL,                    -- 用户 ID (FK -> users.id)
+            lid BINARY(16)  UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+            user_id BINARY(16)  NOT NULL,                    -- 用户 ID (FK -> users.uid)
             target_type SMALLINT,                            -- 点赞目标类型（0: 帖子, 1: 评论）
-            target_id VARCHAR(36) NOT NULL,                  -- 点赞目标 ID（帖子 ID 或 评论 ID）
+            target_id BINARY(16)  NOT NULL,                  -- 点赞目标 ID（帖子 ID 或 评论 ID）
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- 点赞时间
             updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 更新时间
             deleted_at TIMESTAMP NULL,                       -- 软删除时间戳
@@ -29,22 +26,27 @@ class Like(Base):
 
         );
         -- 索引建议：
-        CREATE INDEX idx_likes_user_target_type ON likes (user_id, target_type);
-        CREATE INDEX idx_likes_target_type_id   ON likes (target_type, target_id);
+        CREATE INDEX idx_likes_user_target_type ON likes (user_id, target_type, deleted_at);
+        CREATE INDEX idx_likes_target_type_id_user ON likes (target_type, target_id, user_id, deleted_at);
         CREATE INDEX idx_likes_created_at       ON likes (created_at);
+        -- 点赞列表（按目标 / 按用户，未取消，created_at 倒序）：等值列 + deleted_at IS NULL 定位后按索引顺序读取，
+        -- MySQL 没有部分索引，deleted_at 作为等值列放在 created_at 之前；InnoDB 二级索引自带主键 _id，兼作翻页的次排序
+        CREATE INDEX idx_likes_target_created   ON likes (target_type, target_id, deleted_at, created_at);
+        CREATE INDEX idx_likes_user_created     ON likes (user_id, deleted_at, created_at);
     """
     
     __tablename__ = "likes"
     # 系统主键（内部使用，不对外暴露）
     _id = Column(Integer, primary_key=True, autoincrement=True)
     # 业务主键（UUID，对外使用）
-    lid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.uid"), nullable=False)  # 用户 ID
+    lid = Column(UUIDBinary, unique=True, server_default=text("(UUID_TO_BIN(UUID()))"))
+    user_id = Column(UUIDBinary, ForeignKey("users.uid"), nullable=False)  # 用户 ID
     target_type = Column(SmallInteger, nullable=False)  # 点赞目标类型（0: 帖子, 1: 评论）
-    target_id = Column(String(36), nullable=False)  # 点赞目标 ID（帖子或评论 ID）
-    created_at = Column(TIMESTAMP(timezone=True), default=now_utc8)  # 点赞时间
-    updated_at = Column(TIMESTAMP(timezone=True), default=now_utc8, onupdate=now_utc8)  # 更新时间
-    deleted_at = Column(TIMESTAMP(timezone=True), nullable=True)  # 软删除时间戳
+    target_id = Column(UUIDBinary, nullable=False)  # 点赞目标 ID（帖子或评论 ID）
+    # 时间戳由数据库生成：DEFAULT CURRENT_TIMESTAMP / ON UPDATE CURRENT_TIMESTAMP
+    created_at = Column(TIMESTAMP, server_default=func.now())  # 点赞时间
+    updated_at = Column(TIMESTAMP, server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)  # 更新时间
+    deleted_at = Column(TIMESTAMP, nullable=True)  # 软删除时间戳
 
     # # 反向引用：该点赞的用户
     # user = relationship("User", back_populates="likes")
@@ -58,7 +60,14 @@ class Like(Base):
         UniqueConstraint("user_id", "target_type", "target_id", name="uq_likes_user_target"),
 
         # 索引：快速查找某个对象的点赞情况
-        Index("idx_likes_user_target_type", "user_id", "target_type"),
-        Index("idx_likes_target_type_id", "target_type", "target_id"),
+        Index("idx_likes_user_target_type", "user_id", "target_type", "deleted_at"),
+        # 覆盖索引：“某目标的点赞数 / 某用户是否点赞过某目标”可只扫索引完成，无需回表
+        # 注：暂不按 target_type 做 LIST 分区。InnoDB 分区表不支持外键（fk_likes_user），
+        #     且主键 _id 与唯一键 lid 都必须带上 target_type；而本索引以 target_type 开头，
+        #     按类型的查询本来就只扫 B-tree 中连续的一段，分区带来的收益有限
+        Index("idx_likes_target_type_id_user", "target_type", "target_id", "user_id", "deleted_at"),
         Index("idx_likes_created_at", "created_at"),
+        # 点赞列表：定位后直接按 created_at（及隐含的 _id）倒序读取，不再 filesort
+        Index("idx_likes_target_created", "target_type", "target_id", "deleted_at", "created_at"),
+        Index("idx_likes_user_created", "user_id", "deleted_at", "created_at"),
     )
\ No newline at end of file
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, SmallInteger, TIMESTAMP, Text, ForeignKey, UniqueConstraint, Index
-from sqlalchemy.orm import relationship
-import datetime
+from sqlalchemy import Column, Integer, SmallInteger, TIMESTAMP, ForeignKey, UniqueConstraint, CheckConstraint, Index, text, and_
+from sqlalchemy.orm import relationship, foreign
 from app.models.base import Base
-import uuid
+from app.models.types import UUIDBinary
+from app.models.like import Like, LikeTargetType
 from enum import IntEnum  
 # 帖子可见性
 class PostVisibility(IntEnum):
@@ -28,26 +28,34 @@ class Post(Base):
 
         CREATE TABLE IF NOT EXISTS posts (
             _id INT AUTO_INCREMENT PRIMARY KEY,           -- 系统主键ID（自增）
-            pid VARCHAR(36) UNIQUE,                       -- 业务主键PID（UUID）
-            author_id VARCHAR(36) NOT NULL,               -- 作者 ID (Fk->users.uid)
+            pid BINARY(16)  UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键PID（UUID，由数据库生成）
+            author_id BINARY(16)  NOT NULL,               -- 作者 ID (Fk->users.uid)
             visibility SMALLINT DEFAULT 0,                -- 可见性（0:公开, 1:仅作者）
             publish_status SMALLINT DEFAULT 1,            -- 发布状态（0:草稿, 1:发布）
             review_status SMALLINT DEFAULT 0,             -- 审核状态（0:待审, 1:通过, 2:拒绝）
             reviewed_at TIMESTAMP,                        -- 审核时间
             deleted_at TIMESTAMP NULL,                    -- 软删除时间戳
 
-            FOREIGN KEY (author_id) REFERENCES users(uid)   -- 外键关联到用户表
+            FOREIGN KEY (author_id) REFERENCES users(uid),  -- 外键关联到用户表
+            CONSTRAINT ck_posts_review_status CHECK (review_status IN (0, 1, 2))  -- 审核状态只能是三种取值之一
         );
 
         -- 索引建议：
         -- 1) 为 author_id 添加索引，以便快速查询某个作者的帖子
-        CREATE INDEX idx_posts_author_id ON posts (author_id);
+        CREATE INDEX idx_posts_author_id ON posts (author_id, deleted_at);
 
         -- 2) 为 visibility 和 review_status 添加联合索引，以便快速筛选帖子
-        CREATE INDEX idx_posts_visibility_review_status ON posts (visibility, review_status);
+        CREATE INDEX idx_posts_visibility_review_status ON posts (visibility, review_status, deleted_at);
 
         -- 3) 为 author_id 和 visibility 添加联合索引，以便快速查询特定作者和可见性（如公开、草稿等）的帖子
-        CREATE INDEX idx_posts_author_visibility ON posts (author_id, visibility);
+        CREATE INDEX idx_posts_author_visibility ON posts (author_id, visibility, deleted_at);
+
+        -- 4) 软删除列放在各索引末尾，deleted_at IS NULL 可直接在索引上过滤；
+        --    单独的 deleted_at 索引用于管理员查看已删除帖子
+        CREATE INDEX idx_posts_deleted_at ON posts (deleted_at);
+
+        -- 5) 待审队列（review_status = 待审 + 未删除，按 _id 倒序）：二级索引末尾隐含 _id，定位后直接按顺序读取
+        CREATE INDEX idx_posts_review_status ON posts (review_status, deleted_at);
     """
 
     __tablename__ = "posts"
@@ -55,34 +63,46 @@ class Post(Base):
     # 系统主键：自增
     _id = Column(Integer, primary_key=True, autoincrement=True)  # 系统主键ID，系统用，不对外暴露
     # 业务主键：UUID，唯一且不自增1
-    pid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))  # 用户的业务主键（UUID形式）
+    pid = Column(UUIDBinary, server_default=text("(UUID_TO_BIN(UUID()))"))  # 帖子的业务主键（UUID，由数据库生成，插入后 refresh 取回）
 
-    author_id = Column(String(36), ForeignKey("users.uid"), nullable=False)          # 帖子作者 ID
+    author_id = Column(UUIDBinary, ForeignKey("users.uid"), nullable=False)          # 帖子作者 ID
     visibility = Column(SmallInteger, default=PostVisibility.PUBLIC.value)           # 可见性（0:公开, 1:仅作者）
     publish_status = Column(SmallInteger, default=PostPublishStatus.PUBLISHED.value) # 发布状态（0:草稿, 1:发布）
     review_status = Column(SmallInteger, default=PostReviewStatus.PENDING.value)     # 审核状态（0:待审, 1:通过, 2:拒绝）
-    reviewed_at = Column(TIMESTAMP(timezone=True), nullable=True)  # 审核时间
-    deleted_at = Column(TIMESTAMP(timezone=True), nullable=True)   # 软删除时间戳
+    reviewed_at = Column(TIMESTAMP, nullable=True)  # 审核时间
+    deleted_at = Column(TIMESTAMP, nullable=True)   # 软删除时间戳
 
     # 反向引用：该帖子的作者
     author = relationship("User", back_populates="posts")
     # 双向引用：该帖子的评论
-    comments = relationship("Comment", back_populates="post")
-    # 单向引用：该帖子的内容
-    post_content = relationship("PostContent", uselist=False, cascade="all, delete-orphan")
+    # 评论数量不可控，固定 lazy="select" 按需加载；不要改成 subquery / joined，
+    # 两者都会把父查询（含分页）再套一层，或按评论数放大结果集（tests/test_loader_strategies.py 会检查）
+    # passive_deletes：硬删帖子时由数据库 ON DELETE CASCADE 一条语句删掉评论，ORM 不再先加载全部评论
+    comments = relationship("Comment", back_populates="post", lazy="select", cascade="all, delete-orphan", passive_deletes=True)
+    # 单向引用：该帖子的内容（PostOut 等返回结构总会用到，selectin 批量加载，避免 N+1）
+    post_content = relationship("PostContent", uselist=False, lazy="selectin", cascade="all, delete-orphan", passive_deletes=True)
     # 单向引用：该帖子的统计信息
-    post_stats = relationship("PostStats", uselist=False, cascade="all, delete-orphan") 
+    post_stats = relationship("PostStats", uselist=False, lazy="selectin", cascade="all, delete-orphan", passive_deletes=True)
     
     # 帖子本身可以展示点赞数，无需额外点赞表关联
     # 单向引用：该帖子的点赞
     # 还是使用 relationship 关联点赞表与帖子表之间的数据，为了方便查询哪些用户点赞这篇帖子
-    likes = relationship("Like", primaryjoin="and_(Like.target_id == Post.pid, Like.target_type == 0)", foreign_keys="Like.target_id", viewonly=True)
+    # 与 Comment.likes 一致直接用表达式声明连接条件；target_type 在前，正好命中 idx_likes_target_type_id_user
+    likes = relationship(
+        Like,
+        primaryjoin=and_(foreign(Like.target_id) == pid, Like.target_type == LikeTargetType.POST.value),
+        viewonly=True,
+    )
 
     __table_args__ = (
         # 保证业务主键 pid 唯一
         UniqueConstraint('pid', name='unique_pid'),
+        # 审核状态取值由数据库兜底；状态流转规则见 post_svc.review_post 的条件更新
+        CheckConstraint("review_status IN (0, 1, 2)", name="ck_posts_review_status"),
         # 索引与上面的 SQL 一致（让 ORM 自动建索引）
-        Index("idx_posts_author_id", "author_id"),
-        Index("idx_posts_visibility_review_status", "visibility", "review_status"),
-        Index("idx_posts_author_visibility", "author_id", "visibility"),
+        Index("idx_posts_author_id", "author_id", "deleted_at"),
+        Index("idx_posts_visibility_review_status", "visibility", "review_status", "deleted_at"),
+        Index("idx_posts_author_visibility", "author_id", "visibility", "deleted_at"),
+        Index("idx_posts_deleted_at", "deleted_at"),
+        Index("idx_posts_review_status", "review_status", "deleted_at"),
     )
\ No newline at end of file
@@ -1,29 +1,38 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP
-import uuid
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, FetchedValue, func, text
+from sqlalchemy.orm import deferred
 from app.models.base import Base
-from app.core.time import now_utc8
+from app.models.types import UUIDBinary
+
+# 标题长度上限：库表列宽与请求校验（schemas）共用
+POST_TITLE_MAX_LEN = 160
 
 class PostContent(Base):
     """ 帖子内容表，存储帖子的标题和内容。
 
         CREATE TABLE IF NOT EXISTS post_contents (
             _id INT AUTO_INCREMENT PRIMARY KEY,           -- 系统主键（自增）
-            pcid VARCHAR(36) UNIQUE,                      -- 业务主键PID（UUID）
-            post_id VARCHAR(36) NOT NULL UNIQUE,          -- 帖子 ID (FK -> posts.pid)
-            title VARCHAR(255) NOT NULL,                  -- 帖子标题
+            pcid BINARY(16)  UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+            post_id BINARY(16)  NOT NULL UNIQUE,          -- 帖子 ID (FK -> posts.pid)
+            title VARCHAR(160) NOT NULL,                  -- 帖子标题
             content TEXT NOT NULL,                        -- 帖子内容
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,    -- 创建时间
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,    -- 更新时间
-            FOREIGN KEY (post_id) REFERENCES posts(pid)        -- 外键关联到帖子表
-        );
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,    -- 更新时间
+            FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 外键关联到帖子表
+        ) ROW_FORMAT=DYNAMIC;
     """
     
     __tablename__ = "post_contents"
 
     _id = Column(Integer, primary_key=True, autoincrement=True)                                # 系统主键（自增） 
-    pcid = Column(String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))  # 业务主键（UUID，对外使用）
-    post_id =  Column(String(36), ForeignKey("posts.pid"), nullable=False)                     # 帖子ID
-    title = Column(String(255), nullable=False)                                                # 帖子标题
-    content = Column(Text, nullable=False)                                                     # 帖子内容
-    created_at = Column(TIMESTAMP(timezone=True), default=now_utc8)                     # 创建时间
-    updated_at = Column(TIMESTAMP(timezone=True), default=now_utc8, onupdate=now_utc8)  # 更新时间
\ No newline at end of file
+    pcid = Column(UUIDBinary, unique=True, nullable=False, server_default=text("(UUID_TO_BIN(UUID()))"))  # 业务主键（UUID，对外使用）
+    post_id =  Column(UUIDBinary, ForeignKey("posts.pid", ondelete="CASCADE"), nullable=False)                     # 帖子ID
+    title = Column(String(POST_TITLE_MAX_LEN), nullable=False)                                 # 帖子标题
+    # 正文可能有几十 KB，默认延迟加载：只改帖子状态、取标题的查询不再把正文读出来；
+    # 需要正文的查询用 undefer_group("body") 显式取回
+    content = deferred(Column(Text, nullable=False), group="body")                             # 帖子内容
+    # 时间戳由数据库生成：DEFAULT CURRENT_TIMESTAMP / ON UPDATE CURRENT_TIMESTAMP
+    created_at = Column(TIMESTAMP, server_default=func.now())                                     # 创建时间
+    updated_at = Column(TIMESTAMP, server_default=func.now(), server_onupdate=FetchedValue())  # 更新时间
+
+    # DYNAMIC：大段 content 整列放到溢出页，数据页里只留 20 字节指针，按 post_id 查标题时读的页更少
+    __table_args__ = {"mysql_row_format": "DYNAMIC"}
\ No newline at end of file
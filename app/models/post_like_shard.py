@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, SmallInteger, ForeignKey, PrimaryKeyConstraint
+from app.models.base import Base
+from app.models.types import UUIDBinary
+
+# 每个帖子的点赞计数拆成的分片数
+POST_LIKE_SHARD_COUNT = 16
+
+class PostLikeCounterShard(Base):
+    """ 帖子点赞数的分片增量表。
+
+        热门帖子被大量并发点赞时，直接 UPDATE post_stats 的同一行会让所有请求排队等同一把行锁；
+        点赞 / 取消点赞改为按 user_id 落到 16 个分片之一累加 delta，行锁被打散，
+        再由后台任务定期把各分片的 delta 汇总进 post_stats.like_count 并清零。
+        实时点赞数 = post_stats.like_count + SUM(delta)。
+
+        CREATE TABLE IF NOT EXISTS post_like_counter_shards (
+            post_id BINARY(16) NOT NULL,                     -- 帖子业务主键（FK -> posts.pid）
+            shard_id SMALLINT NOT NULL,                      -- 分片编号 0 ~ 15
+            delta INT NOT NULL DEFAULT 0,                    -- 尚未汇总进 post_stats 的点赞增量
+            PRIMARY KEY (post_id, shard_id),
+            FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 硬删帖子时一并删除
+        );
+    """
+
+    __tablename__ = "post_like_counter_shards"
+
+    # 帖子 ID
+    post_id = Column(UUIDBinary, ForeignKey("posts.pid", ondelete="CASCADE"), nullable=False)
+    # 分片编号
+    shard_id = Column(SmallInteger, nullable=False)
+    # 待汇总的点赞增量（可为负）
+    delta = Column(Integer, nullable=False, server_default="0")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("post_id", "shard_id"),
+    )
@@ -1,18 +1,17 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Index, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, text
 from app.models.base import Base
-import uuid
+from app.models.types import UUIDBinary
 
 class PostStats(Base):
     """ 帖子统计表，存储帖子的统计数据，比如评论数点赞数，后续可扩展。
 
         CREATE TABLE IF NOT EXISTS post_stats (
             _id INT AUTO_INCREMENT PRIMARY KEY,                -- 系统主键（自增）
-            psid VARCHAR(36) NOT NULL UNIQUE,                  -- 业务主键（UUID，对外使用）
-            post_id VARCHAR(36) NOT NULL UNIQUE,               -- 帖子业务主键（FK -> posts.pid）
+            psid BINARY(16)  NOT NULL UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+            post_id BINARY(16)  NOT NULL UNIQUE,               -- 帖子业务主键（FK -> posts.pid）
             like_count INT DEFAULT 0,                          -- 点赞数
             comment_count INT DEFAULT 0,                       -- 帖子总评论数
-            FOREIGN KEY (post_id) REFERENCES posts(pid)        -- 外键关联到帖子表
+            FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 外键关联到帖子表
         );
     """
 
@@ -21,9 +20,9 @@ class PostStats(Base):
     # 系统主键（自增）
     _id = Column(Integer, primary_key=True, autoincrement=True)
     # 业务主键（UUID，对外使用）
-    psid = Column(String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    psid = Column(UUIDBinary, nullable=False, server_default=text("(UUID_TO_BIN(UUID()))"))
     # 帖子 ID
-    post_id = Column(String(36), ForeignKey("posts.pid"), nullable=False)
+    post_id = Column(UUIDBinary, ForeignKey("posts.pid", ondelete="CASCADE"), nullable=False)
     # 帖子点赞数
     like_count = Column(Integer, default=0)  
     # 帖子总评论数
@@ -32,5 +31,6 @@ class PostStats(Base):
     
     __table_args__ = (
         UniqueConstraint('psid', name='unique_psid'),
-        Index("idx_post_stats_post_id", "post_id"),
+        # 与建表 SQL 一致：每个帖子只有一条统计记录，唯一索引同时服务 post_id = ? 查询
+        UniqueConstraint('post_id', name='unique_post_stats_post_id'),
     )
\ No newline at end of file
@@ -1,10 +1,9 @@
-from sqlalchemy import Column, Integer, String, SmallInteger, TIMESTAMP, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, SmallInteger, TIMESTAMP, Text, Index, text
 from sqlalchemy.orm import relationship
-import datetime
-import uuid
 from app.models.base import Base
+from app.models.types import UUIDBinary
 from enum import IntEnum  
-from app.core.time import now_utc8
+from app.core.time import now_utc
 class UserRole(IntEnum):
     NORMAL_USER = 0 # 普通用户
     MODERATOR = 1   # 审核员
@@ -20,7 +19,7 @@ class User(Base):
     
         CREATE TABLE IF NOT EXISTS users (
             _id INT AUTO_INCREMENT PRIMARY KEY,        -- 系统主键 ID
-            uid VARCHAR(36) UNIQUE,                   -- 用户的业务主键（UUID）
+            uid BINARY(16) UNIQUE DEFAULT (UUID_TO_BIN(UUID(), 1)),  -- 用户的业务主键（时间有序 UUID，由数据库生成）
             username VARCHAR(100) NOT NULL,           -- 用户昵称
             role SMALLINT DEFAULT 0,                  -- 用户角色（0: 普通用户，1: 审核员，2: 管理员）
             status SMALLINT DEFAULT 0,                -- 用户状态（0: 正常，1: 封禁，2: 冻结）
@@ -33,15 +32,19 @@ class User(Base):
             last_login_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- 最后登录时间
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,    -- 创建时间
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,    -- 更新时间
-            deleted_at TIMESTAMP NULL                 -- 软删除时间戳
+            deleted_at TIMESTAMP NULL,                -- 软删除时间戳
+
+            INDEX idx_users_deleted_created (deleted_at, created_at)
         );
     """
     
     __tablename__ = "users"
     # 系统主键：自增
     _id = Column(Integer, primary_key=True, autoincrement=True)  # 系统主键ID，系统用，不对外暴露
-    # 业务主键：UUID，唯一且不自增  
-    uid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()))  # 用户的业务主键，UUID形式
+    # 业务主键：UUID，唯一且不自增
+    # UUID() 是 v1（时间戳 + 节点）UUID，UUID_TO_BIN 第二个参数为 1 时把时间高位换到最前面，
+    # 新用户的 uid 大致按时间递增，插入落在唯一索引和各表 user_id 索引的末尾，不再随机分裂页
+    uid = Column(UUIDBinary, unique=True, server_default=text("(UUID_TO_BIN(UUID(), 1))"))  # 用户的业务主键（UUID，由数据库生成，插入后 refresh 取回）
     username = Column(String(100), nullable=False)  # 用户昵称
     avatar_url = Column(String(255), nullable=True)  # 用户头像
     email = Column(String(100), unique=True, nullable=True)  # 用户邮箱
@@ -50,10 +53,10 @@ class User(Base):
     role = Column(SmallInteger, default=UserRole.NORMAL_USER.value)  # 用户角色（普通用户、审核员、管理员）
     bio = Column(Text, nullable=True)  # 用户简介
     status = Column(SmallInteger, default=UserStatus.NORMAL.value) # 用户状态（0正常，1封禁，2冻结）
-    last_login_at = Column(TIMESTAMP(timezone=True), default=now_utc8)  # 最后登录时间
-    created_at = Column(TIMESTAMP(timezone=True), default=now_utc8)  # 创建时间
-    updated_at = Column(TIMESTAMP(timezone=True), default=now_utc8, onupdate=now_utc8)  # 更新时间
-    deleted_at = Column(TIMESTAMP(timezone=True), nullable=True)  # 软删除时间戳
+    last_login_at = Column(TIMESTAMP, default=now_utc)  # 最后登录时间
+    created_at = Column(TIMESTAMP, default=now_utc)  # 创建时间
+    updated_at = Column(TIMESTAMP, default=now_utc, onupdate=now_utc)  # 更新时间
+    deleted_at = Column(TIMESTAMP, nullable=True)  # 软删除时间戳
 
     # 反向引用：该用户的所有帖子
     posts = relationship("Post", back_populates="author")
@@ -63,7 +66,14 @@ class User(Base):
     likes = relationship("Like")
     # 单向引用：该用户的统计信息（关注数和粉丝数）
     userstats = relationship("UserStats", uselist=False, cascade="all, delete-orphan")
-    # 我关注的人（关注者是我 -> 多个 Follow 记录）
-    followings = relationship("Follow", foreign_keys="Follow.user_id", back_populates="user")
+    # 我关注的人（关注者是我 -> 多个 Follow 记录）；关注列表一律在查询里显式 join，禁止隐式懒加载
+    followings = relationship("Follow", foreign_keys="Follow.user_id", back_populates="user", lazy="raise")
     # 我的粉丝（被关注者是我 -> 多个 Follow 记录）
-    followers = relationship("Follow", foreign_keys="Follow.followed_user_id", back_populates="followed_user")
+    followers = relationship("Follow", foreign_keys="Follow.followed_user_id", back_populates="followed_user", lazy="raise")
+
+    __table_args__ = (
+        # MySQL 没有部分索引，用 (deleted_at, created_at) 代替：
+        # deleted_at IS NULL + 按 created_at 排序的用户列表走索引有序读取；
+        # 已删除用户很少，deleted_at IS NOT NULL 只扫描索引里很小的一段
+        Index("idx_users_deleted_created", "deleted_at", "created_at"),
+    )
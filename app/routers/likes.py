@@ -1,6 +1,8 @@
 # app/api/v1/likes.py  或类似路径
 
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends
 
 from app.schemas.like import (
     LikeCreate,
@@ -10,35 +12,27 @@ from app.schemas.like import (
     BatchLikesOut,
     BatchLikesAdminOut,
     GetTargetLike,
+    LikeBatchOut,
 )
 from app.models.like import LikeTargetType
 
 from app.core.biz_response import BizResponse
-from app.core.logx import logger
+from app.core.redis_client import get_redis
+from redis import Redis
 
 from app.service import like_svc
 
 from app.storage.database import (
     get_user_repo,
-    get_post_repo,
     get_comment_repo,
     get_like_repo,
     get_poststats_repo,
 )
 from app.storage.user.user_interface import IUserRepository
-from app.storage.post.post_interface import IPostRepository
 from app.storage.comment.comment_interface import ICommentRepository
 from app.storage.like.like_interface import ILikeRepository
 from app.storage.post_stats.post_stats_interface import IPostStatsRepository
 
-from app.core.exceptions import (
-    UserNotFound,
-    PostNotFound,
-    CommentNotFound,
-    AlreadyLikedError,
-    NotLikedError,
-)
-from fastapi.encoders import jsonable_encoder
 
 likes_router = APIRouter(prefix="/likes", tags=["likes"])
 
@@ -48,11 +42,10 @@ likes_router = APIRouter(prefix="/likes", tags=["likes"])
 @likes_router.post("/", response_model=LikeOut)
 def like_target(
     data: LikeCreate,
-    user_repo: IUserRepository = Depends(get_user_repo),
-    post_repo: IPostRepository = Depends(get_post_repo),
     comment_repo: ICommentRepository = Depends(get_comment_repo),
     post_stats_repo: IPostStatsRepository = Depends(get_poststats_repo),
     like_repo: ILikeRepository = Depends(get_like_repo),
+    redis: Redis = Depends(get_redis),
 ):
     """
     点赞目标（帖子/评论）：
@@ -61,30 +54,44 @@ def like_target(
     - 校验帖子 / 评论是否存在
     - 调用 like_svc.like_target 完成点赞 + 更新计数
     """
-    try:
-        like = like_svc.like_target(
-            user_repo=user_repo,
-            post_repo=post_repo,
-            comment_repo=comment_repo,
-            post_stats_repo=post_stats_repo,
-            like_repo=like_repo,
-            data=data,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(like))
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except PostNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except CommentNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except AlreadyLikedError as e:
-        # 重复点赞：客户端逻辑错误，一般用 409 / 400
-        logger.info(f"AlreadyLikedError: {e}")
-        return BizResponse(data=None, msg=str(e), status_code=409)
-    except Exception as e:
-        logger.exception("like_target error")
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    like = like_svc.like_target(
+        comment_repo=comment_repo,
+        post_stats_repo=post_stats_repo,
+        like_repo=like_repo,
+        data=data,
+        to_dict=True,
+        cache=redis,
+    )
+    return BizResponse(data=like)
+
+
+# 批量点赞 / 取消一次最多条数，避免单条 INSERT / IN 列表过大
+LIKE_BATCH_MAX_ITEMS = 500
+
+
+@likes_router.post("/batch", response_model=LikeBatchOut)
+def like_targets_batch(
+    rows: List[LikeCreate] = Body(..., min_length=1, max_length=LIKE_BATCH_MAX_ITEMS),
+    comment_repo: ICommentRepository = Depends(get_comment_repo),
+    post_stats_repo: IPostStatsRepository = Depends(get_poststats_repo),
+    like_repo: ILikeRepository = Depends(get_like_repo),
+    redis: Redis = Depends(get_redis),
+):
+    """
+    批量点赞（帖子/评论）：
+
+    - 一个事务内一条多行 INSERT 完成，计数按帖子 / 评论合并后更新
+    - 已点过 / 目标不存在的项跳过，返回真正生效的条数
+    """
+    result = like_svc.like_targets_batch(
+        comment_repo=comment_repo,
+        post_stats_repo=post_stats_repo,
+        like_repo=like_repo,
+        rows=rows,
+        to_dict=True,
+        cache=redis,
+    )
+    return BizResponse(data=result)
 
 
 # -------------------------- 取消点赞 -------------------------- #
@@ -96,6 +103,7 @@ def cancel_like(
     post_stats_repo: IPostStatsRepository = Depends(get_poststats_repo),
     comment_repo: ICommentRepository = Depends(get_comment_repo),
     like_repo: ILikeRepository = Depends(get_like_repo),
+    redis: Redis = Depends(get_redis),
 ):
     """
     取消点赞（软删除）：
@@ -103,24 +111,40 @@ def cancel_like(
     - 校验用户是否存在
     - 调用 like_svc.cancel_like 完成取消 + 更新计数
     """
-    try:
-        ok = like_svc.cancel_like(
-            user_repo=user_repo,
-            post_stats_repo=post_stats_repo,
-            comment_repo=comment_repo,
-            like_repo=like_repo,
-            data=data,
-        )
-        return BizResponse(data=jsonable_encoder(ok))
-    except UserNotFound as e:
-        return BizResponse(data=False, msg=str(e), status_code=404)
-    except NotLikedError as e:
-        # 没有点赞就取消，属于客户端错误
-        logger.info(f"NotLikedError: {e}")
-        return BizResponse(data=False, msg=str(e), status_code=409)
-    except Exception as e:
-        logger.exception("cancel_like error")
-        return BizResponse(data=False, msg=str(e), status_code=500)
+    ok = like_svc.cancel_like(
+        user_repo=user_repo,
+        post_stats_repo=post_stats_repo,
+        comment_repo=comment_repo,
+        like_repo=like_repo,
+        data=data,
+        cache=redis,
+    )
+    return BizResponse(data=ok)
+
+
+@likes_router.post("/cancel/batch", response_model=LikeBatchOut)
+def cancel_likes_batch(
+    rows: List[LikeCancel] = Body(..., min_length=1, max_length=LIKE_BATCH_MAX_ITEMS),
+    post_stats_repo: IPostStatsRepository = Depends(get_poststats_repo),
+    comment_repo: ICommentRepository = Depends(get_comment_repo),
+    like_repo: ILikeRepository = Depends(get_like_repo),
+    redis: Redis = Depends(get_redis),
+):
+    """
+    批量取消点赞（软删除）：
+
+    - 一条 UPDATE 完成，计数按帖子 / 评论合并后扣减
+    - 没点过 / 已取消的项跳过，返回真正生效的条数
+    """
+    result = like_svc.cancel_likes_batch(
+        comment_repo=comment_repo,
+        post_stats_repo=post_stats_repo,
+        like_repo=like_repo,
+        rows=rows,
+        to_dict=True,
+        cache=redis,
+    )
+    return BizResponse(data=result)
 
 
 # -------------------------- 查询：按目标 -------------------------- #
@@ -130,24 +154,26 @@ def list_likes_by_target(
     data: GetTargetLike,
     page: int = 0,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     like_repo: ILikeRepository = Depends(get_like_repo),
+    redis: Redis = Depends(get_redis),
 ):
     """
     查询某个目标（帖子 / 评论）的所有 **有效** 点赞记录（分页）
     - 不包含软删除
+    - 翻页时把上一页返回的 next_cursor 作为 cursor 传回，优先于 page
+    - 前几页走 Redis 缓存，该目标有人点赞 / 取消时失效
     """
-    try:
-        result = like_svc.list_likes_by_target(
-            like_repo=like_repo,
-            data=data,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception("list_likes_by_target error")
-        return BizResponse(data={"total": 0, "count": 0, "items": []}, msg=str(e), status_code=500)
+    result = like_svc.list_likes_by_target(
+        like_repo=like_repo,
+        data=data,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        to_dict=False,
+        cache=redis,
+    )
+    return BizResponse(data=result)
 
 
 # -------------------------- 查询：按用户 -------------------------- #
@@ -157,24 +183,23 @@ def list_likes_by_user(
     user_id: str,
     page: int = 0,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     like_repo: ILikeRepository = Depends(get_like_repo),
 ):
     """
     查询某个用户的所有 **有效** 点赞记录（分页）
     - 包含该用户对帖子和评论的点赞
+    - 翻页时把上一页返回的 next_cursor 作为 cursor 传回，优先于 page
     """
-    try:
-        result = like_svc.list_likes_by_user(
-            like_repo=like_repo,
-            user_id=user_id,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception("list_likes_by_user error")
-        return BizResponse(data={"total": 0, "count": 0, "items": []}, msg=str(e), status_code=500)
+    result = like_svc.list_likes_by_user(
+        like_repo=like_repo,
+        user_id=user_id,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 
 # -------------------------- 管理员：按目标 -------------------------- #
@@ -189,18 +214,14 @@ def admin_list_likes_by_target(
     """
     管理员：查询某个目标的所有点赞记录（包含软删除）
     """
-    try:
-        result = like_svc.admin_list_likes_by_target(
-            like_repo=like_repo,
-            data=data,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception("admin_list_likes_by_target error")
-        return BizResponse(data={"total": 0, "count": 0, "items": []}, msg=str(e), status_code=500)
+    result = like_svc.admin_list_likes_by_target(
+        like_repo=like_repo,
+        data=data,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 
 # -------------------------- 管理员：按用户 -------------------------- #
@@ -215,15 +236,11 @@ def admin_list_likes_by_user(
     """
     管理员：查询某个用户的所有点赞记录（包含软删除）
     """
-    try:
-        result = like_svc.admin_list_likes_by_user(
-            like_repo=like_repo,
-            user_id=user_id,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception("admin_list_likes_by_user error")
-        return BizResponse(data={"total": 0, "count": 0, "items": []}, msg=str(e), status_code=500)
+    result = like_svc.admin_list_likes_by_user(
+        like_repo=like_repo,
+        user_id=user_id,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from app.schemas.user import (
     UserCreate,
@@ -13,7 +13,9 @@ from app.schemas.user import (
 from app.schemas.user_stats import UserStatsWithUserOut
 from app.schemas.follow import BatchFollowsOut
 
-from app.core.biz_response import BizResponse
+from app.core.biz_response import BizResponse, etag_response
+from app.core.redis_client import get_redis
+from redis import Redis
 from app.service import user_svc
 
 from app.storage.database import (
@@ -25,15 +27,6 @@ from app.storage.user.user_interface import IUserRepository
 from app.storage.user_stats.user_stats_interface import IUserStatsRepository
 from app.storage.follow.follow_interface import IFollowRepository
 
-from app.core.exceptions import (
-    UserNotFound,
-    PasswordMismatchError,
-    FollowYourselfError,
-    AlreadyFollowingError,
-    NotFollowingError,
-)
-from app.core.logx import logger
-from fastapi.encoders import jsonable_encoder
 
 users_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -44,16 +37,13 @@ def create_user(user: UserCreate, user_repo: IUserRepository = Depends(get_user_
     - 创建 user 表记录
     - 初始化 user_statistics（关注数/粉丝数为 0）
     """
-    try:
-        new_user = user_svc.create_user(
-            user_repo=user_repo,
-            stats_repo=stats_repo,
-            user_data=user,
-            to_dict=True,
-        )
-        return BizResponse(data=new_user)
-    except Exception as e:
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    new_user = user_svc.create_user(
+        user_repo=user_repo,
+        stats_repo=stats_repo,
+        user_data=user,
+        to_dict=True,
+    )
+    return BizResponse(data=new_user)
     
 
 @users_router.get("/", response_model=BatchUsersOut)
@@ -61,16 +51,13 @@ def query_batch_users(page: int = 0, page_size: int = 10, user_repo: IUserReposi
     """
     分页获取用户列表（只含基础信息）
     """
-    try:
-        result = user_svc.get_batch_users(
-            user_repo=user_repo,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=result)
-    except Exception as e:
-        return BizResponse(data=list(), msg=str(e), status_code=500)
+    result = user_svc.get_batch_users(
+        user_repo=user_repo,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 
 @users_router.get("/username/{username}", response_model=BatchUsersOut)
@@ -78,95 +65,81 @@ def get_users_by_username(username: str, page: int = 0, page_size: int = 10, use
     """
     根据用户名分页查询同名用户
     """
-    try:
-        result = user_svc.get_users_by_username(
-            user_repo=user_repo,
-            username=username,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=result)
-    except Exception as e:
-        return BizResponse(data=list(), msg=str(e), status_code=500)
+    result = user_svc.get_users_by_username(
+        user_repo=user_repo,
+        username=username,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 
 @users_router.get("/id/{uid}", response_model=UserOut)
-def query_user_basic(uid: str, user_repo: IUserRepository = Depends(get_user_repo)):
+def query_user_basic(uid: str, request: Request, user_repo: IUserRepository = Depends(get_user_repo)):
     """
     根据 uid 查询用户基础信息（不含关注/粉丝统计）
+    - 带 ETag：内容没变时返回 304
     """
-    try:
-        user = user_svc.get_user_by_uid(
-            user_repo=user_repo,
-            uid=uid,
-            to_dict=True,
-        )
-        return BizResponse(data=user)
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except Exception as e:
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    user = user_svc.get_user_by_uid(
+        user_repo=user_repo,
+        uid=uid,
+        to_dict=True,
+    )
+    return etag_response(request, user)
 
 # TODO 返回用户详细信息，待完善
 
 @users_router.get("/profile/{uid}", response_model=UserStatsWithUserOut)
-def query_user_profile(uid: str, stats_repo: IUserStatsRepository = Depends(get_usersta_repo)):
+def query_user_profile(uid: str, request: Request, stats_repo: IUserStatsRepository = Depends(get_usersta_repo), redis: Redis = Depends(get_redis)):
     """
     用户详情：
     - User 信息 + 关注数/粉丝数
+    - 带 ETag：内容没变时返回 304
     """
-    try:
-        profile = user_svc.get_user_profile(
-            stats_repo=stats_repo,
-            uid=uid,
-            to_dict=True,
-        )
-        if not profile:
-            return BizResponse(data=None, msg=f"uid {uid} not found.", status_code=404)
-        return BizResponse(data=profile)
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except Exception as e:
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    profile = user_svc.get_user_profile(
+        stats_repo=stats_repo,
+        uid=uid,
+        to_dict=False,
+        cache=redis,
+    )
+    if not profile:
+        return BizResponse(data=None, msg=f"uid {uid} not found.", status_code=404)
+    return etag_response(request, profile)
 
 
 @users_router.put("/info/id/{uid}", response_model=UserOut)
-def update_user(uid: str, data: UserUpdate, user_repo: IUserRepository = Depends(get_user_repo)):
+def update_user(uid: str, data: UserUpdate, user_repo: IUserRepository = Depends(get_user_repo), redis: Redis = Depends(get_redis)):
     """
     普通用户更新自己的信息（不包含角色/状态）
     """
-    try:
-        updated = user_svc.update_user(
-            user_repo=user_repo,
-            uid=uid,
-            data=data,
-            to_dict=True,
-        )
-        if not updated:
-            return BizResponse(data=None, msg=f"uid {uid} not found.", status_code=404)
-        return BizResponse(data=updated)
-    except Exception as e:
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    updated = user_svc.update_user(
+        user_repo=user_repo,
+        uid=uid,
+        data=data,
+        to_dict=True,
+        cache=redis,
+    )
+    if not updated:
+        return BizResponse(data=None, msg=f"uid {uid} not found.", status_code=404)
+    return BizResponse(data=updated)
 
 
 @users_router.put("/admin/id/{uid}", response_model=UserOut)
-def admin_update_user(uid: str, data: AdminUserUpdate, user_repo: IUserRepository = Depends(get_user_repo)):
+def admin_update_user(uid: str, data: AdminUserUpdate, user_repo: IUserRepository = Depends(get_user_repo), redis: Redis = Depends(get_redis)):
     """
     管理员更新用户信息（可以修改角色/状态）
     """
-    try:
-        updated = user_svc.admin_update_user(
-            user_repo=user_repo,
-            uid=uid,
-            data=data,
-            to_dict=True,
-        )
-        if not updated:
-            return BizResponse(data=None, msg=f"uid {uid} not found.", status_code=404)
-        return BizResponse(data=updated)
-    except Exception as e:
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    updated = user_svc.admin_update_user(
+        user_repo=user_repo,
+        uid=uid,
+        data=data,
+        to_dict=True,
+        cache=redis,
+    )
+    if not updated:
+        return BizResponse(data=None, msg=f"uid {uid} not found.", status_code=404)
+    return BizResponse(data=updated)
 
 
 @users_router.put("/password/id/{uid}")
@@ -174,57 +147,41 @@ def change_password(uid: str, body: UserPasswordUpdate, user_repo: IUserReposito
     """
     修改密码（业务层会负责哈希和校验 old_password）
     """
-    logger.debug("ok")
-    try:
-        ok = user_svc.change_password(
-            user_repo=user_repo,
-            uid=uid,
-            data=body,
-        )
-        if not ok:
-            return BizResponse(data=False, msg="change password failed", status_code=400)
-        return BizResponse(data=True)
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except PasswordMismatchError as e:
-        return BizResponse(data=None, msg=str(e), status_code=400)
-    except Exception as e:
-        return BizResponse(data=False, msg=str(e), status_code=500)
+    ok = user_svc.change_password(
+        user_repo=user_repo,
+        uid=uid,
+        data=body,
+    )
+    if not ok:
+        return BizResponse(data=False, msg="change password failed", status_code=400)
+    return BizResponse(data=True)
 
 
 @users_router.delete("/soft/id/{uid}")
-def soft_delete_user(uid: str, user_repo: IUserRepository = Depends(get_user_repo)):
+def soft_delete_user(uid: str, user_repo: IUserRepository = Depends(get_user_repo), redis: Redis = Depends(get_redis)):
     """
     软删除用户
     """
-    try:
-        ok = user_svc.soft_delete_user(
-            user_repo=user_repo,
-            uid=uid,
-        )
-        if not ok:
-            return BizResponse(data=False, msg=f"soft delete faliled", status_code=404)
-        return BizResponse(data=True)
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except Exception as e:
-        return BizResponse(data=False, msg=str(e), status_code=500)
+    ok = user_svc.soft_delete_user(
+        user_repo=user_repo,
+        uid=uid,
+        cache=redis,
+    )
+    if not ok:
+        return BizResponse(data=False, msg=f"soft delete faliled", status_code=404)
+    return BizResponse(data=True)
     
 # ================================== 管理员用 ==================================
 @users_router.delete("/hard/id/{uid}")
-def hard_deleted_user(uid: str, user_repo: IUserRepository = Depends(get_user_repo)):
-    try:
-        ok = user_svc.hard_delete_user(
-            user_repo=user_repo,
-            uid=uid,
-        )
-        if not ok:
-            return BizResponse(data=False, msg=f"hard delete faliled", status_code=404)
-        return BizResponse(data=True)
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except Exception as e:
-        return BizResponse(data=False, msg=str(e), status_code=500)
+def hard_deleted_user(uid: str, user_repo: IUserRepository = Depends(get_user_repo), redis: Redis = Depends(get_redis)):
+    ok = user_svc.hard_delete_user(
+        user_repo=user_repo,
+        uid=uid,
+        cache=redis,
+    )
+    if not ok:
+        return BizResponse(data=False, msg=f"hard delete faliled", status_code=404)
+    return BizResponse(data=True)
 
 @users_router.get("/admin", response_model=BatchUsersAllOut)
 def admin_get_users(
@@ -235,17 +192,13 @@ def admin_get_users(
     """
     管理员：分页查看所有用户（包含软删）
     """
-    try:
-        result = user_svc.admin_get_users(
-            user_repo=user_repo,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception("[ADMIN] get users failed")
-        return BizResponse(data=list(), msg=str(e), status_code=500)   
+    result = user_svc.admin_get_users(
+        user_repo=user_repo,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 @users_router.get("/admin/id/{uid}", response_model=UserAllOut)
 def admin_get_user_by_uid(
@@ -257,18 +210,12 @@ def admin_get_user_by_uid(
     - 不过滤软删除
     - 返回 UserAllOut（字段更全）
     """
-    try:
-        user = user_svc.admin_get_user_by_uid(
-            user_repo=user_repo,
-            uid=uid,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(user))
-    except UserNotFound as e:
-        return BizResponse(data=None, msg=str(e), status_code=404)
-    except Exception as e:
-        logger.exception(f"[ADMIN] get user by uid failed: {e}")
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    user = user_svc.admin_get_user_by_uid(
+        user_repo=user_repo,
+        uid=uid,
+        to_dict=True,
+    )
+    return BizResponse(data=user)
 
 @users_router.get("/admin/username/{username}", response_model=BatchUsersAllOut)
 def admin_get_users_by_username(
@@ -282,18 +229,14 @@ def admin_get_users_by_username(
     - 不过滤软删除
     - 返回 BatchUsersAllOut
     """
-    try:
-        result = user_svc.admin_get_users_by_username(
-            user_repo=user_repo,
-            username=username,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception(f"[ADMIN] get users by username failed: {e}")
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    result = user_svc.admin_get_users_by_username(
+        user_repo=user_repo,
+        username=username,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 
 @users_router.get("/admin/deleted", response_model=BatchUsersAllOut)
@@ -306,17 +249,13 @@ def admin_list_deleted_users(
     管理员查看所有软删除用户：
     - deleted_at IS NOT NULL
     """
-    try:
-        result = user_svc.admin_list_deleted_users(
-            user_repo=user_repo,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception(f"[ADMIN] list deleted users failed: {e}")
-        return BizResponse(data=None, msg=str(e), status_code=500)
+    result = user_svc.admin_list_deleted_users(
+        user_repo=user_repo,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
 
 @users_router.get("/admin/abnormal-status", response_model=BatchUsersAllOut)
 def admin_list_abnormal_status_users(
@@ -327,14 +266,10 @@ def admin_list_abnormal_status_users(
     """
     管理员查看异常状态用户（冻结与禁用）：
     """
-    try:
-        result = user_svc.admin_list_abnormal_status_users(
-            user_repo=user_repo,
-            page=page,
-            page_size=page_size,
-            to_dict=True,
-        )
-        return BizResponse(data=jsonable_encoder(result))
-    except Exception as e:
-        logger.exception(f"[ADMIN] list abnormal status users failed: {e}")
-        return BizResponse(data=None, msg=str(e), status_code=500)
\ No newline at end of file
+    result = user_svc.admin_list_abnormal_status_users(
+        user_repo=user_repo,
+        page=page,
+        page_size=page_size,
+        to_dict=False,
+    )
+    return BizResponse(data=result)
\ No newline at end of file
@@ -1,29 +1,36 @@
-from typing import List, Optional
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional
+from app.schemas.types import UTC8Datetime, UUIDStr, FROM_ATTR, FROM_ATTR_FORBID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, TypeAdapter
 
 from app.models.comment import CommentStatus, ReviewStatus
 
 from app.schemas.comment_content import CommentContentOut
-from app.schemas.user import UserAllOut
+from app.schemas.user import UserAllOut, AuthorSnippetOut
+
+# 审核 / 状态更新接口按整数字面量校验，取值须与 ReviewStatus / CommentStatus 一致
+ReviewStatusValue = Literal[0, 1, 2]     # ReviewStatus：0 待审, 1 通过, 2 拒绝
+CommentStatusValue = Literal[0, 1]       # CommentStatus：0 正常, 1 折叠
 
 class CommentCreate(BaseModel):
     """
     创建评论（业务上通常由用户自己调用）：
     """
-    post_id: str                  # 所属帖子 PID（FK -> posts.pid）
-    author_id: str                # 评论作者 UID（FK -> users.uid）
+    post_id: UUIDStr              # 所属帖子 PID（FK -> posts.pid）
+    author_id: UUIDStr            # 评论作者 UID（FK -> users.uid）
     content: str                  # 评论内容，后续插入评论内容表中
-    parent_id: Optional[str] = None   # 父评论 CID（首层评论时为 None）
-    root_id: Optional[str] = None     # 顶级评论 CID（首层评论可等于自身，业务层可补）
+    parent_id: Optional[UUIDStr] = None   # 父评论 CID（首层评论时为 None）
+    root_id: Optional[UUIDStr] = None     # 顶级评论 CID（首层评论可等于自身，业务层可补）
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
-class CommentOnlyCreate(BaseModel):
+@dataclass(slots=True)
+class CommentOnlyCreate:
     """
     创建评论（仅限评论表内部调用）：
+    - 只由业务层用已校验过的 CommentCreate 构造，不再做 Pydantic 校验，用普通 dataclass
     """
     post_id: str                  # 所属帖子 PID（FK -> posts.pid）
     author_id: str                # 评论作者 UID（FK -> users.uid）
@@ -34,24 +41,22 @@ class CommentOnlyCreate(BaseModel):
     status: Optional[CommentStatus] = CommentStatus.NORMAL
     review_status: Optional[ReviewStatus] = ReviewStatus.PENDING
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
-
 
 class ReviewUpdate(BaseModel):
     """
     审核评论（审核员）：
     """
-    review_status: Optional[ReviewStatus] = None
+    review_status: Optional[ReviewStatusValue] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 class StatusUpdate(BaseModel):
     """
     更新评论状态（0：正常，1：折叠）（管理员）：
     """
-    status: Optional[CommentStatus] = None
+    status: Optional[CommentStatusValue] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class CommentOut(BaseModel):
@@ -73,35 +78,21 @@ class CommentOut(BaseModel):
     status: CommentStatus         # 评论状态（正常/折叠）
     review_status: ReviewStatus   # 审核状态（待审/通过/拒绝）
 
-    reviewed_at: Optional[datetime] = None   # 审核时间
+    reviewed_at: Optional[UTC8Datetime] = None   # 审核时间
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class CommentAdminOut(CommentOut):
     """
     管理员视角的评论信息：
-    - 在 CommentOut 的基础上额外包含 deleted_at
+    - 在 CommentOut 的基础上额外包含作者完整信息和 deleted_at
+    - 其余字段直接继承 CommentOut，不再重复声明
     """
-    cid: str                      # 评论业务主键（UUID）
-    post_id: str                  # 所属帖子 PID
-    author_id: str                # 评论作者 UID
     author: UserAllOut            # 评论作者具体信息
-    comment_content: CommentContentOut  # 评论具体内容
+    deleted_at: Optional[UTC8Datetime] = None   # 软删除时间戳
 
-    parent_id: Optional[str] = None   # 父评论 CID
-    root_id: Optional[str] = None     # 顶级评论 CID
-
-    comment_count: int            # 该评论的子评论数（楼中楼数量）
-    like_count: int               # 点赞数
-
-    status: CommentStatus         # 评论状态（正常/折叠）
-    review_status: ReviewStatus   # 审核状态（待审/通过/拒绝）
-
-    reviewed_at: Optional[datetime] = None   # 审核时间
-    deleted_at: Optional[datetime] = None   # 软删除时间戳
-
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchCommentsOut(BaseModel):
@@ -114,8 +105,10 @@ class BatchCommentsOut(BaseModel):
     total: int
     count: int
     items: List[CommentOut]
+    next_cursor: Optional[str] = None   # 下一页游标（没有下一页时为 None）
+    authors: Dict[str, AuthorSnippetOut] = {}   # 本页评论作者的精简信息（author_id -> 作者），同一作者只返回一次
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchCommentsAdminOut(BaseModel):
@@ -126,5 +119,11 @@ class BatchCommentsAdminOut(BaseModel):
     total: int
     count: int
     items: List[CommentAdminOut]
+    next_cursor: Optional[str] = None   # 下一页游标（没有下一页时为 None）
+
+    model_config = FROM_ATTR
+
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+# 评论列表条目的 TypeAdapter（用法同 app/schemas/post.py 的 POST_OUT_LIST_TA）
+COMMENT_OUT_LIST_TA = TypeAdapter(List[CommentOut])
+COMMENT_ADMIN_OUT_LIST_TA = TypeAdapter(List[CommentAdminOut])
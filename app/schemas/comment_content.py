@@ -1,18 +1,19 @@
+from dataclasses import dataclass
 from typing import List, Optional
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from app.schemas.types import UTC8Datetime, FROM_ATTR, FROM_ATTR_DEFERRED
+from pydantic import BaseModel
 
 
-class CommentContentCreate(BaseModel):
+@dataclass(slots=True)
+class CommentContentCreate:
     """
     创建评论内容：
     - 业务层通常在创建 Comment 后立即创建 CommentContent
+    - 内部入参（正文已在 CommentCreate 校验），用普通 dataclass
     """
     comment_id: str     # FK -> comments.cid
     content: str        # 评论正文（Markdown / 富文本均可）
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
-
 # 评论区不能删除重发评论，不允许更新编辑评论
 # class CommentContentUpdate(BaseModel):
 #     """
@@ -21,7 +22,7 @@ class CommentContentCreate(BaseModel):
 #     """
 #     content: Optional[str] = None  # 评论内容
 
-#     model_config = ConfigDict(from_attributes=True, extra="forbid")
+#     model_config = FROM_ATTR_FORBID
 
 
 class CommentContentOut(BaseModel):
@@ -32,10 +33,10 @@ class CommentContentOut(BaseModel):
     ccid: str
     comment_id: str
     content: str
-    created_at: datetime
-    updated_at: datetime
+    created_at: UTC8Datetime
+    updated_at: UTC8Datetime
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchCommentContentsOut(BaseModel):
@@ -46,4 +47,4 @@ class BatchCommentContentsOut(BaseModel):
     count: int
     items: List[CommentContentOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
@@ -1,6 +1,6 @@
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel
+from app.schemas.types import UTC8Datetime, UUIDStr, FROM_ATTR, FROM_ATTR_FORBID, FROM_ATTR_DEFERRED
 from enum import Enum
 from pydantic import BaseModel
 from app.schemas.user import UserOut
@@ -9,10 +9,10 @@ class FollowCreate(BaseModel):
     """
     创建关注
     """
-    user_id: str               # 关注者 UID（也可以从 token 中取，按你业务）
-    followed_user_id: str      # 被关注者 UID
+    user_id: UUIDStr           # 关注者 UID（也可以从 token 中取，按你业务）
+    followed_user_id: UUIDStr  # 被关注者 UID
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class FollowOut(BaseModel):
@@ -25,7 +25,7 @@ class FollowOut(BaseModel):
     user_id: str               # 关注者 UID
     followed_user_id: str      # 被关注者 UID
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class FollowAdminOut(BaseModel):
@@ -37,9 +37,9 @@ class FollowAdminOut(BaseModel):
     """
     user_id: str               # 关注者 UID
     followed_user_id: str      # 被关注者 UID
-    deleted_at:  Optional[datetime] = None # 删除时间
+    deleted_at:  Optional[UTC8Datetime] = None # 删除时间
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
 
 class FollowUserOut(BaseModel):
     """
@@ -52,7 +52,7 @@ class FollowUserOut(BaseModel):
     # 可扩展字段：是否已互相关注（可选，根据业务返回）
     is_mutual: Optional[bool] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchFollowsOut(BaseModel):
@@ -61,12 +61,14 @@ class BatchFollowsOut(BaseModel):
     - items: FollowUserOut 列表，表示对方用户的公开信息
     - total: 满足条件数量
     - count: 当前页数量
+    - next_cursor: 下一页游标（没有下一页时为 None）
     """
     total: int
     count: int
     items: List[FollowUserOut]
+    next_cursor: Optional[str] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
 
 
 
@@ -75,7 +77,7 @@ class FollowCancel(BaseModel):
     取消关注（软删除）
     - 若接口路径包含用户 ID，可以不需要 body
     """
-    user_id: str               # 关注者 UID
-    followed_user_id: str      # 被关注者 UID
+    user_id: UUIDStr           # 关注者 UID
+    followed_user_id: UUIDStr  # 被关注者 UID
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
@@ -1,23 +1,30 @@
-from typing import List, Optional
-from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from app.schemas.types import UTC8Datetime, UUIDStr, FROM_ATTR, FROM_ATTR_FORBID, FROM_ATTR_DEFERRED, DEFERRED
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, TypeAdapter
 
 from app.models.like import LikeTargetType  
-from app.schemas.user import UserOut, UserAllOut 
-from app.schemas.post import PostOut, PostAdminOut
-from app.schemas.comment import CommentOut, CommentAdminOut
+
+# 下面几个只在注释掉的 user / post / comment 嵌套字段里用到，运行时不导入，
+# 免得导入 like schema 时顺带把 user / post / comment 的模型都构建一遍；
+# 真要启用这些嵌套字段时改回正常导入即可（或用字符串前向引用 + model_rebuild）
+if TYPE_CHECKING:
+    from app.schemas.user import UserOut, UserAllOut
+    from app.schemas.post import PostOut, PostAdminOut
+    from app.schemas.comment import CommentOut, CommentAdminOut
+
+
 class LikeCreate(BaseModel):
     """
     创建点赞：
     - 业务上通常由当前登录用户对某个帖子 / 评论点赞
     - 一个用户对同一 target_type + target_id 只能有一条有效点赞记录
     """
-    user_id: str                          # 点赞用户 UID（FK -> users.uid）
+    user_id: UUIDStr                      # 点赞用户 UID（FK -> users.uid）
     target_type: LikeTargetType           # 点赞目标类型（0: 帖子, 1: 评论）
-    target_id: str                        # 点赞目标业务主键（帖子 pid / 评论 cid）
+    target_id: UUIDStr                    # 点赞目标业务主键（帖子 pid / 评论 cid）
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class LikeCancel(BaseModel):
@@ -26,11 +33,11 @@ class LikeCancel(BaseModel):
     - 通常只需要 user_id + target_type + target_id 即可定位记录
     - 如果你接口是 DELETE /likes/{lid}，那也可以不用这个模型
     """
-    user_id: str
+    user_id: UUIDStr
     target_type: LikeTargetType
-    target_id: str
+    target_id: UUIDStr
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class LikeOut(BaseModel):
@@ -43,34 +50,28 @@ class LikeOut(BaseModel):
     user_id: str                          # 点赞用户 UID
     target_type: LikeTargetType           # 目标类型（帖子/评论）
     target_id: str                        # 目标业务主键
-    created_at: datetime                  # 点赞时间
-    updated_at: datetime                  # 最近一次更新点赞时间
+    created_at: UTC8Datetime                  # 点赞时间
+    updated_at: UTC8Datetime                  # 最近一次更新点赞时间
     # user: Optional[UserOut] = None
     # post: Optional[PostOut] = None        # 仅当 target_type = POST 才有值
     # comment: Optional[CommentOut] = None  # 仅当 target_type = COMMENT 才有值
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class LikeAdminOut(LikeOut):
     """
     管理员视角的点赞信息：
-    - 在 LikeOut 基础上额外暴露 deleted_at
+    - 在 LikeOut 基础上额外暴露 deleted_at，其余字段继承 LikeOut
     - 可用于审计 / 数据排查
     """
-    lid: str                              # 点赞业务主键（UUID）
-    user_id: str                          # 点赞用户 UID
-    target_type: LikeTargetType           # 目标类型（帖子/评论）
-    target_id: str                        # 目标业务主键
-    created_at: datetime                  # 点赞时间
-    updated_at: datetime                  # 最近一次更新点赞时间
-    deleted_at: Optional[datetime] = None # 删除时间
+    deleted_at: Optional[UTC8Datetime] = None # 删除时间
 
     # user: Optional[UserAllOut] = None
     # post: Optional[PostAdminOut] = None        # 仅当 target_type = POST 才有值
     # comment: Optional[CommentAdminOut] = None  # 仅当 target_type = COMMENT 才有值
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
 
 
 class BatchLikesOut(BaseModel):
@@ -81,8 +82,9 @@ class BatchLikesOut(BaseModel):
     total: int
     count: int
     items: List[LikeOut]
+    next_cursor: Optional[str] = None   # 下一页游标（没有下一页时为 None）
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchLikesAdminOut(BaseModel):
@@ -94,7 +96,17 @@ class BatchLikesAdminOut(BaseModel):
     count: int
     items: List[LikeAdminOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
+
+class LikeBatchOut(BaseModel):
+    """
+    批量点赞 / 批量取消点赞的结果：
+    - requested：请求里的条数（含重复 / 无效项）
+    - changed：本次真正新增（恢复）或取消的条数，已点过 / 未点过的项不计入
+    """
+    requested: int
+    changed: int
+
 
 class GetTargetLike(BaseModel):
     """
@@ -103,3 +115,8 @@ class GetTargetLike(BaseModel):
     """
     target_type: LikeTargetType           # 目标类型（帖子/评论）
     target_id: str                        # 目标业务主键
+
+
+# 点赞列表条目的 TypeAdapter
+LIKE_OUT_LIST_TA = TypeAdapter(List[LikeOut])
+LIKE_ADMIN_OUT_LIST_TA = TypeAdapter(List[LikeAdminOut], config=DEFERRED)
@@ -1,36 +1,48 @@
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import List, Literal, Optional
 from datetime import datetime
+from app.schemas.types import UTC8Datetime, UUIDStr, FROM_ATTR, FROM_ATTR_FORBID, FROM_ATTR_DEFERRED, DEFERRED
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from app.models.post import PostVisibility, PostReviewStatus, PostPublishStatus
+from app.models.post_content import POST_TITLE_MAX_LEN
 
 from app.schemas.post_content import PostContentOut
 from app.schemas.post_stats import PostStatsOut
 
+# 更新接口里的状态字段直接按整数字面量校验，比逐个枚举查找便宜；取值须与对应 IntEnum 保持一致，
+# 需要枚举语义（比较 / 打日志）的地方由业务层再转成枚举
+PostVisibilityValue = Literal[0, 1]          # PostVisibility：0 所有人可见, 1 仅作者可见
+PostPublishStatusValue = Literal[0, 1]       # PostPublishStatus：0 草稿, 1 已发布
+PostReviewStatusValue = Literal[0, 1, 2]     # PostReviewStatus：0 待审, 1 通过, 2 拒绝
+
 # 创建一篇帖子
 class PostCreate(BaseModel):
     """
     创建帖子（业务上通常由作者自己调用）
     """
-    author_id: str        # 作者ID
-    title: str            # 标题
+    author_id: UUIDStr    # 作者ID
+    title: str = Field(max_length=POST_TITLE_MAX_LEN)  # 标题
     content: str          # 正文内容
-    visibility: Optional[PostVisibility] = PostVisibility.PUBLIC.value
-    publish_status: Optional[PostPublishStatus] = PostPublishStatus.PUBLISHED.value
+    visibility: PostVisibility = PostVisibility.PUBLIC                 # 可见性：默认所有人可见
+    publish_status: PostPublishStatus = PostPublishStatus.PUBLISHED    # 发布状态：默认发布
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    # 类型与默认值对齐；use_enum_values 让校验后直接存整数值，后续入库不再经过枚举
+    model_config = ConfigDict(from_attributes=True, extra="forbid", use_enum_values=True)
 
 class PostGet(BaseModel):
     current_user_id: str   # 当前访问者
     author_id: str         # 帖子作者
 
-class PostOnlyCreate(BaseModel):
+@dataclass(slots=True)
+class PostOnlyCreate:
     """
     创建帖子（内部调用插入帖子表中）
+    - 由业务层用已校验过的 PostCreate 构造，用普通 dataclass，不再重复校验
     """ 
     author_id: str        # 作者ID
-    visibility: Optional[PostVisibility] = PostVisibility.PUBLIC.value               # 可见性：默认所有人可见
-    publish_status: Optional[PostPublishStatus] = PostPublishStatus.PUBLISHED.value  # 发布状态：默认发布
+    visibility: int = PostVisibility.PUBLIC.value               # 可见性（PostVisibility 的取值）：默认所有人可见
+    publish_status: int = PostPublishStatus.PUBLISHED.value     # 发布状态（PostPublishStatus 的取值）：默认发布
 
 
 # 查看帖子
@@ -48,9 +60,9 @@ class PostOut(BaseModel):
     visibility: int                 # 可见性（0:公开, 1:仅作者）
     publish_status: int             # 发布状态（0:草稿, 1:发布）
     review_status: PostReviewStatus             # 审核状态
-    reviewed_at: Optional[datetime] = None      # 审核时间
+    reviewed_at: Optional[UTC8Datetime] = None      # 审核时间
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 # 查看帖子的审核状态
 class PostReviewOut(BaseModel):
@@ -58,9 +70,9 @@ class PostReviewOut(BaseModel):
     author_id: str                              # 作者 UID
     post_content: PostContentOut    # 帖子内容
     review_status: PostReviewStatus             # 审核状态
-    reviewed_at: Optional[datetime] = None      # 审核时间
+    reviewed_at: Optional[UTC8Datetime] = None      # 审核时间
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
 
 
 class PostAdminOut(BaseModel):
@@ -69,12 +81,12 @@ class PostAdminOut(BaseModel):
     post_content: PostContentOut    # 帖子内容
     post_stats: PostStatsOut        # 帖子统计数据
     review_status: PostReviewStatus             # 审核状态
-    reviewed_at: Optional[datetime] = None      # 审核时间
+    reviewed_at: Optional[UTC8Datetime] = None      # 审核时间
     visibility: int        # 可见性（0:公开, 1:仅作者）
     publish_status: int    # 发布状态（0:草稿, 1:发布）
-    deleted_at: Optional[datetime] = None    # 软删除时间戳
+    deleted_at: Optional[UTC8Datetime] = None    # 软删除时间戳
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 class BatchPostsAdminOut(BaseModel):
     """
@@ -87,7 +99,7 @@ class BatchPostsAdminOut(BaseModel):
     count: int
     items: List[PostAdminOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 class BatchPostsReviewOut(BaseModel):
     """
@@ -100,7 +112,7 @@ class BatchPostsReviewOut(BaseModel):
     count: int
     items: List[PostReviewOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
 
 class BatchPostsOut(BaseModel):
     """
@@ -112,8 +124,36 @@ class BatchPostsOut(BaseModel):
     total: int
     count: int
     items: List[PostOut]
+    next_cursor: Optional[str] = None   # 下一页游标（没有下一页时为 None）
+
+    model_config = FROM_ATTR
 
-    model_config = ConfigDict(from_attributes=True)
+
+class FeedItemOut(BaseModel):
+    """
+    首页信息流卡片（直接来自 feed_items 物化表）
+    """
+    pid: str                        # 帖子业务主键
+    author_id: str                  # 作者 UID
+    title: str                      # 帖子标题
+    like_count: int                 # 点赞数
+    comment_count: int              # 评论数
+
+    model_config = FROM_ATTR
+
+class BatchFeedOut(BaseModel):
+    """
+    首页信息流分页返回：
+    - total: 信息流中的帖子总数
+    - count: 当前页返回的数量
+    - items: 帖子卡片列表
+    """
+    total: int
+    count: int
+    items: List[FeedItemOut]
+    next_cursor: Optional[str] = None   # 下一页游标（没有下一页时为 None）
+
+    model_config = FROM_ATTR
 
 
 class TopPostAuthorOut(BaseModel):
@@ -121,7 +161,7 @@ class TopPostAuthorOut(BaseModel):
     nickname: str
     avatar_url: Optional[str] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 class TopPostOut(BaseModel):
     """
@@ -133,7 +173,7 @@ class TopPostOut(BaseModel):
     like_count: int                 # 点赞数
     comment_count: int              # 评论数
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 class TopPostsResponse(BaseModel):
     """
@@ -142,7 +182,7 @@ class TopPostsResponse(BaseModel):
     """
     items: List[TopPostOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 class PostUpdate(BaseModel):
     """
@@ -150,10 +190,10 @@ class PostUpdate(BaseModel):
     - 帖子的可见性可从所有人可见到仅作者可见随意切换
     - 帖子的发布状态只可以由草稿到发布状态的转变（业务层限制）
     """
-    visibility: Optional[PostVisibility] = None
-    publish_status: Optional[PostPublishStatus] = None
+    visibility: Optional[PostVisibilityValue] = None
+    publish_status: Optional[PostPublishStatusValue] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class PostReviewUpdate(BaseModel):
@@ -162,9 +202,16 @@ class PostReviewUpdate(BaseModel):
     - 用于审核接口
     - 审核状态可以从待审切换到通过或者拒绝，不可以从通过或拒绝切换回待审（业务层限制）
     """
-    review_status: Optional[PostReviewStatus] 
+    review_status: Optional[PostReviewStatusValue]
     # reviewed_at 一般由后端在逻辑里写当前时间，这里可以不用前端传
     # 但如果你想做回放 / 修复，也可以允许传：
     reviewed_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
+
+
+# 列表条目的 TypeAdapter 只建一次：仓库层整页 ORM 行一次 validate_python（循环在 pydantic-core 里），
+# 外层 Batch*Out 再用 model_construct 组装，不再逐条 model_validate、也不再二次校验已校验过的条目
+POST_OUT_LIST_TA = TypeAdapter(List[PostOut])
+POST_REVIEW_OUT_LIST_TA = TypeAdapter(List[PostReviewOut], config=DEFERRED)
+FEED_ITEM_OUT_LIST_TA = TypeAdapter(List[FeedItemOut])
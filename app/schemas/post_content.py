@@ -1,29 +1,31 @@
+from dataclasses import dataclass
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
+from app.schemas.types import FROM_ATTR, FROM_ATTR_DEFERRED
 
 
-class PostContentCreate(BaseModel):
+@dataclass(slots=True)
+class PostContentCreate:
     """
     创建帖子内容：
     - 一般在创建帖子(Post)之后调用，也可以在业务层封装成“创建帖子 + 内容”一步完成
+    - 内部入参，标题长度已由 PostCreate 按 POST_TITLE_MAX_LEN 校验，这里不再重复
     """
     post_id: str          # 对应 posts.pid
     title: str            # 标题
     content: str          # 正文内容（富文本/Markdown 视前端而定）
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
 
-
-class PostContentUpdate(BaseModel):
+@dataclass(slots=True)
+class PostContentUpdate:
     """
     更新帖子内容：
     - 通常允许修改 title / content
+    - 内部入参，不做校验，调用方保证标题不超过 POST_TITLE_MAX_LEN
     """
     title: Optional[str] = None
     content: Optional[str] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
-
 
 class PostContentOut(BaseModel):
     """
@@ -36,7 +38,7 @@ class PostContentOut(BaseModel):
     title: str
     content: str
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchPostContentsOut(BaseModel):
@@ -47,4 +49,4 @@ class BatchPostContentsOut(BaseModel):
     count: int
     items: List[PostContentOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
@@ -1,20 +1,22 @@
+from dataclasses import dataclass
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
+from app.schemas.types import FROM_ATTR, FROM_ATTR_DEFERRED
 
 
-class PostStatsCreate(BaseModel):
+@dataclass(slots=True)
+class PostStatsCreate:
     """
     创建帖子统计记录（通常在创建帖子时自动建立）
-    - 一般不对外暴露接口
+    - 一般不对外暴露接口，只在内部构造，用普通 dataclass
     """
     post_id: str
     like_count: int = 0
     comment_count: int = 0
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
 
-
-class PostStatsUpdate(BaseModel):
+@dataclass(slots=True)
+class PostStatsUpdate:
     """
     更新帖子统计：
     - 通常在点赞 / 取消点赞、评论增加 / 删除时调用
@@ -23,8 +25,6 @@ class PostStatsUpdate(BaseModel):
     like_count: Optional[int] = None
     comment_count: Optional[int] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
-
 
 class PostStatsOut(BaseModel):
     """
@@ -37,7 +37,7 @@ class PostStatsOut(BaseModel):
     like_count: int
     comment_count: int
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class BatchPostStatsOut(BaseModel):
@@ -48,4 +48,4 @@ class BatchPostStatsOut(BaseModel):
     count: int
     items: List[PostStatsOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR_DEFERRED
@@ -0,0 +1,39 @@
+import uuid
+from dataclasses import fields
+from datetime import datetime
+from typing import Annotated, Any, Dict
+
+from pydantic import AfterValidator, ConfigDict
+
+from app.core.time import to_utc8
+
+# 数据库按 UTC 存储时间（TIMESTAMP + 会话 time_zone='+00:00'），返回给前端前统一转成东八区
+UTC8Datetime = Annotated[datetime, AfterValidator(to_utc8)]
+
+
+def _normalize_uuid(value: str) -> str:
+    """校验 UUID 字符串并统一成小写带连字符的格式；非法时抛 ValueError，由 Pydantic 转成 422"""
+    return str(uuid.UUID(value))
+
+
+# 写入类入参里的 UUID 字段：格式不对直接拒绝，不会到数据库层被当成 NULL
+UUIDStr = Annotated[str, AfterValidator(_normalize_uuid)]
+
+# 各 schema 共用的 model_config：输出模型从 ORM 对象读取（from_attributes），入参模型额外拒绝未知字段
+FROM_ATTR = ConfigDict(from_attributes=True)
+FROM_ATTR_FORBID = ConfigDict(from_attributes=True, extra="forbid")
+# 管理 / 审核 / 批量内容这类冷门输出模型：首次校验或序列化时才构建 core schema，进程里用不到就不付这份开销
+FROM_ATTR_DEFERRED = ConfigDict(from_attributes=True, defer_build=True)
+# 只服务于上述冷门模型的列表 TypeAdapter 同样延迟构建
+DEFERRED = ConfigDict(defer_build=True)
+
+
+def dataclass_payload(obj: Any, exclude_none: bool = False) -> Dict[str, Any]:
+    """
+    仓库层内部入参（dataclass）转成 ORM 构造 / 更新用的字段字典：
+    - 相当于 BaseModel.model_dump(exclude_none=...)，浅拷贝，不像 dataclasses.asdict 那样递归深拷贝
+    """
+    payload = {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if exclude_none:
+        payload = {k: v for k, v in payload.items() if v is not None}
+    return payload
@@ -1,6 +1,6 @@
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr, AnyUrl, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, AnyUrl, TypeAdapter
+from app.schemas.types import UTC8Datetime, FROM_ATTR, FROM_ATTR_FORBID
 from app.models.user import UserRole, UserStatus
 
 class UserCreate(BaseModel):
@@ -19,7 +19,7 @@ class UserCreate(BaseModel):
     role: Optional[UserRole] = 0
     status: Optional[UserStatus] = 0
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 class UserOut(BaseModel):
     """
@@ -37,7 +37,18 @@ class UserOut(BaseModel):
     # created_at: Optional[datetime] = None
     # updated_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
+
+class AuthorSnippetOut(BaseModel):
+    """
+    列表里展示作者用的精简信息（评论列表等），变化少、读得多，会被缓存
+    """
+    uid: str                                     # 业务主键（UUID 字符串）
+    username: str                                # 昵称
+    avatar_url: Optional[str] = None             # 头像 URL
+    role: UserRole = UserRole.NORMAL_USER        # 角色
+
+    model_config = FROM_ATTR
 
 class UserAllOut(BaseModel):
     """
@@ -56,12 +67,12 @@ class UserAllOut(BaseModel):
     role: Optional[UserRole]
     status: Optional[UserStatus]
 
-    last_login_at: Optional[datetime] = None
-    created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
-    deleted_at: Optional[datetime] = None
+    last_login_at: Optional[UTC8Datetime] = None
+    created_at: Optional[UTC8Datetime] = None
+    updated_at: Optional[UTC8Datetime] = None
+    deleted_at: Optional[UTC8Datetime] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 class UserDetailOut(UserOut):
     
@@ -83,7 +94,7 @@ class BatchUsersOut(BaseModel):
     count: int
     users: List[UserOut]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 class BatchUsersAllOut(BaseModel):
     total: int
@@ -104,7 +115,7 @@ class UserUpdate(BaseModel):
 
     # 如果你有“修改密码”接口，建议单独一个 Schema（见下）
     # 这里不直接允许更新 password，避免误用
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class AdminUserUpdate(BaseModel):
@@ -119,7 +130,7 @@ class AdminUserUpdate(BaseModel):
     role: Optional[UserRole] = None
     status: Optional[UserStatus] = None
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
 
 
 class UserPasswordUpdate(BaseModel):
@@ -129,4 +140,9 @@ class UserPasswordUpdate(BaseModel):
     old_password: Optional[str] = None  # 第三方绑定后首次设置密码可不传旧密码
     new_password: str
 
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
+    model_config = FROM_ATTR_FORBID
+
+
+# 用户列表条目的 TypeAdapter
+USER_OUT_LIST_TA = TypeAdapter(List[UserOut])
+USER_ALL_OUT_LIST_TA = TypeAdapter(List[UserAllOut])
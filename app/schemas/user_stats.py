@@ -1,5 +1,7 @@
+from dataclasses import dataclass
 from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
+from app.schemas.types import FROM_ATTR
 from datetime import datetime
 from app.schemas.user import UserOut
 
@@ -13,7 +15,7 @@ class UserStatsOut(BaseModel):
     following_count: int
     followers_count: int
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 
 class UserStatsWithUserOut(BaseModel):
@@ -25,15 +27,14 @@ class UserStatsWithUserOut(BaseModel):
     following_count: int
     followers_count: int
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = FROM_ATTR
 
 # 通常用不上
-class UserStatsUpdate(BaseModel):
+@dataclass(slots=True)
+class UserStatsUpdate:
     """
     用于服务层内部更新统计数据。
-    - 注意：通常不会暴露给前端接口。
+    - 注意：通常不会暴露给前端接口，用普通 dataclass。
     """
     following_count: Optional[int] = None
     followers_count: Optional[int] = None
-
-    model_config = ConfigDict(from_attributes=True, extra="forbid")
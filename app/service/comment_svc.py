@@ -1,5 +1,7 @@
 from typing import Dict, List, Optional, Set, Union
 
+from redis import Redis
+
 from app.schemas.comment import (
     CommentCreate,
     CommentOnlyCreate,
@@ -19,6 +21,8 @@ from app.storage.user.user_interface import IUserRepository
 from app.storage.post.post_interface import IPostRepository
 from app.storage.post_stats.post_stats_interface import IPostStatsRepository
 
+from app.service.user_svc import get_author_snippets
+
 from app.core.logx import logger
 from app.core.exceptions import (
     UserNotFound,
@@ -27,7 +31,7 @@ from app.core.exceptions import (
     InvalidReviewStatusTransition,
     CommentNotSoftDeletedError,
 )
-from app.models.comment import ReviewStatus
+from app.models.comment import CommentStatus, ReviewStatus
 from collections import defaultdict
 
 #---------------------------------------- 增 -----------------------------------------
@@ -254,17 +258,27 @@ def list_comments_by_post_for_user(
     post_id: str,
     page: int = 0,
     page_size: int = 10,
+    cursor: Optional[str] = None,
+    user_repo: Optional[IUserRepository] = None,
+    cache: Optional[Redis] = None,
     to_dict: bool = True,
 ) -> Union[Dict, BatchCommentsOut]:
     """
     普通用户 / 前台：查看某帖子的评论列表
     - 不包含软删除 / 折叠 / REJECTED 评论
+    - 传了 cursor（上一页的 next_cursor）时按游标分页，深翻页不再随 OFFSET 变慢
+    - 传了 user_repo 时顺带返回本页作者的昵称 / 头像（authors，按 uid 去重，优先走 Redis）
     """
     result = comment_repo.list_comments_by_post_for_user(
         post_id=post_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
+    if user_repo is not None:
+        result.authors = get_author_snippets(
+            user_repo, [c.author_id for c in result.items], cache
+        )
     return result.model_dump() if to_dict else result
 
 
@@ -273,6 +287,7 @@ def list_comments_by_post_for_reviewer(
     post_id: str,
     page: int = 0,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     to_dict: bool = True,
 ) -> Union[Dict, BatchCommentsAdminOut]:
     """
@@ -284,6 +299,7 @@ def list_comments_by_post_for_reviewer(
         post_id=post_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
     return result.model_dump() if to_dict else result
 
@@ -293,6 +309,7 @@ def list_comments_by_post_for_admin(
     post_id: str,
     page: int = 0,
     page_size: int = 10,
+    cursor: Optional[str] = None,
     to_dict: bool = True,
 ) -> Union[Dict, BatchCommentsAdminOut]:
     """
@@ -303,6 +320,7 @@ def list_comments_by_post_for_admin(
         post_id=post_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
     return result.model_dump() if to_dict else result
 
@@ -329,11 +347,11 @@ def review_comment(
         raise CommentNotFound(message= f"comment {cid} not found")
 
     old_status = current.review_status
-    new_status = data.review_status
-
-    if new_status is None:
+    if data.review_status is None:
         # 没传新状态就不处理
         raise InvalidReviewStatusTransition("review_status cannot be None")
+    # 请求体里是整数字面量，这里转回枚举再做状态流转判断
+    new_status = ReviewStatus(data.review_status)
 
     # 2. 校验状态流转：
     #    不允许从 APPROVED / REJECTED 回到 PENDING
@@ -384,7 +402,7 @@ def update_comment_status(
     if not updated:
         raise CommentNotFound(message=f"comment {cid} not found after status update")
 
-    logger.info(f"[ADMIN] updated comment status cid={cid} -> {data.status}")
+    logger.info(f"[ADMIN] updated comment status cid={cid} -> {CommentStatus(data.status).name}")
     return updated.model_dump() if to_dict else updated
 
 #------------------------------- 删除：软删 & 硬删 -----------------------------------
@@ -1,4 +1,7 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+from redis import Redis
+from redis.exceptions import RedisError
 
 from app.schemas.follow import (
     FollowCreate,
@@ -7,8 +10,8 @@ from app.schemas.follow import (
     BatchFollowsOut,
 )
 from app.storage.user.user_interface import IUserRepository
-from app.storage.user_stats.user_stats_interface import IUserStatsRepository
 from app.storage.follow.follow_interface import IFollowRepository
+from app.storage.user_stats.user_stats_interface import IUserStatsRepository
 
 from app.core.logx import logger
 from app.core.exceptions import (
@@ -18,68 +21,156 @@ from app.core.exceptions import (
     NotFollowingError,
     HardDeleteFollowRequiresSoftDeleteError,
 )
-logger.is_debug(True)
 
-def follow_user(follow_repo: IFollowRepository, stats_repo: IUserStatsRepository, user_repo: IUserRepository, follow: FollowCreate, to_dict: bool = True,) -> Union[Dict, FollowOut]:
+# 关注数 / 粉丝数异步回写：请求里只在 Redis 累加增量，后台任务定期合并写入 user_stats
+USER_STATS_DELTA_KEY_PATTERN = "ustats:{uid}"      # hash：following / followers 两个字段，存尚未落库的增量
+USER_STATS_DIRTY_KEY = "ustats:dirty"               # set：有待落库增量的 uid
+
+
+def _enqueue_stats_deltas(
+    cache: Redis,
+    stats_repo: IUserStatsRepository,
+    user_id: str,
+    followed_user_id: str,
+    step: int,
+) -> None:
+    """
+    记录一次关注 / 取关带来的计数变化：
+    - 正常情况：一个 pipeline 里两次 HINCRBY + SADD 脏标记，不碰数据库
+    - Redis 不可用：退回直接写 user_stats，计数不丢
+    """
+    try:
+        pipe = cache.pipeline(transaction=False)
+        pipe.hincrby(USER_STATS_DELTA_KEY_PATTERN.format(uid=user_id), "following", step)
+        pipe.hincrby(USER_STATS_DELTA_KEY_PATTERN.format(uid=followed_user_id), "followers", step)
+        pipe.sadd(USER_STATS_DIRTY_KEY, user_id, followed_user_id)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"user stats delta cache unavailable, write db directly: {e}")
+        stats_repo.apply_deltas({user_id: (step, 0), followed_user_id: (0, step)})
+
+
+def get_pending_stats_delta(cache: Optional[Redis], user_id: str) -> Tuple[int, int]:
+    """
+    读取某用户尚未落库的 (关注数增量, 粉丝数增量)，用于展示时叠加到 user_stats 上
+    - 没有 Redis 或读取失败时视为 0
+    """
+    if cache is None:
+        return 0, 0
+    try:
+        pending = cache.hgetall(USER_STATS_DELTA_KEY_PATTERN.format(uid=user_id))
+    except RedisError as e:
+        logger.warning(f"failed to read pending user stats of {user_id}: {e}")
+        return 0, 0
+    return int(pending.get("following", 0)), int(pending.get("followers", 0))
+
+
+def flush_user_stats_deltas(stats_repo: IUserStatsRepository, cache: Redis, limit: int = 1000) -> int:
+    """
+    把 Redis 中累计的关注数 / 粉丝数增量合并写入 user_stats（后台定时调用）：
+    1. 从脏集合里取出最多 limit 个 uid
+    2. 每个 uid 用 MULTI 原子地读出并删除增量 hash，之后的新增量会重新标脏
+    3. 整批一次写库；写库失败时把增量加回 Redis，下一轮重试
+    - 返回写入的用户数
+    """
+    uids = cache.spop(USER_STATS_DIRTY_KEY, limit)
+    if not uids:
+        return 0
+
+    pipe = cache.pipeline(transaction=True)
+    for uid in uids:
+        key = USER_STATS_DELTA_KEY_PATTERN.format(uid=uid)
+        pipe.hgetall(key)
+        pipe.delete(key)
+    replies = pipe.execute()
+
+    deltas: Dict[str, Tuple[int, int]] = {}
+    for uid, pending in zip(uids, replies[::2]):
+        following, followers = int(pending.get("following", 0)), int(pending.get("followers", 0))
+        if following or followers:
+            deltas[uid] = (following, followers)
+
+    try:
+        return stats_repo.apply_deltas(deltas)
+    except Exception:
+        pipe = cache.pipeline(transaction=False)
+        for uid, (following, followers) in deltas.items():
+            key = USER_STATS_DELTA_KEY_PATTERN.format(uid=uid)
+            pipe.hincrby(key, "following", following)
+            pipe.hincrby(key, "followers", followers)
+            pipe.sadd(USER_STATS_DIRTY_KEY, uid)
+        pipe.execute()
+        raise
+
+
+def follow_user(
+    follow_repo: IFollowRepository,
+    user_repo: IUserRepository,
+    follow: FollowCreate,
+    to_dict: bool = True,
+    stats_repo: Optional[IUserStatsRepository] = None,
+    cache: Optional[Redis] = None,
+) -> Union[Dict, FollowOut]:
     """
     关注用户：
     1. 检查关注用户是否存在
     2. 检查是否自己关注自己（禁止）
-    3. 检查是否已关注，如果已关注可直接返回或抛错（这里选择直接返回）
-    4. 创建 Follow 记录
-    5. 更新统计：current_uid.following +1, target_uid.followers +1
+    3. 创建 / 恢复 Follow 记录，并更新统计：current_uid.following +1, target_uid.followers +1
+       - 传了 cache + stats_repo：只写 Follow，计数增量记在 Redis，由后台任务合并落库
+       - 否则由 follow_repo.follow_with_stats 在同一事务里完成
+       - 已关注时返回 None → 抛 AlreadyFollowingError
 
     实际上步骤1,2,3在前端都会约束，或许后端不需要检查，比如被关注用户不存在就无法找到关注按钮，关注用户自身首页不会出现关注按钮，已关注的用户关注按钮是取关按钮
     """
     current_uid = follow.user_id
     target_uid = follow.followed_user_id
 
-    current_user = user_repo.get_user_by_uid(uid=current_uid)
-    if not current_user:
+    # 两个用户的存在性校验互不依赖：合并成一次 SELECT EXISTS(...), EXISTS(...)
+    current_ok, target_ok = user_repo.check_users_active(current_uid, target_uid)
+    if not current_ok:
         raise UserNotFound(message=f"current_user {current_uid} not found")
-    target_user = user_repo.get_user_by_uid(uid=target_uid)
-    if not target_user:
+    if not target_ok:
         raise UserNotFound(message=f"target_user {target_uid} not found")
 
     if current_uid == target_uid:
         raise FollowYourselfError("cannot follow yourself")
 
-    # 如果已经关注，直接返回当前关注关系（不再重复计数）
-    if follow_repo.is_following(current_uid, target_uid):
+    # 是否“已关注”由写入的受影响行数判断，不再先查一次
+    data = FollowCreate(user_id=current_uid, followed_user_id=target_uid)
+    if cache is not None and stats_repo is not None:
+        follow = follow_repo.follow_only(data)
+        if follow is not None:
+            _enqueue_stats_deltas(cache, stats_repo, current_uid, target_uid, 1)
+    else:
+        follow = follow_repo.follow_with_stats(data)
+    if follow is None:
         raise AlreadyFollowingError(current_uid, target_uid)
 
-    # 1. 创建关注记录
-    follow = follow_repo.create_follow(
-        FollowCreate(user_id=current_uid, followed_user_id=target_uid)
-    )
-
-    # 2. 更新统计：当前用户关注数 +1，对方粉丝数 +1
-    stats_repo.update_following(current_uid, step=1)
-    stats_repo.update_followers(target_uid, step=1)
-
     return follow.model_dump() if to_dict else follow
 
 
-def cancel_follow(follow_repo: IFollowRepository, stats_repo: IUserStatsRepository, cancel_follow: FollowCancel) -> bool:
+def cancel_follow(
+    follow_repo: IFollowRepository,
+    cancel_follow: FollowCancel,
+    stats_repo: Optional[IUserStatsRepository] = None,
+    cache: Optional[Redis] = None,
+) -> bool:
     """
     取消关注：
-    1. 检查是否正在关注
-    2. 软删除 Follow 记录
-    3. 更新统计：current_uid.following -1, target_uid.followers -1
+    1. 软删除 Follow 记录
+    2. 更新统计：current_uid.following -1, target_uid.followers -1（防止减到负数，由数据层保证）
+    - 传了 cache + stats_repo：计数增量记在 Redis，由后台任务合并落库
+    - 否则两步由 follow_repo.cancel_follow_with_stats 在同一事务里完成
+    - 当前没有关注时抛 NotFollowingError
     """
-    current_uid = cancel_follow.user_id
-    target_uid = cancel_follow.followed_user_id
-
-    if not follow_repo.is_following(current_uid, target_uid):
-        raise NotFollowingError(current_uid, target_uid)
-
-    ok = follow_repo.cancel_follow(data=cancel_follow)
-    if not ok:
-        return False
-
-    # 更新统计（防止减到负数，由数据层保证）
-    stats_repo.update_following(current_uid, step=-1)
-    stats_repo.update_followers(target_uid, step=-1)
+    if cache is not None and stats_repo is not None:
+        cancelled = follow_repo.cancel_follow_only(data=cancel_follow)
+        if cancelled:
+            _enqueue_stats_deltas(cache, stats_repo, cancel_follow.user_id, cancel_follow.followed_user_id, -1)
+    else:
+        cancelled = follow_repo.cancel_follow_with_stats(data=cancel_follow)
+    if not cancelled:
+        raise NotFollowingError(cancel_follow.user_id, cancel_follow.followed_user_id)
 
     return True
 
@@ -149,7 +240,7 @@ def hard_delete_follow(
 
     return ok
 
-def list_following(follow_repo: IFollowRepository, current_uid: str, page: int = 0, page_size: int = 10, to_dict: bool = True) -> Union[Dict, BatchFollowsOut]:
+def list_following(follow_repo: IFollowRepository, current_uid: str, page: int = 0, page_size: int = 10, cursor: Optional[str] = None, to_dict: bool = True) -> Union[Dict, BatchFollowsOut]:
     """
     我关注的人列表
     - 返回 FollowUserOut 列表（对方 UserOut + is_mutual）
@@ -158,19 +249,20 @@ def list_following(follow_repo: IFollowRepository, current_uid: str, page: int =
         user_id=current_uid,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
     return result.model_dump() if to_dict else result
 
 
-def list_followers(follow_repo: IFollowRepository, current_uid: str, page: int = 0, page_size: int = 10, to_dict: bool = True) -> Union[Dict, BatchFollowsOut]:
+def list_followers(follow_repo: IFollowRepository, current_uid: str, page: int = 0, page_size: int = 10, cursor: Optional[str] = None, to_dict: bool = True) -> Union[Dict, BatchFollowsOut]:
     """
     我的粉丝列表
     - 返回 FollowUserOut 列表（对方 UserOut + is_mutual）
     """
-    logger.debug("ok")
     result = follow_repo.list_followers(
         user_id=current_uid,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
     return result.model_dump() if to_dict else result
\ No newline at end of file
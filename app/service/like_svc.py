@@ -1,4 +1,8 @@
-from typing import Dict, Union
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from redis import Redis
+from redis.exceptions import RedisError, ResponseError
 
 from app.schemas.like import (
     LikeCreate,
@@ -8,12 +12,12 @@ from app.schemas.like import (
     LikeAdminOut,
     BatchLikesAdminOut,
     GetTargetLike,
+    LikeBatchOut,
 )
 from app.models.like import LikeTargetType
 
 from app.storage.like.like_interface import ILikeRepository
 from app.storage.user.user_interface import IUserRepository
-from app.storage.post.post_interface import IPostRepository
 from app.storage.post_stats.post_stats_interface import IPostStatsRepository
 from app.storage.comment.comment_interface import ICommentRepository
 
@@ -24,54 +28,149 @@ from app.core.exceptions import (
 )
 from app.core.logx import logger
 
+# 每个用户一个“点赞过哪些帖子”的布隆过滤器（需要 Redis 加载 RedisBloom 模块）
+# 过滤器说“没点过”就一定没点过，直接跳过数据库；说“点过”再用覆盖索引确认（取消点赞不会从过滤器移除）
+LIKE_BLOOM_KEY_PATTERN = "likes:bf:{user_id}"
+LIKE_BLOOM_READY_KEY_PATTERN = "likes:bf:{user_id}:ready"   # 重建完成标记，之前过滤器内容不完整，不能信
+LIKE_BLOOM_ERROR_RATE = 0.01                                # 1% 假阳性
+LIKE_BLOOM_CAPACITY = 10000                                 # 按单个用户点赞帖子数的 p99 估算
+LIKE_BLOOM_TTL_SECONDS = 60 * 60 * 24 * 7                   # 一周未访问则过期，下次再从数据库重建
+
+# 「某内容点赞用户列表」前几页的缓存：同一目标的各页（field = "{page}:{page_size}"）放在一个 Hash 里，
+# 该目标有人点赞 / 取消时整个 key 一次 DEL 失效，TTL 只是兜底
+LIKE_TARGET_PAGE_CACHE_KEY_PATTERN = "likes:target:{target_type}:{target_id}"
+LIKE_TARGET_PAGE_CACHE_TTL_SECONDS = 30
+LIKE_TARGET_PAGE_CACHE_MAX_PAGE = 4                         # 只缓存前几页，深分页 / 游标翻页直接查库
+
+
+def _like_target_cache_key(target_type: LikeTargetType, target_id: str) -> str:
+    return LIKE_TARGET_PAGE_CACHE_KEY_PATTERN.format(target_type=int(target_type), target_id=target_id)
+
+
+def invalidate_like_target_cache(cache: Optional[Redis], targets: Iterable[Tuple[LikeTargetType, str]]) -> None:
+    """点赞 / 取消点赞生效后删除对应目标的点赞列表缓存，Redis 不可用时只记日志"""
+    if cache is None:
+        return
+    keys = {_like_target_cache_key(target_type, target_id) for target_type, target_id in targets}
+    if not keys:
+        return
+    try:
+        cache.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"invalidate like target cache failed, keys={len(keys)}: {e}")
+
+
+def _bloom_add(cache: Redis, user_id: str, *target_ids: str) -> None:
+    """
+    点赞成功后把帖子加入用户的布隆过滤器：
+    - NOCREATE：过滤器不存在时不创建，留给下次读取时从数据库完整重建
+    """
+    key = LIKE_BLOOM_KEY_PATTERN.format(user_id=user_id)
+    try:
+        cache.execute_command("BF.INSERT", key, "NOCREATE", "ITEMS", *target_ids)
+    except RedisError as e:
+        # 过滤器不存在 / Redis 不可用：不影响点赞本身
+        logger.debug(f"skip bloom add {key}: {e}")
+
+
+def _bloom_rebuild(cache: Redis, like_repo: ILikeRepository, user_id: str) -> None:
+    """
+    从数据库重建用户的布隆过滤器：
+    - 先 RESERVE 空过滤器，再读库：并发的新点赞要么已提交被读到，要么会自己 BF.INSERT 进来
+    - 全部写入后才设置 ready 标记
+    """
+    key = LIKE_BLOOM_KEY_PATTERN.format(user_id=user_id)
+    ready_key = LIKE_BLOOM_READY_KEY_PATTERN.format(user_id=user_id)
+
+    try:
+        cache.execute_command("BF.RESERVE", key, LIKE_BLOOM_ERROR_RATE, LIKE_BLOOM_CAPACITY)
+    except ResponseError as e:
+        # 已存在（另一个请求正在重建或 ready 标记已过期），直接往里补数据即可；
+        # 其它错误（例如没有加载 RedisBloom）交给调用方退回查库，不再读库重建
+        if "exists" not in str(e).lower():
+            raise
+
+    target_ids = like_repo.list_liked_target_ids(user_id=user_id, target_type=LikeTargetType.POST)
+    pipe = cache.pipeline(transaction=False)
+    if target_ids:
+        pipe.execute_command("BF.MADD", key, *target_ids)
+    pipe.set(ready_key, 1, ex=LIKE_BLOOM_TTL_SECONDS)
+    pipe.expire(key, LIKE_BLOOM_TTL_SECONDS)
+    pipe.execute()
+
+
+def _bloom_maybe_liked(cache: Redis, like_repo: ILikeRepository, user_id: str, target_id: str) -> bool:
+    """
+    布隆过滤器判断用户是否“可能”点赞过该帖子：
+    - 返回 False：一定没点过
+    - 返回 True：可能点过，需要查库确认
+    - Redis 出错时返回 True，退回到直接查库
+    """
+    key = LIKE_BLOOM_KEY_PATTERN.format(user_id=user_id)
+    ready_key = LIKE_BLOOM_READY_KEY_PATTERN.format(user_id=user_id)
+    try:
+        pipe = cache.pipeline(transaction=False)
+        pipe.exists(ready_key)
+        pipe.execute_command("BF.EXISTS", key, target_id)
+        ready, exists = pipe.execute(raise_on_error=False)
+        if ready and not isinstance(exists, Exception):
+            return bool(exists)
+
+        _bloom_rebuild(cache, like_repo, user_id)
+        return bool(cache.execute_command("BF.EXISTS", key, target_id))
+    except RedisError as e:
+        logger.warning(f"bloom filter unavailable for {key}, fallback to db: {e}")
+        return True
+
 
 # ----------------------------- 点赞 / 取消点赞 -----------------------------
 def like_target(
-    user_repo: IUserRepository,
-    post_repo: IPostRepository,
     comment_repo: ICommentRepository,
     post_stats_repo: IPostStatsRepository,
     like_repo: ILikeRepository,
     data: LikeCreate,
     to_dict: bool = True,
+    cache: Optional[Redis] = None,
 ) -> Union[Dict, LikeOut]:
     """
     点赞目标（帖子 / 评论）：
 
     1. 校验用户是否存在
-    2. 校验目标是否存在（帖子或评论）
+    2. 校验目标是否存在（帖子或评论），与 1 合并为一次查询
     3. 调用 like_repo.like() 创建 / 恢复点赞
        - 如果抛 AlreadyLikedError：说明本来就已经点赞了，业务上视为“错误”，交给接口层返回 400/409
     4. 根据 target_type 更新对应的 like_count（只在真正“新增/恢复”点赞时）
-    5. 返回 LikeOut
+       - 帖子写入分片计数，由后台任务定期汇总进 post_stats（见 flush_post_like_shards）
+    5. 帖子点赞同步写入用户的布隆过滤器，并删除该目标的点赞列表缓存（传了 cache 时）
+    6. 返回 LikeOut
     """
 
-    # 1. 校验用户是否存在
-    user = user_repo.get_user_by_uid(data.user_id)
-    if not user:
-        raise UserNotFound(message=f"user {data.user_id} not found")
+    if data.target_type not in (LikeTargetType.POST, LikeTargetType.COMMENT):
+        raise ValueError(f"unsupported target_type: {data.target_type}")
 
-    # 2. 校验点赞目标是否存在
-    if data.target_type == LikeTargetType.POST:
-        post = post_repo.viewer_get_post_by_pid(data.target_id)
-        if not post:
+    # 1 & 2. 用户、点赞目标是否存在：一次 SELECT EXISTS(...), EXISTS(...) 完成
+    user_ok, target_ok = like_repo.check_like_refs(data.user_id, data.target_type, data.target_id)
+    if not user_ok:
+        raise UserNotFound(message=f"user {data.user_id} not found")
+    if not target_ok:
+        if data.target_type == LikeTargetType.POST:
             raise PostNotFound(message=f"post {data.target_id} not found")
-    elif data.target_type == LikeTargetType.COMMENT:
-        comment = comment_repo.get_comment_by_cid_for_user(data.target_id)
-        if not comment:
-            raise CommentNotFound(message=f"comment {data.target_id} not found")
-    else:
-        raise ValueError(f"unsupported target_type: {data.target_type}")
+        raise CommentNotFound(message=f"comment {data.target_id} not found")
 
     # 3. 点赞（这里如果是重复点赞，会在 repo 内抛 AlreadyLikedError）
     like_out: LikeOut = like_repo.like(data)
 
     # 4. 只有 “确实新建 / 恢复” 成功才会走到这里 → 安全地 +1
     if data.target_type == LikeTargetType.POST:
-        post_stats_repo.update_likes(post_id=data.target_id, step=1)
+        post_stats_repo.add_like_delta(post_id=data.target_id, user_id=data.user_id, step=1)
     else:
         comment_repo.update_like_count(cid=data.target_id, step=1)
 
+    # 5. 帖子点赞写入布隆过滤器
+    if cache is not None and data.target_type == LikeTargetType.POST:
+        _bloom_add(cache, data.user_id, data.target_id)
+    invalidate_like_target_cache(cache, [(data.target_type, data.target_id)])
+
     logger.info(
         f"User {data.user_id} liked target_type={data.target_type} "
         f"target_id={data.target_id}, lid={like_out.lid}"
@@ -87,6 +186,7 @@ def cancel_like(
     like_repo: ILikeRepository,
     data: LikeCancel,
     to_dict: bool = True,
+    cache: Optional[Redis] = None,
 ) -> Union[Dict, LikeOut]:
     """
     取消点赞（软删除）：
@@ -95,6 +195,7 @@ def cancel_like(
     2. 调用 like_repo.cancel_like()：
        - 成功返回 LikeOut：本次从“已点赞” -> “未点赞”，需要把 like_count -1
        - 抛 NotLikedError：当前本来就“未点赞”，由接口层转换为 409/400
+    3. 删除该目标的点赞列表缓存（传了 cache 时）
     """
 
     # 1. 校验用户是否存在
@@ -107,9 +208,10 @@ def cancel_like(
 
     # 3. 只有真正取消成功时才会执行到这里，安全地 -1
     if data.target_type == LikeTargetType.POST:
-        post_stats_repo.update_likes(post_id=data.target_id, step=-1)
+        post_stats_repo.add_like_delta(post_id=data.target_id, user_id=data.user_id, step=-1)
     else:
         comment_repo.update_like_count(cid=data.target_id, step=-1)
+    invalidate_like_target_cache(cache, [(data.target_type, data.target_id)])
 
     logger.info(
         f"User {data.user_id} cancel like target_type={data.target_type}, "
@@ -118,27 +220,167 @@ def cancel_like(
     return like_out.model_dump() if to_dict else like_out
 
 
+def _apply_like_deltas(
+    post_stats_repo: IPostStatsRepository,
+    comment_repo: ICommentRepository,
+    rows: List[Union[LikeCreate, LikeCancel]],
+    step: int,
+) -> None:
+    """
+    批量点赞 / 取消后的计数更新：
+    - 帖子：所有增量合并成一条多行分片写入
+    - 评论：同一评论的增量先合并，每条评论一次 UPDATE
+    """
+    post_deltas = [(r.target_id, r.user_id, step) for r in rows if r.target_type == LikeTargetType.POST]
+    if post_deltas:
+        post_stats_repo.add_like_deltas(post_deltas)
+
+    comment_steps = defaultdict(int)
+    for r in rows:
+        if r.target_type == LikeTargetType.COMMENT:
+            comment_steps[r.target_id] += step
+    for cid, total in comment_steps.items():
+        comment_repo.update_like_count(cid=cid, step=total)
+
+
+def like_targets_batch(
+    comment_repo: ICommentRepository,
+    post_stats_repo: IPostStatsRepository,
+    like_repo: ILikeRepository,
+    rows: List[LikeCreate],
+    to_dict: bool = True,
+    cache: Optional[Redis] = None,
+) -> Union[Dict, LikeBatchOut]:
+    """
+    批量点赞（例如一次点赞多条评论）：
+
+    1. like_repo.like_many() 一个事务内校验引用、跳过已点过的项，一条多行 INSERT 新建 / 恢复
+    2. 只按真正新增 / 恢复的点赞更新计数
+    3. 帖子点赞按用户分组写入布隆过滤器，并删除涉及目标的点赞列表缓存（传了 cache 时）
+
+    与单条点赞不同，已点过 / 目标不存在的项不报错，只是不计入 changed
+    """
+    liked = like_repo.like_many(rows)
+    _apply_like_deltas(post_stats_repo, comment_repo, liked, step=1)
+
+    if cache is not None:
+        post_ids_by_user = defaultdict(list)
+        for r in liked:
+            if r.target_type == LikeTargetType.POST:
+                post_ids_by_user[r.user_id].append(r.target_id)
+        for user_id, post_ids in post_ids_by_user.items():
+            _bloom_add(cache, user_id, *post_ids)
+    invalidate_like_target_cache(cache, ((r.target_type, r.target_id) for r in liked))
+
+    logger.info(f"batch like: requested={len(rows)}, liked={len(liked)}")
+
+    result = LikeBatchOut(requested=len(rows), changed=len(liked))
+    return result.model_dump() if to_dict else result
+
+
+def cancel_likes_batch(
+    comment_repo: ICommentRepository,
+    post_stats_repo: IPostStatsRepository,
+    like_repo: ILikeRepository,
+    rows: List[LikeCancel],
+    to_dict: bool = True,
+    cache: Optional[Redis] = None,
+) -> Union[Dict, LikeBatchOut]:
+    """
+    批量取消点赞：
+    - like_repo.cancel_many() 一条 UPDATE 软删当前有效的点赞
+    - 只按真正取消的点赞扣减计数；没点过 / 已取消的项不报错，只是不计入 changed
+    - 传了 cache 时删除涉及目标的点赞列表缓存
+    """
+    cancelled = like_repo.cancel_many(rows)
+    _apply_like_deltas(post_stats_repo, comment_repo, cancelled, step=-1)
+    invalidate_like_target_cache(cache, ((r.target_type, r.target_id) for r in cancelled))
+
+    logger.info(f"batch cancel like: requested={len(rows)}, cancelled={len(cancelled)}")
+
+    result = LikeBatchOut(requested=len(rows), changed=len(cancelled))
+    return result.model_dump() if to_dict else result
+
+
+def flush_post_like_shards(post_stats_repo: IPostStatsRepository, limit: int = 1000) -> int:
+    """
+    把帖子点赞的分片增量汇总进 post_stats.like_count（由应用启动的后台任务周期调用）：
+    - 一轮最多处理 limit 个分片行，积压时下一轮继续
+    """
+    flushed = post_stats_repo.flush_like_shards(limit=limit)
+    if flushed:
+        logger.debug(f"flushed like shards for {flushed} posts")
+    return flushed
+
+
 # ----------------------------- 查询：普通视角 -----------------------------
 
 
+def has_liked(
+    like_repo: ILikeRepository,
+    user_id: str,
+    target_type: LikeTargetType,
+    target_id: str,
+    cache: Optional[Redis] = None,
+) -> bool:
+    """
+    判断用户当前是否点赞了某个目标（帖子 / 评论）：
+    - 帖子且传了 cache：先问布隆过滤器，确定没点过就不查库
+    - 其余情况直接走覆盖索引查询
+    """
+    if cache is not None and target_type == LikeTargetType.POST:
+        if not _bloom_maybe_liked(cache, like_repo, user_id, target_id):
+            return False
+
+    return like_repo.has_liked(
+        user_id=user_id,
+        target_type=target_type,
+        target_id=target_id,
+    )
+
+
 def list_likes_by_target(
     like_repo: ILikeRepository,
     data: GetTargetLike,
     page: int = 0,
     page_size: int = 10,
     to_dict: bool = True,
+    cursor: Optional[str] = None,
+    cache: Optional[Redis] = None,
 ) -> Union[Dict, BatchLikesOut]:
     """
     查询某个目标（帖子 / 评论）的有效点赞列表（分页）：
     - 只返回未软删除的点赞记录
+    - 传了 cache 时前几页走缓存，点赞 / 取消点赞时主动失效；游标翻页不走缓存
     """
+    use_cache = cache is not None and cursor is None and page < LIKE_TARGET_PAGE_CACHE_MAX_PAGE
+    cache_key = _like_target_cache_key(data.target_type, data.target_id)
+    cache_field = f"{page}:{page_size}"
+    if use_cache:
+        try:
+            cached_value = cache.hget(cache_key, cache_field)
+        except RedisError as e:
+            logger.warning(f"like target page cache unavailable, fallback to db: {e}")
+            cached_value = None
+        if cached_value is not None:
+            result = BatchLikesOut.model_validate_json(cached_value)
+            return result.model_dump() if to_dict else result
 
     result = like_repo.list_likes_by_target(
         target_type=data.target_type,
         target_id=data.target_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
+    if use_cache:
+        try:
+            pipe = cache.pipeline(transaction=False)
+            pipe.hset(cache_key, cache_field, result.model_dump_json())
+            pipe.expire(cache_key, LIKE_TARGET_PAGE_CACHE_TTL_SECONDS)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"skip like target page cache write: {e}")
     return result.model_dump() if to_dict else result
 
 
@@ -148,6 +390,7 @@ def list_likes_by_user(
     page: int = 0,
     page_size: int = 10,
     to_dict: bool = True,
+    cursor: Optional[str] = None,
 ) -> Union[Dict, BatchLikesOut]:
     """
     查询某个用户的有效点赞记录（分页）：
@@ -157,6 +400,7 @@ def list_likes_by_user(
         user_id=user_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
     return result.model_dump() if to_dict else result
 
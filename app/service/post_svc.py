@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 from app.schemas.post import (
     PostCreate,
@@ -14,6 +14,7 @@ from app.schemas.post import (
     PostAdminOut,
     BatchPostsAdminOut,
     PostGet,
+    BatchFeedOut,
 )
 from app.schemas.post_content import (
     PostContentCreate,
@@ -31,12 +32,24 @@ from app.storage.user.user_interface import IUserRepository
 
 from app.core.logx import logger
 from app.core.exceptions import PostNotFound, InvalidReviewStatusTransition, UserNotFound
-import json
 from redis import Redis
-from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
 
 POST_CACHE_KEY_PATTERN = "post:{pid}"      # 缓存 key 模板
-POST_CACHE_TTL_SECONDS = 60 * 5           # 缓存过期时间 5 分钟，可自行调整
+POST_CACHE_TTL_SECONDS = 60               # 详情里带点赞 / 评论数，点赞和评论不主动失效，靠 1 分钟 TTL 控制滞后
+POST_PAGE_CACHE_KEY_PATTERN = "posts:page:{page}:{page_size}"  # 帖子列表分页缓存 key 模板
+POST_PAGE_CACHE_TTL_SECONDS = 10          # 列表不做主动失效，只靠短 TTL 兜底
+POST_PAGE_CACHE_MAX_PAGE = 4              # 只缓存前几页，深分页请求少，缓存命中率低
+
+
+def invalidate_post_cache(cache: Optional[Redis], pid: str) -> None:
+    """帖子状态 / 审核 / 删除状态变化后删除详情缓存，Redis 不可用时只记日志"""
+    if cache is None:
+        return
+    try:
+        cache.delete(POST_CACHE_KEY_PATTERN.format(pid=pid))
+    except RedisError as e:
+        logger.warning(f"invalidate post cache failed, pid={pid}: {e}")
 
 #---------------------------------------- 增 -----------------------------------------
 def create_post(
@@ -57,7 +70,7 @@ def create_post(
     # 1. 查看 用户ID 是否存在
     user = user_repo.get_user_by_uid(data.author_id)
     if not user:
-        raise UserNotFound(f"user {data.author_id} not found")
+        raise UserNotFound(message=f"user {data.author_id} not found")
     
     # 2. 创建 posts 基本记录
     post_only = PostOnlyCreate(
@@ -108,51 +121,83 @@ def get_post_by_pid(
     """
     cache_key = POST_CACHE_KEY_PATTERN.format(pid=pid)
 
-    # 1. 先查 Redis
+    # 1. 先查 Redis；Redis 不可用时直接降级查库
     if cache is not None:
-        cached_value = cache.get(cache_key)
+        try:
+            cached_value = cache.get(cache_key)
+        except RedisError as e:
+            logger.warning(f"post cache unavailable, fallback to db: {e}")
+            cached_value = None
         if cached_value is not None:
-            logger.info(f"Redis 命中缓存: {cache_key}")
-            # Redis 中存的是 JSON 字符串，先反序列化
-            cached_dict = json.loads(cached_value)
-
-            if to_dict:
-                # 调用方希望拿 dict
-                return cached_dict
-            else:
-                # 调用方希望拿 PostOut 对象
-                return PostOut.model_validate(cached_dict)
-
-    # 2. Redis 未命中 -> 查 MySQL（数据层逻辑保持不变）
+            post = PostOut.model_validate_json(cached_value)
+            return post.model_dump() if to_dict else post
+
+    # 2. Redis 未命中 -> 查 MySQL
     post = post_repo.viewer_get_post_by_pid(pid)
     if not post:
         return None
+
+    # 3. 回写 Redis，更新 / 软删 / 审核 / 硬删 / 恢复时由 invalidate_post_cache 主动删除
+    if cache is not None:
+        try:
+            cache.set(cache_key, post.model_dump_json(), ex=POST_CACHE_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"skip post cache write, pid={pid}: {e}")
     return post.model_dump() if to_dict else post
 
-def get_batch_posts(post_repo: IPostRepository, page: int = 0, page_size: int = 10, to_dict: bool = True,) -> Dict | BatchPostsOut:
+def get_batch_posts(post_repo: IPostRepository, page: int = 0, page_size: int = 10, to_dict: bool = True, cache: Optional[Redis] = None, cursor: Optional[str] = None,) -> Dict | BatchPostsOut:
     """
     分页获取帖子列表：
     - 按你的仓库实现默认为 _id 倒序
     - 包含每条的内容 + 统计
+    - 传了 cache 时前几页走短 TTL 缓存，热点翻页不再每次打到 MySQL
+    - 传了 cursor（上一页的 next_cursor）时按游标分页，不走分页缓存
+    """
+    use_cache = cache is not None and cursor is None and page < POST_PAGE_CACHE_MAX_PAGE
+    cache_key = POST_PAGE_CACHE_KEY_PATTERN.format(page=page, page_size=page_size)
+    if use_cache:
+        try:
+            cached_value = cache.get(cache_key)
+        except RedisError as e:
+            logger.warning(f"post page cache unavailable, fallback to db: {e}")
+            cached_value = None
+        if cached_value is not None:
+            result = BatchPostsOut.model_validate_json(cached_value)
+            return result.model_dump() if to_dict else result
+
+    result = post_repo.get_batch_posts(page=page, page_size=page_size, cursor=cursor)
+    if use_cache:
+        try:
+            cache.set(cache_key, result.model_dump_json(), ex=POST_PAGE_CACHE_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"skip post page cache write: {e}")
+    return result.model_dump() if to_dict else result
+
+def get_feed(post_repo: IPostRepository, page: int = 0, page_size: int = 10, to_dict: bool = True, cursor: Optional[str] = None,) -> Union[Dict, BatchFeedOut]:
     """
-    result = post_repo.get_batch_posts(page=page, page_size=page_size)
+    分页获取首页信息流：
+    - 读 feed_items 物化表，只返回卡片字段（标题 + 计数）
+    - 需要正文时再按 pid 调 get_post_by_pid
+    - 传了 cursor（上一页的 next_cursor）时按游标分页，深翻页不再随 OFFSET 变慢
+    """
+    result = post_repo.get_feed(page=page, page_size=page_size, cursor=cursor)
     return result.model_dump() if to_dict else result
 
-def get_posts_by_author(user_repo: IUserRepository, post_repo: IPostRepository, data: PostGet, page: int = 0, page_size: int = 10, to_dict: bool = True,) -> Union[Dict, BatchPostsOut]:
+def get_posts_by_author(user_repo: IUserRepository, post_repo: IPostRepository, data: PostGet, page: int = 0, page_size: int = 10, to_dict: bool = True, cursor: Optional[str] = None,) -> Union[Dict, BatchPostsOut]:
     """
     根据作者 ID 分页获取该作者的所有帖子
     """
-    current_user = user_repo.get_user_by_uid(data.current_user_id)
-    if not current_user:
-        raise UserNotFound(f"current user {data.current_user_id} not found")
-    author = user_repo.get_user_by_uid(data.author_id)
-    if not author:
-        raise UserNotFound(f"author {data.author_id} not found")
+    # 当前用户、作者的存在性校验互不依赖：合并成一次 SELECT EXISTS(...), EXISTS(...)
+    current_ok, author_ok = user_repo.check_users_active(data.current_user_id, data.author_id)
+    if not current_ok:
+        raise UserNotFound(message=f"current user {data.current_user_id} not found")
+    if not author_ok:
+        raise UserNotFound(message=f"author {data.author_id} not found")
     
-    result = post_repo.get_posts_by_author(data=data, page=page, page_size=page_size,)
+    result = post_repo.get_posts_by_author(data=data, page=page, page_size=page_size, cursor=cursor,)
     return result.model_dump() if to_dict else result
 
-def update_post(post_repo: IPostRepository, pid: str, data: PostUpdate) -> bool:
+def update_post(post_repo: IPostRepository, pid: str, data: PostUpdate, cache: Optional[Redis] = None) -> bool:
     """
     作者更新帖子：
     - 允许修改 visibility / publish_status
@@ -160,12 +205,13 @@ def update_post(post_repo: IPostRepository, pid: str, data: PostUpdate) -> bool:
     """
     ok = post_repo.update_post(pid, data)
     if ok:
+        invalidate_post_cache(cache, pid)
         logger.info(f"Updated post pid={pid} with data={data.model_dump(exclude_none=True)}")
     else:
         logger.warning(f"Update post failed, pid={pid} not found")
     return ok
 
-def soft_delete_post(post_repo: IPostRepository, pid: str,) -> bool:
+def soft_delete_post(post_repo: IPostRepository, pid: str, cache: Optional[Redis] = None,) -> bool:
     """
     软删除帖子：
     - 仅设置 deleted_at，不真正删除记录
@@ -173,7 +219,11 @@ def soft_delete_post(post_repo: IPostRepository, pid: str,) -> bool:
     """
     ok = post_repo.soft_delete_post(pid)
     if ok:
+        invalidate_post_cache(cache, pid)
         logger.info(f"Soft deleted post pid={pid}")
+    elif post_repo.post_exists(pid):
+        # 条件更新没改到行：只有失败时才多查一次区分原因
+        logger.warning(f"Soft delete no-op, post pid={pid} already deleted")
     else:
         logger.warning(f"Soft delete failed, post pid={pid} not found")
     return ok
@@ -224,40 +274,36 @@ def list_pending_review_posts(post_repo: IPostRepository, page: int = 0, page_si
     return result.model_dump() if to_dict else result
 
 
-def review_post(post_repo: IPostRepository, pid: str, data: PostReviewUpdate, to_dict: bool = True,) -> Union[Dict, PostReviewOut]:
+def review_post(post_repo: IPostRepository, pid: str, data: PostReviewUpdate, to_dict: bool = True, cache: Optional[Redis] = None,) -> Union[Dict, PostReviewOut]:
     """
     审核帖子：
-    1. 读取当前帖子审核状态
-    2. 校验状态流转是否合法（不允许从通过/拒绝回到待审）
-    3. 更新审核状态 + 审核时间
+    1. 按状态流转规则算出允许的原状态（不允许从通过/拒绝回到待审）
+    2. 条件更新审核状态 + 审核时间：UPDATE ... WHERE review_status IN (允许的原状态)，不先读再改
+    3. 没更新到时再查一次，区分帖子不存在（404）和状态流转不合法（400）
     4. 返回 PostReviewOut
     """
 
-    # 1. 获取当前帖子审核信息（附带内容）
-    current = post_repo.get_post_review_by_pid(pid)
-    if not current:
-        raise PostNotFound(pid=pid)
-
-    old_status = current.review_status
-    new_status = data.review_status
+    # 1. 状态流转规则：回到 PENDING 只允许原本就是 PENDING，其余目标状态不限制原状态
+    # 你可以根据业务再细化，比如禁止 APPROVED <-> REJECTED 互相切，只要改这里的 allowed_from
+    if data.review_status is None:
+        raise InvalidReviewStatusTransition("review_status cannot be None")
+    # 请求体里是整数字面量，这里转回枚举
+    new_status = PostReviewStatus(data.review_status)
+    allowed_from = (PostReviewStatus.PENDING,) if new_status == PostReviewStatus.PENDING else None
 
-    # 2. 校验状态流转
-    # 不允许从 APPROVED/REJECTED 回到 PENDING
-    if new_status == PostReviewStatus.PENDING and old_status != PostReviewStatus.PENDING:
+    # 2. 条件更新审核状态 & 审核时间（repo 内部会补 reviewed_at）
+    ok = post_repo.update_review(pid, data, allowed_from=allowed_from)
+    if not ok:
+        # 3. 失败路径才多查一次
+        current = post_repo.get_post_review_by_pid(pid)
+        if not current:
+            raise PostNotFound(pid=pid)
         raise InvalidReviewStatusTransition(
-            f"cannot change review_status from {old_status} back to PENDING"
+            f"cannot change review_status from {current.review_status} back to PENDING"
         )
+    invalidate_post_cache(cache, pid)
 
-    # 你可以根据业务再细化，比如禁止 APPROVED <-> REJECTED 互相切
-    # 这里只实现“不能回到待审”的规则
-
-    # 3. 更新审核状态 & 审核时间（repo 内部会补 reviewed_at）
-    ok = post_repo.update_review(pid, data)
-    if not ok:
-        # 极端情况：上一步还能查到，更新时却失败
-        raise PostNotFound(f"post {pid} not found when updating review")
-
-    # 5. 重新读取最新审核信息返回
+    # 4. 重新读取最新审核信息返回
     updated = post_repo.get_post_review_by_pid(pid)
     if not updated:
         # 正常不应该发生，防御性处理
@@ -282,6 +328,34 @@ def admin_get_post_by_pid(post_repo: IPostRepository, pid: str, to_dict: bool =
     return post.model_dump() if to_dict else post
 
 
+def admin_stream_posts(
+    post_repo: IPostRepository,
+    page: int = 0,
+    page_size: int = 10,
+    deleted_only: bool = False,
+    author_id: Optional[str] = None,
+    to_dict: bool = True,
+) -> Tuple[int, Iterator[Union[Dict, PostAdminOut]]]:
+    """
+    管理员分页列表（含软删）的流式版本：
+    - 返回 (total, 逐条产出帖子的迭代器)，接口层用 stream_list_response 边查边写
+    - deleted_only / author_id 对应 admin_list_deleted_posts / admin_list_posts_by_author 的过滤条件
+    """
+    total, rows = post_repo.admin_iter_posts(
+        page=page,
+        page_size=page_size,
+        deleted_only=deleted_only,
+        author_id=author_id,
+    )
+    logger.info(
+        f"[ADMIN] stream posts deleted_only={deleted_only}, author_id={author_id}, "
+        f"page={page}, page_size={page_size}, total={total}"
+    )
+    if to_dict:
+        return total, (post.model_dump() for post in rows)
+    return total, rows
+
+
 def admin_list_all_posts(post_repo: IPostRepository, page: int = 0, page_size: int = 10, to_dict: bool = True,) -> Union[Dict, BatchPostsAdminOut]:
     """
     管理员查看所有帖子（含软删除）：
@@ -329,14 +403,15 @@ def admin_list_posts_by_author(post_repo: IPostRepository, author_id: str, page:
     )
     return result.model_dump() if to_dict else result
 
-def hard_delete_post(post_repo: IPostRepository, pid: str,) -> bool:
+def hard_delete_post(post_repo: IPostRepository, pid: str, cache: Optional[Redis] = None,) -> bool:
     """
     硬删除帖子：
     - 直接从 posts 表删除
-    - 通过 cascade/delete-orphan 一并删除内容 + 统计等相关记录
+    - 内容 + 统计 + 评论等相关记录由数据库外键 ON DELETE CASCADE 一并删除
     """
     ok = post_repo.hard_delete_post(pid)
     if ok:
+        invalidate_post_cache(cache, pid)
         logger.info(f"Hard deleted post pid={pid}")
     else:
         logger.warning(f"Hard delete failed, post pid={pid} not found")
@@ -345,17 +420,18 @@ def hard_delete_post(post_repo: IPostRepository, pid: str,) -> bool:
 def restore_post(
     post_repo: IPostRepository,
     pid: str,
+    cache: Optional[Redis] = None,
 ) -> bool:
-    post_admin = post_repo.admin_get_post_by_pid(pid)
-    if not post_admin:
-        raise PostNotFound(message=f"post {pid} not found")
-
+    # 条件更新一步完成；没改到行时才查一次，区分帖子不存在和未软删
     ok = post_repo.restore_post(pid)
     if not ok:
+        if not post_repo.post_exists(pid):
+            raise PostNotFound(message=f"post {pid} not found")
         # 存在但未软删，直接返回 False 或你可以自定义一个 NotSoftDeletedError
         logger.warning(f"[ADMIN] restore post no-op, pid={pid} not soft-deleted")
         return False
 
+    invalidate_post_cache(cache, pid)
     logger.info(f"[ADMIN] restored post pid={pid}")
     return True
 
@@ -1,4 +1,7 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
+
+from redis import Redis
+from redis.exceptions import RedisError
 
 from app.schemas.user import (
     UserCreate,
@@ -9,7 +12,8 @@ from app.schemas.user import (
     BatchUsersOut,
     UserPasswordUpdate,
     BatchUsersAllOut,
-    UserAllOut
+    UserAllOut,
+    AuthorSnippetOut,
 )
 from app.schemas.user_stats import (
     UserStatsOut,
@@ -18,12 +22,67 @@ from app.schemas.user_stats import (
 from app.storage.user.user_interface import IUserRepository
 from app.storage.user_stats.user_stats_interface import IUserStatsRepository
 from app.storage.follow.follow_interface import IFollowRepository
+from app.service.follow_svc import get_pending_stats_delta
 
 from app.core.logx import logger
 from app.core.exceptions import UserNotFound, PasswordMismatchError
 
 from app.core.security import hash_password, verify_password
 
+# 作者精简信息缓存：评论列表等每页都要展示作者，用户资料很少改
+AUTHOR_SNIPPET_KEY_PATTERN = "user:snippet:{uid}"
+AUTHOR_SNIPPET_TTL_SECONDS = 60           # 兜底过期时间；用户修改资料 / 被删除时会主动删除缓存
+
+
+def get_author_snippets(user_repo: IUserRepository, uids: Iterable[str], cache: Optional[Redis] = None) -> Dict[str, AuthorSnippetOut]:
+    """
+    批量获取作者精简信息（uid -> AuthorSnippetOut）：
+    1. 一次 MGET 从 Redis 取
+    2. 未命中的 uid 合并成一次 IN 查询
+    3. 查到的回写 Redis
+    - Redis 出错时退回直接查库
+    """
+    uids = list(dict.fromkeys(uids))   # 去重并保持顺序
+    result: Dict[str, AuthorSnippetOut] = {}
+    missing = uids
+
+    if cache is not None and uids:
+        try:
+            values = cache.mget([AUTHOR_SNIPPET_KEY_PATTERN.format(uid=uid) for uid in uids])
+            missing = []
+            for uid, value in zip(uids, values):
+                if value is None:
+                    missing.append(uid)
+                else:
+                    result[uid] = AuthorSnippetOut.model_validate_json(value)
+        except RedisError as e:
+            logger.warning(f"author snippet cache unavailable, fallback to db: {e}")
+            missing = uids
+
+    if missing:
+        fetched = user_repo.get_author_snippets(missing)
+        result.update(fetched)
+        if cache is not None and fetched:
+            try:
+                pipe = cache.pipeline(transaction=False)
+                for uid, snippet in fetched.items():
+                    pipe.set(AUTHOR_SNIPPET_KEY_PATTERN.format(uid=uid), snippet.model_dump_json(), ex=AUTHOR_SNIPPET_TTL_SECONDS)
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"skip author snippet cache write: {e}")
+
+    return result
+
+
+def invalidate_author_snippet(cache: Optional[Redis], uid: str) -> None:
+    """用户资料变化后删除其作者精简信息缓存"""
+    if cache is None:
+        return
+    try:
+        cache.delete(AUTHOR_SNIPPET_KEY_PATTERN.format(uid=uid))
+    except RedisError as e:
+        logger.warning(f"failed to invalidate author snippet of {uid}: {e}")
+
 
 def create_user(user_repo: IUserRepository, stats_repo: IUserStatsRepository, user_data: UserCreate, to_dict: bool = True) -> Union[Dict, UserOut]:
     """
@@ -74,38 +133,44 @@ def get_user_by_uid(user_repo: IUserRepository, uid: str, to_dict: bool = True)
     """
     user = user_repo.get_user_by_uid(uid)
     if not user:
-        raise UserNotFound(f"user {uid} not found")
+        raise UserNotFound(user_id=uid)
     return UserOut.model_validate(user).model_dump() if to_dict else user
 
 
-def get_user_profile(stats_repo: IUserStatsRepository, uid: str, to_dict: bool = True) -> Optional[Union[Dict, UserStatsWithUserOut]]:
+def get_user_profile(stats_repo: IUserStatsRepository, uid: str, to_dict: bool = True, cache: Optional[Redis] = None) -> Optional[Union[Dict, UserStatsWithUserOut]]:
     """
     用户详情：User 信息 + 关注数/粉丝数
     这里直接用 UserStatsWithUserOut（由 stats_repo join user 拼出）
+    - 传了 cache 时叠加 Redis 里尚未落库的关注 / 粉丝增量，保证刚关注完就能看到新数字
     """
     profile = stats_repo.get_with_user_by_user_id(uid)
     if not profile:
-        return UserNotFound(f"user {uid} not found")
+        raise UserNotFound(user_id=uid)
+    following_delta, followers_delta = get_pending_stats_delta(cache, uid)
+    profile.following_count = max(profile.following_count + following_delta, 0)
+    profile.followers_count = max(profile.followers_count + followers_delta, 0)
     return profile.model_dump() if to_dict else profile
 
 
-def update_user(user_repo: IUserRepository, uid: str, data: UserUpdate, to_dict: bool = True) -> Optional[Union[Dict, UserOut]]:
+def update_user(user_repo: IUserRepository, uid: str, data: UserUpdate, to_dict: bool = True, cache: Optional[Redis] = None) -> Optional[Union[Dict, UserOut]]:
     """
-    普通用户更新自己的信息
+    普通用户更新自己的信息（同时删除作者精简信息缓存）
     """
     updated = user_repo.update_user(uid, data)
     if not updated:
         return None
+    invalidate_author_snippet(cache, uid)
     return updated.model_dump() if to_dict else updated
 
 
-def admin_update_user(user_repo: IUserRepository, uid: str, data: AdminUserUpdate, to_dict: bool = True) -> Optional[Union[Dict, UserOut]]:
+def admin_update_user(user_repo: IUserRepository, uid: str, data: AdminUserUpdate, to_dict: bool = True, cache: Optional[Redis] = None) -> Optional[Union[Dict, UserOut]]:
     """
-    管理员更新用户信息（包含角色/状态）
+    管理员更新用户信息（包含角色/状态，同时删除作者精简信息缓存）
     """
     updated = user_repo.admin_update_user(uid, data)
     if not updated:
         return None
+    invalidate_author_snippet(cache, uid)
     return updated.model_dump() if to_dict else updated
 
 
@@ -118,7 +183,7 @@ def change_password(user_repo: IUserRepository, uid: str, data: UserPasswordUpda
     # TODO: 先在业务层校验 old_password 是否正确（略）
     user = user_repo.get_user_by_uid(uid)
     if not user:
-        raise UserNotFound(f"user {uid} not found")
+        raise UserNotFound(user_id=uid)
     if not verify_password(data.old_password, user.password):
         raise PasswordMismatchError()
 
@@ -130,19 +195,20 @@ def change_password(user_repo: IUserRepository, uid: str, data: UserPasswordUpda
     return user_repo.update_password(uid, hashed)
 
 
-def soft_delete_user(user_repo: IUserRepository, uid: str) -> bool:
+def soft_delete_user(user_repo: IUserRepository, uid: str, cache: Optional[Redis] = None) -> bool:
     """
     软删除用户（只标记 deleted_at）
     - 关联的 Follow / UserStats 可视业务决定是否保留或单独清理
     """
     ok = user_repo.soft_delete_user(uid)
     if ok:
+        invalidate_author_snippet(cache, uid)
         logger.info(f"Soft deleted user uid={uid}")
     return ok
 
 
 # ------------------------------------ 管理员用 ----------------------------------------
-def hard_delete_user(user_repo: IUserRepository, uid: str) -> bool:
+def hard_delete_user(user_repo: IUserRepository, uid: str, cache: Optional[Redis] = None) -> bool:
     """
     通常只有管理员才能调用。
 
@@ -167,6 +233,7 @@ def hard_delete_user(user_repo: IUserRepository, uid: str) -> bool:
     # 3. 删用户
     ok = user_repo.hard_delete_user(uid)
     if ok:
+        invalidate_author_snippet(cache, uid)
         logger.info(f"Hard deleted user uid={uid}")
     return ok
 
@@ -202,7 +269,7 @@ def admin_get_user_by_uid(
     """
     user = user_repo.admin_get_user_by_uid(uid)
     if not user:
-        raise UserNotFound(f"user {uid} not found")
+        raise UserNotFound(user_id=uid)
 
     logger.info(f"[ADMIN] get user uid={uid}")
     return user.model_dump() if to_dict else user
@@ -1,9 +1,7 @@
 # app/storage/comment/SQLAlchemyCommentRepository.py
 
 from typing import List, Optional
-from datetime import datetime, timezone, timedelta
-
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, lazyload
 
 from app.models.comment import Comment, CommentStatus, ReviewStatus
 from app.schemas.comment import (
@@ -14,14 +12,28 @@ from app.schemas.comment import (
     BatchCommentsAdminOut,
     ReviewUpdate,
     StatusUpdate,
+    COMMENT_OUT_LIST_TA,
+    COMMENT_ADMIN_OUT_LIST_TA,
 )
 from app.storage.comment.comment_interface import ICommentRepository
-from app.core.db import transaction
-
-
-# 统一一个东八区时间函数（如果你项目已有 now_utc8 可以直接用）
-def now_utc8() -> datetime:
-    return datetime.now(timezone(timedelta(hours=8)))
+from app.core.db import transaction, strict_loading_options
+from app.core.pagination import keyset_filter, next_cursor_of, count_total
+from app.core.time import now_utc
+
+
+# 列表查询的加载策略：一页评论的正文合并成一次 IN 查询，避免逐条懒加载的 N+1
+# 用户视角的 CommentOut 不含 author，跳过映射上默认的 selectin，少查一次 users
+# 其余关系由 strict_loading_options 兜底：意外访问直接报错
+_USER_LIST_OPTIONS = (selectinload(Comment.comment_content), lazyload(Comment.author), *strict_loading_options())
+# 审核员 / 管理员视角的 CommentAdminOut 会序列化 author，正文和作者各一次 IN 查询
+_ADMIN_LIST_OPTIONS = (selectinload(Comment.comment_content), selectinload(Comment.author), *strict_loading_options())
+
+# 普通用户可见的评论条件：未软删 + 未折叠 + 未被拒绝；点赞等其它仓库做存在性校验时复用
+COMMENT_USER_FILTERS = (
+    Comment.deleted_at.is_(None),
+    Comment.status == CommentStatus.NORMAL.value,
+    Comment.review_status != ReviewStatus.REJECTED.value,
+)
 
 
 class SQLAlchemyCommentRepository(ICommentRepository):
@@ -47,11 +59,7 @@ class SQLAlchemyCommentRepository(ICommentRepository):
         """
         return (
             self._base_query()
-            .filter(
-                Comment.deleted_at.is_(None),
-                Comment.status == CommentStatus.NORMAL.value,
-                Comment.review_status != ReviewStatus.REJECTED.value,
-            )
+            .filter(*COMMENT_USER_FILTERS)
         )
 
     def _reviewer_query(self):
@@ -162,15 +170,16 @@ class SQLAlchemyCommentRepository(ICommentRepository):
         """
         rows: List[Comment] = (
             self._user_query()
+            .options(*_USER_LIST_OPTIONS)
             .filter(Comment.root_id == root_id)
             .order_by(Comment.created_at.asc())
             .all()
         )
 
         # 利用 Pydantic 的 from_attributes + 关系字段自动映射
-        items = [CommentOut.model_validate(c) for c in rows]
+        items = COMMENT_OUT_LIST_TA.validate_python(rows)
 
-        return BatchCommentsOut(
+        return BatchCommentsOut.model_construct(
             total=len(items),
             count=len(items),
             items=items,
@@ -183,40 +192,42 @@ class SQLAlchemyCommentRepository(ICommentRepository):
         post_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchCommentsOut:
         """
         普通用户 / 访客：查看某帖子的评论列表
         """
         base_q = (
             self._user_query()
+            .options(*_USER_LIST_OPTIONS)
             .filter(Comment.post_id == post_id,
                 Comment.parent_id.is_(None),
                 Comment.root_id == Comment.cid,
                 )
-            .order_by(Comment.created_at.asc())  
+            .order_by(Comment.created_at.asc(), Comment._id.asc())
         )
 
-        total = base_q.count()
+        total = count_total(base_q, Comment._id)
 
-        comments: List[Comment] = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Comment.created_at, Comment._id, cursor))
+        else:
+            page_q = base_q.offset(page * page_size)
+        comments: List[Comment] = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(comments, page_size)
 
-        items: List[CommentOut] = []
         for c in comments:
             if not c.comment_content:
                 # 开发阶段可以抛异常方便排查
                 raise RuntimeError(f"Comment(cid={c.cid}) missing content record")
+        items = COMMENT_OUT_LIST_TA.validate_python(comments)
 
-            items.append(CommentOut.model_validate(c))
-
-        return BatchCommentsOut(
+        return BatchCommentsOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
     def list_comments_by_post_for_reviewer(
@@ -224,6 +235,7 @@ class SQLAlchemyCommentRepository(ICommentRepository):
         post_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchCommentsAdminOut:
         """
         审核员：查看某帖子的评论列表
@@ -232,30 +244,31 @@ class SQLAlchemyCommentRepository(ICommentRepository):
         """
         base_q = (
             self._reviewer_query()
+            .options(*_ADMIN_LIST_OPTIONS)
             .filter(Comment.post_id == post_id)
-            .order_by(Comment.created_at.asc())
+            .order_by(Comment.created_at.asc(), Comment._id.asc())
         )
 
-        total = base_q.count()
+        total = count_total(base_q, Comment._id)
 
-        comments: List[Comment] = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Comment.created_at, Comment._id, cursor))
+        else:
+            page_q = base_q.offset(page * page_size)
+        comments: List[Comment] = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(comments, page_size)
 
-        items: List[CommentAdminOut] = []
         for c in comments:
             if not c.comment_content:
                 raise RuntimeError(f"Comment(cid={c.cid}) missing content record")
+        items = COMMENT_ADMIN_OUT_LIST_TA.validate_python(comments)
 
-            items.append(CommentAdminOut.model_validate(c))
-
-        return BatchCommentsAdminOut(
+        return BatchCommentsAdminOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
     def list_comments_by_post_for_admin(
@@ -263,38 +276,40 @@ class SQLAlchemyCommentRepository(ICommentRepository):
         post_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchCommentsAdminOut:
         """
         管理员：查看某帖子的所有评论（含软删除）
         """
         base_q = (
             self._admin_query()
+            .options(*_ADMIN_LIST_OPTIONS)
             .filter(Comment.post_id == post_id)
-            .order_by(Comment.created_at.asc())
+            .order_by(Comment.created_at.asc(), Comment._id.asc())
         )
 
-        total = base_q.count()
+        total = count_total(base_q, Comment._id)
 
-        comments: List[Comment] = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Comment.created_at, Comment._id, cursor))
+        else:
+            page_q = base_q.offset(page * page_size)
+        comments: List[Comment] = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(comments, page_size)
 
-        items: List[CommentAdminOut] = []
         for c in comments:
             if not c.comment_content:
                 # 管理员模式下也可以选择跳过异常数据：continue
                 # 这里仍然抛异常方便你开发阶段发现问题
                 raise RuntimeError(f"Comment(cid={c.cid}) missing content record")
+        items = COMMENT_ADMIN_OUT_LIST_TA.validate_python(comments)
 
-            items.append(CommentAdminOut.model_validate(c))
-
-        return BatchCommentsAdminOut(
+        return BatchCommentsAdminOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
     # ---------- 审核 / 状态更新 ----------
@@ -318,8 +333,8 @@ class SQLAlchemyCommentRepository(ICommentRepository):
             return False
 
         with transaction(self.db):
-            comment.review_status = data.review_status.value
-            comment.reviewed_at = now_utc8()
+            comment.review_status = int(data.review_status)
+            comment.reviewed_at = now_utc()
 
         return True
 
@@ -340,7 +355,7 @@ class SQLAlchemyCommentRepository(ICommentRepository):
             return False
 
         with transaction(self.db):
-            comment.status = data.status.value
+            comment.status = int(data.status)
 
         return True
 
@@ -360,7 +375,7 @@ class SQLAlchemyCommentRepository(ICommentRepository):
             return False
 
         with transaction(self.db):
-            comment.deleted_at = now_utc8()
+            comment.deleted_at = now_utc()
 
         return True
 
@@ -392,8 +407,7 @@ class SQLAlchemyCommentRepository(ICommentRepository):
     def hard_delete_comment(self, cid: str) -> bool:
         """
         硬删除评论：
-        - 仅删除 Comment 记录
-        - CommentContent 等建议通过 cascade 或业务层补充处理
+        - 删除 Comment 记录，CommentContent 由外键 ON DELETE CASCADE 一并删除
         """
         comment: Optional[Comment] = (
             self._admin_query()
@@ -61,18 +61,19 @@ class ICommentRepository(Protocol):
     # ---------- 按帖子查询列表 ----------
 
     def list_comments_by_post_for_user(
-        self, post_id: str, page: int, page_size: int
+        self, post_id: str, page: int, page_size: int, cursor: Optional[str] = None
     ) -> BatchCommentsOut:
         """
         普通用户 / 前台访客查看某帖子的评论列表：
         - 不含折叠
         - 不含软删除
         - 不含 REJECTED 评论
+        - 传 cursor 时按游标分页（忽略 page），返回结果带 next_cursor
         """
         ...
 
     def list_comments_by_post_for_reviewer(
-        self, post_id: str, page: int, page_size: int
+        self, post_id: str, page: int, page_size: int, cursor: Optional[str] = None
     ) -> BatchCommentsAdminOut:
         """
         审核员查看某帖子的评论列表：
@@ -83,7 +84,7 @@ class ICommentRepository(Protocol):
         ...
 
     def list_comments_by_post_for_admin(
-        self, post_id: str, page: int, page_size: int
+        self, post_id: str, page: int, page_size: int, cursor: Optional[str] = None
     ) -> BatchCommentsAdminOut:
         """
         管理员查看某帖子的评论列表：
@@ -12,6 +12,7 @@ from app.schemas.comment_content import (
 from app.storage.comment_content.comment_content_interface import (
     ICommentContentRepository,
 )
+from app.schemas.types import dataclass_payload
 from app.core.db import transaction
 
 
@@ -86,7 +87,7 @@ class SQLAlchemyCommentContentRepository(ICommentContentRepository):
         创建评论内容：
         - comment_id 必须是已存在的 comments.cid（交由业务层或外键约束保证）
         """
-        content = CommentContent(**data.model_dump())
+        content = CommentContent(**dataclass_payload(data))
 
         with transaction(self.db):
             self.db.add(content)
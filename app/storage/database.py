@@ -1,5 +1,7 @@
+import asyncio
+import os
+
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 from app.storage.user.SQLAlchemyUserRepository import SQLAlchemyUserRepository
 from app.storage.follow.SQLAlchemyFollowRepository import SQLAlchemyFollowRepository
@@ -14,61 +16,82 @@ from app.storage.like.SQLAlchemyLikeRepository import SQLAlchemyLikeRepository
 from fastapi import Depends
 
 # ======== 配置区 ========
-DB_HOST = "127.0.0.1"
-DB_PORT = 3306
-DB_USER = "root"
-DB_PASSWORD = "102412"   # 你的 MySQL 密码
-DB_NAME = "forum_db"
+# 均可用环境变量覆盖；前面挂了连接池代理（如 ProxySQL）时把 DB_HOST / DB_PORT 指向代理即可
+DB_HOST = os.getenv("DB_HOST", "127.0.0.1")
+DB_PORT = int(os.getenv("DB_PORT", "3306"))
+DB_USER = os.getenv("DB_USER", "root")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "102412")   # 你的 MySQL 密码
+DB_NAME = os.getenv("DB_NAME", "forum_db")
+
+# 连接池大小按「每个 worker 进程」计算：多 worker 部署时数据库总连接数 = worker 数 × (DB_POOL_SIZE + DB_MAX_OVERFLOW)，
+# 要控制在 MySQL max_connections 以内；worker 多或前面有连接池代理时应调小
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
 # ========================
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
 # SQLAlchemy 引擎
-engine = create_engine(DATABASE_URL, echo=True)
+# 会话时区固定为 UTC：TIMESTAMP 列按 UTC 读写，不再逐行附带时区对象，东八区转换放在响应出口
+# 连接池：默认常驻 20 条、高峰再借 10 条（见 DB_POOL_SIZE / DB_MAX_OVERFLOW），借不到最多等 30 秒；
+# pre_ping 在借出前探活，recycle 在 MySQL wait_timeout（默认 8 小时）之前主动换掉旧连接，避免拿到已被服务端断开的连接
+engine = create_engine(
+    DATABASE_URL,
+    echo=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    connect_args={"init_command": "SET time_zone = '+00:00'"},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
-
 
-def get_db():
+# 依赖都声明为 async def：只是创建会话 / 包一层仓库对象，没有 I/O，直接在事件循环里执行，
+# 不必像同步依赖那样每个都切到线程池；同步接口函数本身仍由 FastAPI 放到线程池里跑
+async def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        # 关闭会话（回滚未提交事务、归还连接）交给默认线程池：既不阻塞事件循环，
+        # 也不占用接口线程池的名额。同步生成器依赖的清理要排队等接口线程，
+        # 并发一高就会出现“接口线程等连接、连接等清理线程”的互相卡死
+        await asyncio.to_thread(db.close)
 
 
 # 未来可以根据配置切换不同的实现
-def get_user_repo(db: Session = Depends(get_db)) -> SQLAlchemyUserRepository:
+async def get_user_repo(db: Session = Depends(get_db)) -> SQLAlchemyUserRepository:
     return SQLAlchemyUserRepository(db)
 
 
-def get_follow_repo(db: Session = Depends(get_db)) -> SQLAlchemyFollowRepository:
+async def get_follow_repo(db: Session = Depends(get_db)) -> SQLAlchemyFollowRepository:
     return SQLAlchemyFollowRepository(db)
 
 
-def get_usersta_repo(db: Session = Depends(get_db)) -> SQLAlchemyUserStatsRepository:
+async def get_usersta_repo(db: Session = Depends(get_db)) -> SQLAlchemyUserStatsRepository:
     return SQLAlchemyUserStatsRepository(db)
 
 
-def get_post_repo(db: Session = Depends(get_db)) -> SQLAlchemyPostRepository:
+async def get_post_repo(db: Session = Depends(get_db)) -> SQLAlchemyPostRepository:
     return SQLAlchemyPostRepository(db)
 
 
-def get_postcon_repo(db: Session = Depends(get_db)) -> SQLAlchemyPostContentRepository:
+async def get_postcon_repo(db: Session = Depends(get_db)) -> SQLAlchemyPostContentRepository:
     return SQLAlchemyPostContentRepository(db)
 
 
-def get_poststats_repo(db: Session = Depends(get_db)) -> SQLAlchemyPostStatsRepository:
+async def get_poststats_repo(db: Session = Depends(get_db)) -> SQLAlchemyPostStatsRepository:
     return SQLAlchemyPostStatsRepository(db)
 
 
-def get_comment_repo(db: Session = Depends(get_db)) -> SQLAlchemyCommentRepository:
+async def get_comment_repo(db: Session = Depends(get_db)) -> SQLAlchemyCommentRepository:
     return SQLAlchemyCommentRepository(db)
 
 
-def get_comcon_repo(db: Session = Depends(get_db)) -> SQLAlchemyCommentContentRepository:
+async def get_comcon_repo(db: Session = Depends(get_db)) -> SQLAlchemyCommentContentRepository:
     return SQLAlchemyCommentContentRepository(db)
 
 
-def get_like_repo(db: Session = Depends(get_db)) -> SQLAlchemyLikeRepository:
+async def get_like_repo(db: Session = Depends(get_db)) -> SQLAlchemyLikeRepository:
     return SQLAlchemyLikeRepository(db)
\ No newline at end of file
@@ -1,11 +1,12 @@
 from typing import List, Optional, Set
-from datetime import datetime, timezone, timedelta
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, or_, case, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from app.models.follow import Follow
 from app.models.user import User
+from app.models.user_stats import UserStats
 from app.schemas.follow import (
     FollowCreate,
     FollowOut,
@@ -14,11 +15,27 @@ from app.schemas.follow import (
     FollowCancel,
     FollowAdminOut,
 )
-from app.schemas.user import UserOut
+from app.schemas.user import USER_OUT_LIST_TA
 from app.storage.follow.follow_interface import IFollowRepository
-from app.core.db import transaction
-from app.core.logx import logger
-logger.is_debug(True)
+from app.core.db import transaction, strict_loading_options
+from app.core.pagination import keyset_filter, next_cursor_of, count_total
+from app.core.time import now_utc
+
+
+# 批量关注语句只构造一次，之后每批只换参数（同 SQLAlchemyLikeRepository._bulk_like_stmt）
+# 列表形式保证赋值顺序：先按旧的 deleted_at 判断 created_at，再清空 deleted_at
+_bulk_follow_stmt = mysql_insert(Follow)
+_bulk_follow_stmt = _bulk_follow_stmt.on_duplicate_key_update([
+    ("created_at", case((Follow.deleted_at.is_(None), Follow.created_at), else_=func.now())),
+    ("deleted_at", None),
+])
+
+# 关注 / 粉丝列表只取 UserOut 用到的列，不把 password / phone 等整行字段带出来
+_FOLLOW_USER_COLUMNS = load_only(User.uid, User.username, User.avatar_url, User.role, User.bio, User.status)
+
+# 新建关注：已有记录（无论是否软删）时什么都不做，受影响行数 0 / 1 直接表示是否真的插入了
+# 必须建在 Follow.__table__ 上：建在 ORM 实体上会走 ORM 批量插入，MySQL 没有 RETURNING 时返回的结果没有 rowcount
+_insert_follow_ignore_stmt = mysql_insert(Follow.__table__).prefix_with("IGNORE")
 
 class SQLAlchemyFollowRepository(IFollowRepository):
     """
@@ -48,14 +65,12 @@ class SQLAlchemyFollowRepository(IFollowRepository):
             .first()
         )
 
-        now = datetime.now(timezone(timedelta(hours=8)))
-
         if existing:
             # 已存在 soft-deleted，则视为重新关注
             if existing.deleted_at is not None:
                 with transaction(self.db):
                     existing.deleted_at = None
-                    existing.created_at = now
+                    existing.created_at = func.now()
                 self.db.refresh(existing)
             # 已有有效记录，直接返回
             return FollowOut.model_validate(existing)
@@ -64,7 +79,6 @@ class SQLAlchemyFollowRepository(IFollowRepository):
         follow = Follow(
             user_id=data.user_id,
             followed_user_id=data.followed_user_id,
-            created_at=now,
             deleted_at=None,
         )
 
@@ -74,6 +88,134 @@ class SQLAlchemyFollowRepository(IFollowRepository):
         self.db.refresh(follow)
         return FollowOut.model_validate(follow)
 
+    def _bump_user_stats(self, user_id: str, column, step: int) -> None:
+        """
+        user_stats 计数原子加减（不单独提交，跟随调用方的事务）：
+        - INSERT ... ON DUPLICATE KEY UPDATE col = GREATEST(col + step, 0)
+        - 统计记录不存在时顺带补建，不需要先 SELECT
+        """
+        now = now_utc()
+        values = {"user_id": user_id, "following_count": 0, "followers_count": 0, "updated_at": now}
+        values[column.key] = max(step, 0)
+        stmt = mysql_insert(UserStats).values(**values).on_duplicate_key_update(
+            {column.key: func.greatest(column + step, 0), "updated_at": now}
+        )
+        self.db.execute(stmt)
+
+    def _restore_or_insert_follow(self, data: FollowCreate) -> int:
+        """
+        恢复软删除的记录（UPDATE ... WHERE deleted_at IS NOT NULL），没有可恢复的记录则 INSERT IGNORE 新建
+        - 返回受影响行数：1 表示关系真的从“未关注”变成“已关注”，0 表示本来就在关注
+        - 不单独提交，跟随调用方的事务
+        """
+        changed = (
+            self.db.query(Follow)
+            .filter(
+                Follow.user_id == data.user_id,
+                Follow.followed_user_id == data.followed_user_id,
+                Follow.deleted_at.is_not(None),
+            )
+            .update({Follow.deleted_at: None, Follow.created_at: func.now()}, synchronize_session=False)
+        )
+        if not changed:
+            changed = self.db.execute(
+                _insert_follow_ignore_stmt,
+                {"user_id": data.user_id, "followed_user_id": data.followed_user_id},
+            ).rowcount
+        return changed
+
+    def _soft_delete_active_follow(self, data: FollowCancel) -> int:
+        """
+        UPDATE ... SET deleted_at = NOW() WHERE deleted_at IS NULL
+        - 返回受影响行数：1 表示真的取消了关注
+        - 不单独提交，跟随调用方的事务
+        """
+        return (
+            self._active_query()
+            .filter(
+                Follow.user_id == data.user_id,
+                Follow.followed_user_id == data.followed_user_id,
+            )
+            .update({Follow.deleted_at: func.now()}, synchronize_session=False)
+        )
+
+    def follow_with_stats(self, data: FollowCreate) -> Optional[FollowOut]:
+        """
+        关注并更新双方计数，全部在同一个事务里完成：
+        1. 恢复软删除的记录，或 INSERT IGNORE 新建
+        2. 受影响行数说明关系是否真的从“未关注”变成“已关注”，是才给双方计数 +1
+        - 先查再写的检查不再需要，并发重复关注也只会计数一次
+        - 本来就在关注时返回 None
+        """
+        with transaction(self.db):
+            changed = self._restore_or_insert_follow(data)
+            if changed:
+                self._bump_user_stats(data.user_id, UserStats.following_count, 1)
+                self._bump_user_stats(data.followed_user_id, UserStats.followers_count, 1)
+
+        if not changed:
+            return None
+        return self.get_follow(data.user_id, data.followed_user_id)
+
+    def follow_only(self, data: FollowCreate) -> Optional[FollowOut]:
+        """
+        只写关注关系，不碰 user_stats（计数由调用方异步维护）
+        - 本来就在关注时返回 None
+        """
+        with transaction(self.db):
+            changed = self._restore_or_insert_follow(data)
+
+        if not changed:
+            return None
+        return self.get_follow(data.user_id, data.followed_user_id)
+
+    def cancel_follow_with_stats(self, data: FollowCancel) -> bool:
+        """
+        取消关注并更新双方计数，在同一个事务里完成：
+        - 软删除有效记录，受影响行数为 1 才给双方计数 -1
+        - 本来就没有关注时返回 False
+        """
+        with transaction(self.db):
+            cancelled = self._soft_delete_active_follow(data)
+            if cancelled:
+                self._bump_user_stats(data.user_id, UserStats.following_count, -1)
+                self._bump_user_stats(data.followed_user_id, UserStats.followers_count, -1)
+
+        return bool(cancelled)
+
+    def cancel_follow_only(self, data: FollowCancel) -> bool:
+        """
+        只软删除关注关系，不碰 user_stats（计数由调用方异步维护）
+        - 本来就没有关注时返回 False
+        """
+        with transaction(self.db):
+            cancelled = self._soft_delete_active_follow(data)
+
+        return bool(cancelled)
+
+    def bulk_create_follows(self, rows: List[FollowCreate], batch_size: int = 10000) -> int:
+        """
+        批量创建关注：
+        - INSERT ... VALUES (...), (...) ON DUPLICATE KEY UPDATE
+        - 命中 uq_user_follow 时恢复软删除的记录，已有效的记录保持不变
+        """
+        if not rows:
+            return 0
+
+        for start in range(0, len(rows), batch_size):
+            params = [
+                {
+                    "user_id": r.user_id,
+                    "followed_user_id": r.followed_user_id,
+                    "deleted_at": None,
+                }
+                for r in rows[start:start + batch_size]
+            ]
+            with transaction(self.db):
+                self.db.execute(_bulk_follow_stmt, params)
+
+        return len(rows)
+
     def cancel_follow(self, data: FollowCancel) -> bool:
         """
         取消关注（软删除）
@@ -90,7 +232,7 @@ class SQLAlchemyFollowRepository(IFollowRepository):
             return False
 
         with transaction(self.db):
-            follow.deleted_at = datetime.now(timezone(timedelta(hours=8)))
+            follow.deleted_at = func.now()
 
         return True
 
@@ -180,7 +322,7 @@ class SQLAlchemyFollowRepository(IFollowRepository):
         )
 
 
-    def list_following(self, user_id: str, page: int, page_size: int) -> BatchFollowsOut:
+    def list_following(self, user_id: str, page: int, page_size: int, cursor: Optional[str] = None) -> BatchFollowsOut:
         """
         我关注的人列表：
         - 从 Follow 中找出 user_id = 当前用户 的记录
@@ -190,23 +332,25 @@ class SQLAlchemyFollowRepository(IFollowRepository):
 
         base_q = (
             self.db.query(Follow, User)
+            .options(_FOLLOW_USER_COLUMNS, *strict_loading_options())
             .join(User, User.uid == Follow.followed_user_id)
             .filter(
                 Follow.user_id == user_id,
                 Follow.deleted_at.is_(None),
                 User.deleted_at.is_(None),
             )
-            .order_by(Follow.created_at.desc())
+            .order_by(Follow.created_at.desc(), Follow._id.desc())
         )
 
-        total = base_q.count()
+        total = count_total(base_q, Follow._id)
 
-        rows = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Follow.created_at, Follow._id, cursor, descending=True))
+        else:
+            page_q = base_q.offset(page * page_size)
+        rows = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(rows, page_size, key=lambda row: row[0])
 
         # 对方用户 ID 列表，用于批量查询互关
         other_user_ids = [u.uid for _, u in rows]
@@ -216,49 +360,44 @@ class SQLAlchemyFollowRepository(IFollowRepository):
             other_user_ids=other_user_ids,
         )
 
-        items: List[FollowUserOut] = []
-        for _, user_orm in rows:
-            user_out = UserOut.model_validate(user_orm)
-            items.append(
-                FollowUserOut(
-                    user=user_out,
-                    is_mutual=(user_orm.uid in mutual_ids),
-                )
-            )
+        users = USER_OUT_LIST_TA.validate_python([user_orm for _, user_orm in rows])
+        items = [FollowUserOut.model_construct(user=u, is_mutual=(u.uid in mutual_ids)) for u in users]
 
-        return BatchFollowsOut(
+        return BatchFollowsOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
-    def list_followers(self, user_id: str, page: int, page_size: int) -> BatchFollowsOut:
+    def list_followers(self, user_id: str, page: int, page_size: int, cursor: Optional[str] = None) -> BatchFollowsOut:
         """
         我的粉丝列表：
         - 从 Follow 中找出 followed_user_id = 当前用户 的记录
         - join 到 User 表拿到关注者的用户信息
         - 再计算这些人中，哪些也是我关注的（互关）
         """
-        logger.debug("ok")
         base_q = (
             self.db.query(Follow, User)
+            .options(_FOLLOW_USER_COLUMNS, *strict_loading_options())
             .join(User, User.uid == Follow.user_id)
             .filter(
                 Follow.followed_user_id == user_id,
                 Follow.deleted_at.is_(None),
                 User.deleted_at.is_(None),
             )
-            .order_by(Follow.created_at.desc())
+            .order_by(Follow.created_at.desc(), Follow._id.desc())
         )
 
-        total = base_q.count()
+        total = count_total(base_q, Follow._id)
 
-        rows = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Follow.created_at, Follow._id, cursor, descending=True))
+        else:
+            page_q = base_q.offset(page * page_size)
+        rows = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(rows, page_size, key=lambda row: row[0])
 
         other_user_ids = [u.uid for _, u in rows]
 
@@ -271,20 +410,14 @@ class SQLAlchemyFollowRepository(IFollowRepository):
         )
         # logger.debug(f"mutual_ids: {mutual_ids}")
         
-        items: List[FollowUserOut] = []
-        for _, user_orm in rows:
-            user_out = UserOut.model_validate(user_orm)
-            items.append(
-                FollowUserOut(
-                    user=user_out,
-                    is_mutual=(user_orm.uid in mutual_ids),
-                )
-            )
+        users = USER_OUT_LIST_TA.validate_python([user_orm for _, user_orm in rows])
+        items = [FollowUserOut.model_construct(user=u, is_mutual=(u.uid in mutual_ids)) for u in users]
 
-        return BatchFollowsOut(
+        return BatchFollowsOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
     def _get_mutual_ids_following(self, user_id: str, other_user_ids: List[str]) -> Set[str]:
@@ -24,6 +24,46 @@ class IFollowRepository(Protocol):
         """
         ...
 
+    def follow_with_stats(self, data: FollowCreate) -> Optional[FollowOut]:
+        """
+        关注并更新双方的关注数 / 粉丝数（同一事务）：
+        - 新建或恢复软删除的记录，并给双方计数 +1
+        - 已经在关注时不做任何修改，返回 None
+        """
+        ...
+
+    def cancel_follow_with_stats(self, data: FollowCancel) -> bool:
+        """
+        取消关注并更新双方的关注数 / 粉丝数（同一事务）：
+        - 软删除有效记录，并给双方计数 -1
+        - 当前没有关注时返回 False
+        """
+        ...
+
+    def follow_only(self, data: FollowCreate) -> Optional[FollowOut]:
+        """
+        只新建或恢复关注记录，不更新 user_stats（计数走异步回写）
+        - 已经在关注时不做任何修改，返回 None
+        """
+        ...
+
+    def cancel_follow_only(self, data: FollowCancel) -> bool:
+        """
+        只软删除有效的关注记录，不更新 user_stats（计数走异步回写）
+        - 当前没有关注时返回 False
+        """
+        ...
+
+    def bulk_create_follows(self, rows: List[FollowCreate], batch_size: int = 10000) -> int:
+        """
+        批量创建关注关系（导入 / 数据回填 / 管理员批量操作）：
+        - 按 batch_size 分批，每批一条多行 INSERT，并单独提交
+        - 已存在的记录（含软删除）视为重新关注：deleted_at 置空
+        - 不维护 user_stats 计数，由调用方自行处理
+        - 返回提交的记录条数
+        """
+        ...
+
     def cancel_follow(self, data: FollowCancel) -> bool:
         """
         取消关注（软删除）：
@@ -51,22 +91,24 @@ class IFollowRepository(Protocol):
         ...
 
 
-    def list_following(self, user_id: str, page: int, page_size: int) -> BatchFollowsOut:
+    def list_following(self, user_id: str, page: int, page_size: int, cursor: Optional[str] = None) -> BatchFollowsOut:
         """
         获取用户的“关注列表”（我关注了谁）
         - user_id: 当前用户 UID
         - page: 页码（0 开始）
         - page_size: 每页数量
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
         - 返回 FollowUserOut 列表（对方用户信息 + 是否互关）
         """
         ...
 
-    def list_followers(self, user_id: str, page: int, page_size: int) -> BatchFollowsOut:
+    def list_followers(self, user_id: str, page: int, page_size: int, cursor: Optional[str] = None) -> BatchFollowsOut:
         """
         获取用户的“粉丝列表”（谁关注了我）
         - user_id: 当前用户 UID
         - page: 页码（0 开始）
         - page_size: 每页数量
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
         - 返回 FollowUserOut 列表（对方用户信息 + 是否互关）
         """
         ...
@@ -1,23 +1,69 @@
 # app/storage/like/SQLAlchemyLikeRepository.py
 
-from typing import List, Optional
+import uuid
+from typing import Iterable, List, Optional, Set, Tuple
 
+from sqlalchemy import case, select, literal, func, exists, insert, tuple_, update
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from app.models.like import Like, LikeTargetType
+from app.models.user import User
+from app.models.post import Post
+from app.models.comment import Comment
 from app.schemas.like import (
     LikeCreate,
     LikeCancel,
     LikeOut,
-    LikeAdminOut,
     BatchLikesOut,
     BatchLikesAdminOut,
+    LIKE_OUT_LIST_TA,
+    LIKE_ADMIN_OUT_LIST_TA,
 )
 from app.storage.like.like_interface import ILikeRepository
+from app.storage.user.SQLAlchemyUserRepository import USER_ACTIVE_FILTERS
+from app.storage.post.SQLAlchemyPostRepository import POST_VIEWER_FILTERS
+from app.storage.comment.SQLAlchemyCommentRepository import COMMENT_USER_FILTERS
 from app.core.db import transaction
-from app.core.time import now_utc8  # 和你其它模型保持一致的东八区时间
+from app.core.pagination import keyset_filter, next_cursor_of
 from app.core.exceptions import AlreadyLikedError, NotLikedError
 
+
+# 批量点赞语句只构造一次，之后每批只换参数；SQLAlchemy 按语句结构缓存编译结果，
+# 复用同一个语句对象也省掉了每次调用重新拼 ON DUPLICATE KEY UPDATE 子句的开销
+# 列表形式保证赋值顺序：先按旧的 deleted_at 判断 created_at，再清空 deleted_at
+_bulk_like_stmt = mysql_insert(Like)
+_bulk_like_stmt = _bulk_like_stmt.on_duplicate_key_update([
+    ("created_at", case((Like.deleted_at.is_(None), Like.created_at), else_=func.now())),
+    ("deleted_at", None),
+])
+
+# 单条点赞：INSERT IGNORE 撞上 uq_likes_user_target 时不报错，影响行数为 0，
+# 由唯一索引在数据库里原子地判断“是否已有记录”，不再先 SELECT 再 INSERT（两个并发点赞会一起通过 SELECT）
+_like_insert_stmt = insert(Like.__table__).prefix_with("IGNORE", dialect="mysql")
+
+# (user_id, target_type, target_id)，批量点赞 / 取消时定位一条点赞记录
+LikeKey = Tuple[str, int, str]
+
+
+def _norm_uuid(value: str) -> Optional[str]:
+    """统一成数据库读回来的小写带横线格式，便于和查询结果比对；非法 UUID 返回 None"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _like_keys(rows: Iterable[LikeCreate]) -> List[LikeKey]:
+    """批量请求转成去重后的 (user_id, target_type, target_id)，保持原顺序，丢弃非法 UUID"""
+    keys = {}
+    for r in rows:
+        user_id, target_id = _norm_uuid(r.user_id), _norm_uuid(r.target_id)
+        if user_id and target_id:
+            keys[(user_id, int(r.target_type), target_id)] = None
+    return list(keys)
+
+
 class SQLAlchemyLikeRepository(ILikeRepository):
     """
     使用 SQLAlchemy 实现的点赞仓库
@@ -27,6 +73,21 @@ class SQLAlchemyLikeRepository(ILikeRepository):
     def __init__(self, db: Session):
         self.db = db
 
+    def check_like_refs(self, user_id: str, target_type: LikeTargetType, target_id: str) -> Tuple[bool, bool]:
+        """
+        点赞前的存在性校验，一次查询完成：
+        - SELECT EXISTS(正常用户), EXISTS(对他人可见的帖子 / 用户可见的评论)
+        - 只判断存在与否，不加载用户 / 帖子正文 / 统计
+        """
+        if target_type == LikeTargetType.POST:
+            target_exists = exists().where(Post.pid == target_id, *POST_VIEWER_FILTERS)
+        else:
+            target_exists = exists().where(Comment.cid == target_id, *COMMENT_USER_FILTERS)
+        user_exists = exists().where(User.uid == user_id, *USER_ACTIVE_FILTERS)
+
+        user_ok, target_ok = self.db.execute(select(user_exists, target_exists)).one()
+        return bool(user_ok), bool(target_ok)
+
     # ---------- 内部基础查询 ----------
 
     def _active_query(self):
@@ -57,32 +118,33 @@ class SQLAlchemyLikeRepository(ILikeRepository):
     def like(self, data: LikeCreate) -> LikeOut:
         """
         创建或恢复点赞：
-        - 如存在软删除记录 => 恢复点赞（deleted_at=NULL, created_at=now）
-        - 如存在有效记录 => 抛 AlreadyLikedError（阻止重复点赞导致的计数增加）
+        - 先 INSERT IGNORE：插入成功即全新点赞
+        - 撞唯一键（已有记录）时条件恢复：UPDATE ... WHERE deleted_at IS NOT NULL，
+          行锁下重新判断条件，并发请求里只有一个能恢复成功
+        - 两步都没改到行 => 已经是有效点赞，抛 AlreadyLikedError（阻止重复点赞导致的计数增加）
+        - 注意 IGNORE 也会吞掉外键错误，调用方需先做引用校验（见 check_like_refs）
         """
-        existing: Optional[Like] = (
-            self._admin_query()
-            .filter(
-                Like.user_id == data.user_id,
-                Like.target_type == int(data.target_type),
-                Like.target_id == data.target_id,
-            )
-            .first()
+        key = (
+            Like.user_id == data.user_id,
+            Like.target_type == int(data.target_type),
+            Like.target_id == data.target_id,
         )
-
-        now = now_utc8()
-
-        # -------- 情况 1：已有记录 --------
-        if existing:
-            if existing.deleted_at is not None:
+        with transaction(self.db):
+            changed = self.db.execute(_like_insert_stmt, {
+                "user_id": data.user_id,
+                "target_type": int(data.target_type),
+                "target_id": data.target_id,
+            }).rowcount
+            if not changed:
                 # 软删除状态 → 恢复点赞（这算一次“新增点赞”，需要 +1）
-                with transaction(self.db):
-                    existing.deleted_at = None
-                    existing.created_at = now
-
-                self.db.refresh(existing)
-                return LikeOut.model_validate(existing)
-
+                changed = self.db.execute(
+                    update(Like)
+                    .where(*key, Like.deleted_at.is_not(None))
+                    .values(deleted_at=None, created_at=func.now())
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+
+        if not changed:
             # 已经是有效点赞 → 抛业务异常，通知上层不要重复 +1
             raise AlreadyLikedError(
                 user_id=data.user_id,
@@ -90,20 +152,97 @@ class SQLAlchemyLikeRepository(ILikeRepository):
                 target_id=data.target_id,
             )
 
-        # -------- 情况 2：全新点赞 --------
-        like = Like(
-            user_id=data.user_id,
-            target_type=int(data.target_type),
-            target_id=data.target_id,
-            created_at=now,
-            deleted_at=None,
+        like = self._active_query().filter(*key).one()
+        return LikeOut.model_validate(like)
+
+    def bulk_like(self, rows: List[LikeCreate], batch_size: int = 10000) -> int:
+        """
+        批量点赞：
+        - INSERT ... VALUES (...), (...) ON DUPLICATE KEY UPDATE
+        - 命中 uq_likes_user_target 时恢复软删除的记录，已有效的记录保持不变
+        """
+        if not rows:
+            return 0
+
+        for start in range(0, len(rows), batch_size):
+            params = [
+                {
+                    "user_id": r.user_id,
+                    "target_type": int(r.target_type),
+                    "target_id": r.target_id,
+                    "deleted_at": None,
+                }
+                for r in rows[start:start + batch_size]
+            ]
+            with transaction(self.db):
+                self.db.execute(_bulk_like_stmt, params)
+
+        return len(rows)
+
+    def _valid_like_keys(self, keys: List[LikeKey]) -> List[LikeKey]:
+        """
+        批量点赞的引用校验：按用户 / 帖子 / 评论各一条 IN 查询，
+        只保留用户正常且目标可见的项（规则同 check_like_refs）
+        """
+        user_ids = {k[0] for k in keys}
+        post_ids = {k[2] for k in keys if k[1] == int(LikeTargetType.POST)}
+        comment_ids = {k[2] for k in keys if k[1] == int(LikeTargetType.COMMENT)}
+
+        ok_users = set(self.db.scalars(
+            select(User.uid).where(User.uid.in_(user_ids), *USER_ACTIVE_FILTERS)
+        ))
+        ok_targets = {int(LikeTargetType.POST): set(), int(LikeTargetType.COMMENT): set()}
+        if post_ids:
+            ok_targets[int(LikeTargetType.POST)] = set(self.db.scalars(
+                select(Post.pid).where(Post.pid.in_(post_ids), *POST_VIEWER_FILTERS)
+            ))
+        if comment_ids:
+            ok_targets[int(LikeTargetType.COMMENT)] = set(self.db.scalars(
+                select(Comment.cid).where(Comment.cid.in_(comment_ids), *COMMENT_USER_FILTERS)
+            ))
+
+        return [k for k in keys if k[0] in ok_users and k[2] in ok_targets.get(k[1], ())]
+
+    def _lock_active_keys(self, keys: List[LikeKey]) -> Set[LikeKey]:
+        """
+        SELECT ... FOR UPDATE 锁住这批 (用户, 目标) 的唯一索引记录，返回其中当前有效的点赞：
+        - 必须在调用方的事务里执行，保证随后的写入和这里看到的状态一致，计数不会重复增减
+        """
+        stmt = (
+            select(Like.user_id, Like.target_type, Like.target_id)
+            .where(
+                tuple_(Like.user_id, Like.target_type, Like.target_id).in_(keys),
+                Like.deleted_at.is_(None),
+            )
+            .with_for_update()
         )
+        return {tuple(row) for row in self.db.execute(stmt)}
+
+    def like_many(self, rows: List[LikeCreate]) -> List[LikeCreate]:
+        """
+        批量点赞（一次请求点多个目标）：
+        - 重复项只算一次，用户不存在 / 目标不可见的项直接忽略
+        - 已经是有效点赞的项跳过，不报错
+        - 其余项一条多行 INSERT ... ON DUPLICATE KEY UPDATE 新建或恢复
+        - 返回本次真正新增 / 恢复的点赞，调用方据此更新计数
+        """
+        keys = _like_keys(rows)
+        if not keys:
+            return []
+        keys = self._valid_like_keys(keys)
+        if not keys:
+            return []
 
         with transaction(self.db):
-            self.db.add(like)
+            active = self._lock_active_keys(keys)
+            changed = [k for k in keys if k not in active]
+            if changed:
+                self.db.execute(_bulk_like_stmt, [
+                    {"user_id": u, "target_type": t, "target_id": tid, "deleted_at": None}
+                    for u, t, tid in changed
+                ])
 
-        self.db.refresh(like)
-        return LikeOut.model_validate(like)
+        return [LikeCreate(user_id=u, target_type=LikeTargetType(t), target_id=tid) for u, t, tid in changed]
 
     # ---------- 取消点赞（软删） ----------
 
@@ -151,19 +290,85 @@ class SQLAlchemyLikeRepository(ILikeRepository):
 
         # 3) 有记录且 deleted_at is None：当前是“已点赞”状态，本次取消有效
         with transaction(self.db):
-            like.deleted_at = now_utc8()
+            like.deleted_at = func.now()
 
         self.db.refresh(like)
         return LikeOut.model_validate(like)
 
+    def cancel_many(self, rows: List[LikeCancel]) -> List[LikeCancel]:
+        """
+        批量取消点赞：
+        - 只软删当前有效的点赞，一条 UPDATE ... WHERE (user_id, target_type, target_id) IN (...)
+        - 本来就没点过 / 已取消的项跳过，不报错
+        - 返回本次真正取消的点赞，调用方据此更新计数
+        """
+        keys = _like_keys(rows)
+        if not keys:
+            return []
+
+        with transaction(self.db):
+            active = self._lock_active_keys(keys)
+            changed = [k for k in keys if k in active]
+            if changed:
+                self.db.execute(
+                    update(Like)
+                    .where(
+                        tuple_(Like.user_id, Like.target_type, Like.target_id).in_(changed),
+                        Like.deleted_at.is_(None),
+                    )
+                    .values(deleted_at=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+
+        return [LikeCancel(user_id=u, target_type=LikeTargetType(t), target_id=tid) for u, t, tid in changed]
+
     # ---------- 查询：普通视角（过滤软删） ----------
 
+    def list_liked_target_ids(self, user_id: str, target_type: LikeTargetType) -> List[str]:
+        """
+        查询用户当前点赞过的全部目标 ID：
+        - 只取 target_id 一列，走 idx_likes_user_target_type
+        """
+        rows = (
+            self.db.query(Like.target_id)
+            .filter(
+                Like.user_id == user_id,
+                Like.target_type == int(target_type),
+                Like.deleted_at.is_(None),
+            )
+            .all()
+        )
+        return [row.target_id for row in rows]
+
+    def has_liked(
+        self,
+        user_id: str,
+        target_type: LikeTargetType,
+        target_id: str,
+    ) -> bool:
+        """
+        判断用户当前是否点赞了某个目标：
+        - SELECT 1 ... LIMIT 1，条件列都在 idx_likes_target_type_id_user 中，只走索引不回表
+        """
+        stmt = (
+            select(literal(1))
+            .where(
+                Like.target_type == int(target_type),
+                Like.target_id == target_id,
+                Like.user_id == user_id,
+                Like.deleted_at.is_(None),
+            )
+            .limit(1)
+        )
+        return self.db.execute(stmt).first() is not None
+
     def list_likes_by_target(
         self,
         target_type: LikeTargetType,
         target_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchLikesOut:
         """
         查询某个目标（帖子/评论）的所有有效点赞记录（分页）：
@@ -176,24 +381,26 @@ class SQLAlchemyLikeRepository(ILikeRepository):
                 Like.target_type == int(target_type),
                 Like.target_id == target_id,
             )
-            .order_by(Like.created_at.desc())
+            .order_by(Like.created_at.desc(), Like._id.desc())
         )
 
         total = base_q.count()
 
-        likes: List[Like] = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Like.created_at, Like._id, cursor, descending=True))
+        else:
+            page_q = base_q.offset(page * page_size)
+        likes: List[Like] = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(likes, page_size)
 
-        items = [LikeOut.model_validate(l) for l in likes]
+        items = LIKE_OUT_LIST_TA.validate_python(likes)
 
-        return BatchLikesOut(
+        return BatchLikesOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
     def list_likes_by_user(
@@ -201,6 +408,7 @@ class SQLAlchemyLikeRepository(ILikeRepository):
         user_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchLikesOut:
         """
         查询某个用户的有效点赞记录（分页）：
@@ -210,24 +418,26 @@ class SQLAlchemyLikeRepository(ILikeRepository):
         base_q = (
             self._active_query()
             .filter(Like.user_id == user_id)
-            .order_by(Like.created_at.desc())
+            .order_by(Like.created_at.desc(), Like._id.desc())
         )
 
         total = base_q.count()
 
-        likes: List[Like] = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(keyset_filter(Like.created_at, Like._id, cursor, descending=True))
+        else:
+            page_q = base_q.offset(page * page_size)
+        likes: List[Like] = page_q.limit(page_size + 1).all()
+        next_cursor = next_cursor_of(likes, page_size)
 
-        items = [LikeOut.model_validate(l) for l in likes]
+        items = LIKE_OUT_LIST_TA.validate_python(likes)
 
-        return BatchLikesOut(
+        return BatchLikesOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
 
     # ---------- 查询：管理员视角（含软删） ----------
@@ -260,9 +470,9 @@ class SQLAlchemyLikeRepository(ILikeRepository):
             .all()
         )
 
-        items = [LikeAdminOut.model_validate(l) for l in likes]
+        items = LIKE_ADMIN_OUT_LIST_TA.validate_python(likes)
 
-        return BatchLikesAdminOut(
+        return BatchLikesAdminOut.model_construct(
             total=total,
             count=len(items),
             items=items,
@@ -292,9 +502,9 @@ class SQLAlchemyLikeRepository(ILikeRepository):
             .all()
         )
 
-        items = [LikeAdminOut.model_validate(l) for l in likes]
+        items = LIKE_ADMIN_OUT_LIST_TA.validate_python(likes)
 
-        return BatchLikesAdminOut(
+        return BatchLikesAdminOut.model_construct(
             total=total,
             count=len(items),
             items=items,
@@ -1,6 +1,6 @@
 # app/storage/like/like_interface.py
 
-from typing import Optional, List, Protocol
+from typing import Optional, List, Protocol, Tuple
 
 from app.models.like import LikeTargetType
 from app.schemas.like import (
@@ -19,6 +19,16 @@ class ILikeRepository(Protocol):
     业务层依赖本接口，而不是具体实现，方便后续替换为不同数据源
     """
 
+    # ---------- 校验 ----------
+
+    def check_like_refs(self, user_id: str, target_type: LikeTargetType, target_id: str) -> Tuple[bool, bool]:
+        """
+        点赞前一次性校验引用是否存在：
+        - 返回 (用户是否存在且正常, 目标是否存在且对用户可见)
+        - 帖子按访客可见规则判断，评论按普通用户可见规则判断
+        """
+        ...
+
     # ---------- 创建 / 取消 ----------
 
     def like(self, data: LikeCreate) -> LikeOut:
@@ -30,6 +40,25 @@ class ILikeRepository(Protocol):
         """
         ...
 
+    def bulk_like(self, rows: List[LikeCreate], batch_size: int = 10000) -> int:
+        """
+        批量点赞（导入 / 数据回填）：
+        - 按 batch_size 分批，每批一条多行 INSERT，并单独提交
+        - 已存在的记录（含软删除）视为恢复点赞：deleted_at 置空
+        - 不维护 post_stats / comments 的点赞计数，由调用方自行处理
+        - 返回提交的记录条数
+        """
+        ...
+
+    def like_many(self, rows: List[LikeCreate]) -> List[LikeCreate]:
+        """
+        批量点赞（一次请求点多个目标）：
+        - 重复项只算一次，用户不存在 / 目标不可见的项忽略，已点过的项跳过
+        - 其余项一条多行 INSERT 新建或恢复，同一事务内完成
+        - 返回本次真正新增 / 恢复的点赞，不维护计数
+        """
+        ...
+
     def cancel_like(self, data: LikeCancel) -> bool:
         """
         取消点赞（软删除）：
@@ -40,18 +69,47 @@ class ILikeRepository(Protocol):
         """
         ...
 
+    def cancel_many(self, rows: List[LikeCancel]) -> List[LikeCancel]:
+        """
+        批量取消点赞：
+        - 只软删当前有效的点赞，没点过 / 已取消的项跳过
+        - 返回本次真正取消的点赞，不维护计数
+        """
+        ...
+
     # ---------- 查询：普通视角（过滤软删除） ----------
 
+    def list_liked_target_ids(self, user_id: str, target_type: LikeTargetType) -> List[str]:
+        """
+        查询用户当前点赞过的全部目标 ID（只看有效点赞）：
+        - 用于重建 Redis 中“用户点赞过哪些帖子”的布隆过滤器
+        """
+        ...
+
+    def has_liked(
+        self,
+        user_id: str,
+        target_type: LikeTargetType,
+        target_id: str,
+    ) -> bool:
+        """
+        判断用户当前是否点赞了某个目标：
+        - 只看有效点赞（deleted_at IS NULL）
+        """
+        ...
+
     def list_likes_by_target(
         self,
         target_type: LikeTargetType,
         target_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchLikesOut:
         """
         查询某个目标（帖子/评论）的所有有效点赞记录（分页）：
         - 过滤 deleted_at IS NULL
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
         """
         ...
 
@@ -60,11 +118,13 @@ class ILikeRepository(Protocol):
         user_id: str,
         page: int,
         page_size: int,
+        cursor: Optional[str] = None,
     ) -> BatchLikesOut:
         """
         查询某个用户的点赞记录（分页）：
         - 过滤 deleted_at IS NULL
         - 不区分帖子/评论，按时间倒序
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
         """
         ...
 
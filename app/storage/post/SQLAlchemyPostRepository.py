@@ -1,12 +1,13 @@
-from typing import List, Optional
-from datetime import datetime, timezone, timedelta
+from typing import Iterator, List, Optional, Sequence, Tuple
+from datetime import timedelta
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, joinedload, raiseload
 
 from app.models.post import Post, PostReviewStatus, PostPublishStatus, PostVisibility
 from app.models.post_content import PostContent
 from app.models.post_stats import PostStats
 from app.models.user import User
+from app.models.feed_item import FeedItem
 
 from app.schemas.post import (
     PostOnlyCreate,
@@ -18,20 +19,40 @@ from app.schemas.post import (
     BatchPostsReviewOut,
     PostGet,
     PostAdminOut,
-    BatchPostsAdminOut
+    BatchPostsAdminOut,
+    BatchFeedOut,
+    POST_OUT_LIST_TA,
+    POST_REVIEW_OUT_LIST_TA,
+    FEED_ITEM_OUT_LIST_TA,
 )
 
-from sqlalchemy import desc, func
-from app.core.time import now_utc8
+from sqlalchemy import delete, desc, exists, func, select
+from app.schemas.types import dataclass_payload
+from app.core.time import now_utc, to_db_utc
 
 from app.core.exceptions import ForbiddenAction
 from app.storage.post.post_interface import IPostRepository
 from app.core.db import transaction
+from app.core.pagination import id_keyset_filter, next_id_cursor_of, count_total
 
 from app.core.logx import logger
 
-# 东八区时区（如果你希望 deleted_at / reviewed_at 使用东八区时间）
-CN_TZ = timezone(timedelta(hours=8))
+
+# 需要返回帖子正文的查询统一带上它：批量加载内容，并取回 deferred 的 content 列
+_POST_WITH_BODY = selectinload(Post.post_content).undefer_group("body")
+# 按 pid 取单条详情时改用 JOIN：内容、统计都是一对一，和帖子一条 SQL 取回，省掉两次 selectin 往返
+_POST_DETAIL = (joinedload(Post.post_content).undefer_group("body"), joinedload(Post.post_stats))
+
+# 管理员流式列表每批从数据库游标取的行数
+ADMIN_STREAM_BATCH_SIZE = 200
+
+# 「对他人可见」的帖子条件：未软删 + 已发布 + 审核通过 + 公开；点赞等其它仓库做存在性校验时复用
+POST_VIEWER_FILTERS = (
+    Post.deleted_at.is_(None),
+    Post.publish_status == PostPublishStatus.PUBLISHED.value,
+    Post.review_status == PostReviewStatus.APPROVED.value,
+    Post.visibility == PostVisibility.PUBLIC.value,
+)
 
 
 class SQLAlchemyPostRepository(IPostRepository):
@@ -45,7 +66,11 @@ class SQLAlchemyPostRepository(IPostRepository):
 
     # ---------- 内部基础查询 ----------
     
-    def _viewer_query(self):
+    def _post_load(self, detail: bool):
+        """列表用 selectin 批量加载；单条详情（detail=True）用 JOIN 一次取回"""
+        return _POST_DETAIL if detail else (_POST_WITH_BODY,)
+
+    def _viewer_query(self, detail: bool = False):
         """
         访客 / 其他用户查看帖子时使用：
         只返回「对他人可见」的帖子：
@@ -56,15 +81,11 @@ class SQLAlchemyPostRepository(IPostRepository):
         """
         return (
             self.db.query(Post)
-            .filter(
-                Post.deleted_at.is_(None),
-                Post.publish_status == PostPublishStatus.PUBLISHED.value,
-                Post.review_status == PostReviewStatus.APPROVED.value,
-                Post.visibility == PostVisibility.PUBLIC.value,
-            )
+            .options(*self._post_load(detail))
+            .filter(*POST_VIEWER_FILTERS)
         )
 
-    def _author_query(self, author_id: str):
+    def _author_query(self, author_id: str, detail: bool = False):
         """
         作者自己查看自己的帖子：
         - 未软删
@@ -72,17 +93,17 @@ class SQLAlchemyPostRepository(IPostRepository):
         - 不限制 review_status（待审/拒绝也能看）
         - 不限制 visibility（仅作者可见当然可以看到）
         """
-        return (self.db.query(Post).filter(Post.deleted_at.is_(None),
-                                          Post.author_id == author_id,))
+        return (self.db.query(Post).options(*self._post_load(detail))
+                .filter(Post.deleted_at.is_(None), Post.author_id == author_id,))
     
     # 审核员审核帖子
-    def _review_query(self):
+    def _review_query(self, detail: bool = False):
         """
         审核相关查询：
         - 只过滤软删除, 发布状态
         - 不过滤审核状态（PENDING/APPROVED/REJECTED 都查得到）
         """
-        return (self.db.query(Post).filter(Post.deleted_at.is_(None),
+        return (self.db.query(Post).options(*self._post_load(detail)).filter(Post.deleted_at.is_(None),
                 Post.publish_status == PostPublishStatus.PUBLISHED.value,))
 
     # ---------- 创建 ----------
@@ -93,7 +114,7 @@ class SQLAlchemyPostRepository(IPostRepository):
         - 不处理内容表和统计表
         - 返回新帖子的 pid
         """
-        payload = data.model_dump(exclude_none=True)
+        payload = dataclass_payload(data, exclude_none=True)
         post = Post(**payload)
 
         with transaction(self.db):
@@ -115,7 +136,7 @@ class SQLAlchemyPostRepository(IPostRepository):
           如果可能为空，可以改成 Optional 字段并做判空处理
         """
         post: Post = (
-            self._viewer_query()
+            self._viewer_query(detail=True)
             .filter(Post.pid == pid)
             .first()
         )
@@ -133,7 +154,7 @@ class SQLAlchemyPostRepository(IPostRepository):
           如果可能为空，可以改成 Optional 字段并做判空处理
         """
         post: Post = (
-            self._author_query(author_id)
+            self._author_query(author_id, detail=True)
             .filter(Post.pid == pid)
             .first()
         )
@@ -143,34 +164,73 @@ class SQLAlchemyPostRepository(IPostRepository):
         return PostOut.model_validate(post)
 
     # 在首页推荐出现的帖子，是访客查询
-    def get_batch_posts(self, page: int, page_size: int) -> BatchPostsOut:
+    def get_batch_posts(self, page: int, page_size: int, cursor: Optional[str] = None) -> BatchPostsOut:
         """
         分页获取帖子列表：
         - 当前实现：按 _id 倒序（你也可以改成 created_at）
-        - 通过 relationship 访问内容和统计（会触发懒加载）
-          如果后面有性能问题，可以再加 joinedload 优化
+        - 内容和统计通过 selectinload 各用一次 IN 查询批量加载
+        - 其余关系一律 raiseload：首页列表不应该再触发额外的懒加载
         """
         base_q = self._viewer_query().order_by(Post._id.desc())
 
         total = base_q.count()
+
+        # 传了 cursor 就从游标位置接着读，否则退回 OFFSET 分页；都多取一行判断是否还有下一页
+        if cursor:
+            page_q = base_q.filter(id_keyset_filter(Post._id, cursor, descending=True))
+        else:
+            page_q = base_q.offset(page * page_size)
         posts: List[Post] = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
+            page_q
+            .options(
+                _POST_WITH_BODY,
+                selectinload(Post.post_stats),
+                raiseload("*"),
+            )
+            .limit(page_size + 1)
             .all()
         )
+        next_cursor = next_id_cursor_of(posts, page_size)
 
-        items: List[PostOut] = []
-        items = [PostOut.model_validate(post) for post in posts]
+        items = POST_OUT_LIST_TA.validate_python(posts)
 
-        return BatchPostsOut(
+        return BatchPostsOut.model_construct(
             total=total,
             count=len(items),
             items=items,
+            next_cursor=next_cursor,
         )
     
+    # 首页信息流：单表范围扫描，不再关联内容 / 统计表
+    def get_feed(self, page: int, page_size: int, cursor: Optional[str] = None) -> BatchFeedOut:
+        """
+        分页获取首页信息流：
+        - feed_items 由触发器维护，只含可见帖子，无需再拼可见性条件
+        - 按 post_seq（即 posts._id）倒序，走 idx_feed_items_post_seq
+        """
+        base_q = self.db.query(FeedItem)
+
+        total = base_q.count()
+
+        page_q = base_q.order_by(FeedItem.post_seq.desc())
+        if cursor:
+            page_q = page_q.filter(id_keyset_filter(FeedItem.post_seq, cursor, descending=True))
+        else:
+            page_q = page_q.offset(page * page_size)
+        rows: List[FeedItem] = page_q.limit(page_size + 1).all()
+        next_cursor = next_id_cursor_of(rows, page_size, id_of=lambda row: row.post_seq)
+
+        items = FEED_ITEM_OUT_LIST_TA.validate_python(rows)
+
+        return BatchFeedOut.model_construct(
+            total=total,
+            count=len(items),
+            items=items,
+            next_cursor=next_cursor,
+        )
+
     # 通过作者id查看帖子，需要编写两种接口，一种是作者本人查询，一种是访客查询
-    def get_posts_by_author(self, data: PostGet, page: int, page_size: int,) -> BatchPostsOut:
+    def get_posts_by_author(self, data: PostGet, page: int, page_size: int, cursor: Optional[str] = None,) -> BatchPostsOut:
         # 作者本人访问自己的帖子
         if data.current_user_id == data.author_id:
             base_q = (self._author_query(data.author_id)
@@ -185,17 +245,16 @@ class SQLAlchemyPostRepository(IPostRepository):
 
         total = base_q.count()
 
-        posts = (
-            base_q
-            .offset(page * page_size)
-            .limit(page_size)
-            .all()
-        )
+        if cursor:
+            page_q = base_q.filter(id_keyset_filter(Post._id, cursor, descending=True))
+        else:
+            page_q = base_q.offset(page * page_size)
+        posts = page_q.limit(page_size + 1).all()
+        next_cursor = next_id_cursor_of(posts, page_size)
 
-        items = []
-        items = [PostOut.model_validate(post) for post in posts]
+        items = POST_OUT_LIST_TA.validate_python(posts)
 
-        return BatchPostsOut(total=total, count=len(items), items=items)
+        return BatchPostsOut.model_construct(total=total, count=len(items), items=items, next_cursor=next_cursor)
 
     def update_post(self, pid: str, data: PostUpdate) -> bool:
         """
@@ -229,19 +288,20 @@ class SQLAlchemyPostRepository(IPostRepository):
     def soft_delete_post(self, pid: str) -> bool:
         """
         软删除：打 deleted_at 时间戳
+        - 一条 UPDATE ... WHERE pid = ? AND deleted_at IS NULL，受影响行数即结果，不先查再改
+        - 帖子不存在 / 已软删都返回 False，需要区分时再调 post_exists
         """
-        post: Optional[Post] = (
-            self.db.query(Post)
-            .filter((Post.pid == pid), Post.deleted_at.is_(None))
-            .first()
-        )
-        if not post:
-            return False
-
         with transaction(self.db):
-            post.deleted_at = datetime.now(CN_TZ)
+            updated = (
+                self.db.query(Post)
+                .filter(Post.pid == pid, Post.deleted_at.is_(None))
+                .update({Post.deleted_at: now_utc()}, synchronize_session=False)
+            )
+        return bool(updated)
 
-        return True
+    def post_exists(self, pid: str) -> bool:
+        """帖子是否存在（含软删），只查主键索引，用于条件更新失败后区分原因"""
+        return bool(self.db.execute(select(exists().where(Post.pid == pid))).scalar())
     
     
     # ---------- 审核员功能：查询帖子审核状态，更新审核状态（审核） ----------
@@ -251,7 +311,7 @@ class SQLAlchemyPostRepository(IPostRepository):
         查询帖子审核信息（附带内容）：
         - 用于审核列表 / 审核详情展示
         """
-        post: Post = (self._review_query().filter(Post.pid == pid).first())
+        post: Post = (self._review_query(detail=True).filter(Post.pid == pid).first())
         if not post:
             return None
         
@@ -273,15 +333,15 @@ class SQLAlchemyPostRepository(IPostRepository):
         total = base_q.count()
         posts: List[Post] = (
             base_q
+            .options(raiseload(Post.post_stats))   # PostReviewOut 不含统计，省掉一次 selectin 查询
             .offset(page * page_size)   # page 从 0 开始
             .limit(page_size)
             .all()
         )
 
-        items: List[PostReviewOut] = []
-        items = [PostReviewOut.model_validate(post) for post in posts]
+        items = POST_REVIEW_OUT_LIST_TA.validate_python(posts)
 
-        return BatchPostsReviewOut(total=total, count=len(items), items=items,)
+        return BatchPostsReviewOut.model_construct(total=total, count=len(items), items=items,)
     
     # 查看所有待审核帖子
     def list_pending_review_posts(self, page: int, page_size: int,) -> BatchPostsReviewOut:
@@ -298,39 +358,42 @@ class SQLAlchemyPostRepository(IPostRepository):
         total = base_q.count()
         posts: List[Post] = (
             base_q
+            .options(raiseload(Post.post_stats))
             .offset(page * page_size)
             .limit(page_size)
             .all()
         )
 
-        items: List[PostReviewOut] = []
-        items = [PostReviewOut.model_validate(post) for post in posts]
+        items = POST_REVIEW_OUT_LIST_TA.validate_python(posts)
 
-        return BatchPostsReviewOut(total=total, count=len(items), items=items,)
+        return BatchPostsReviewOut.model_construct(total=total, count=len(items), items=items,)
 
     # 审核帖子
-    def update_review(self, pid: str, data: PostReviewUpdate) -> bool:
+    def update_review(
+        self,
+        pid: str,
+        data: PostReviewUpdate,
+        allowed_from: Optional[Sequence[PostReviewStatus]] = None,
+    ) -> bool:
         """
-        更新审核状态 / 审核时间
-        - 审核流程本身的业务约束建议在业务层控制
+        更新审核状态 / 审核时间：
+        - 一条 UPDATE ... WHERE pid = ? AND review_status IN (allowed_from)，不先 SELECT 再改
+        - allowed_from 为 None 时不限制原状态；流转规则由业务层决定后传进来
+        - 返回是否更新成功（帖子不存在 / 原状态不允许时都返回 False）
         """
-        post: Optional[Post] = (
-            self._review_query()
-            .filter(Post.pid == pid)
-            .first()
-        )
-        if not post:
-            return False
+        # 如果调用方没传 reviewed_at，则默认当前时间（统一按 UTC 入库）
+        reviewed_at = to_db_utc(data.reviewed_at) if data.reviewed_at is not None else now_utc()
 
-        with transaction(self.db):
-            post.review_status = data.review_status
-            # 如果调用方没传 reviewed_at，则默认当前东八区时间
-            if data.reviewed_at is not None:
-                post.reviewed_at = data.reviewed_at
-            else:
-                post.reviewed_at = datetime.now(CN_TZ)
+        q = self._review_query().filter(Post.pid == pid)
+        if allowed_from is not None:
+            q = q.filter(Post.review_status.in_([int(s) for s in allowed_from]))
 
-        return True
+        with transaction(self.db):
+            updated = q.update(
+                {Post.review_status: int(data.review_status), Post.reviewed_at: reviewed_at},
+                synchronize_session=False,
+            )
+        return bool(updated)
     
 
     # ---------- 管理员员功能：帖子查询（最高权限），帖子硬删除， ----------
@@ -342,6 +405,7 @@ class SQLAlchemyPostRepository(IPostRepository):
         """
         post: Optional[Post] = (
             self.db.query(Post)
+            .options(*_POST_DETAIL)
             .filter(Post.pid == pid)
             .first()
         )
@@ -350,93 +414,79 @@ class SQLAlchemyPostRepository(IPostRepository):
 
         return PostAdminOut.model_validate(post)
 
-    # 查看所有帖子（含软删）
-    def admin_list_all_posts(self, page: int, page_size: int) -> BatchPostsAdminOut:
-        base_q = (
-            self.db.query(Post)
-            .order_by(Post._id.desc())
-        )
-        total = base_q.count()
+    # 管理员列表的公共部分：含软删，按 _id 倒序
+    def _admin_list_query(self, deleted_only: bool = False, author_id: Optional[str] = None):
+        q = self.db.query(Post).options(_POST_WITH_BODY)
+        if deleted_only:
+            q = q.filter(Post.deleted_at.is_not(None))
+        if author_id is not None:
+            q = q.filter(Post.author_id == author_id)
+        return q.order_by(Post._id.desc())
+
+    def admin_iter_posts(
+        self,
+        page: int,
+        page_size: int,
+        deleted_only: bool = False,
+        author_id: Optional[str] = None,
+    ) -> Tuple[int, Iterator[PostAdminOut]]:
+        """
+        管理员分页列表的流式版本：返回 (total, 逐条产出 PostAdminOut 的迭代器)
+        - yield_per 按批从游标取行，内容 / 统计按批 selectin，已产出的行不在内存里累积
+        - 迭代器依赖当前会话，必须在请求结束（会话关闭）前消费完
+        """
+        base_q = self._admin_list_query(deleted_only=deleted_only, author_id=author_id)
+        total = count_total(base_q, Post._id)
 
-        posts = (base_q.offset(page * page_size).limit(page_size).all())
-
-        items: List[PostAdminOut] = []
-        items = [PostAdminOut.model_validate(post) for post in posts]
+        rows = (
+            base_q
+            .offset(page * page_size)
+            .limit(page_size)
+            .yield_per(ADMIN_STREAM_BATCH_SIZE)
+        )
+        return total, (PostAdminOut.model_validate(post) for post in rows)
 
+    def _admin_list(self, page: int, page_size: int, **filters) -> BatchPostsAdminOut:
+        total, rows = self.admin_iter_posts(page, page_size, **filters)
+        items: List[PostAdminOut] = list(rows)
         return BatchPostsAdminOut(total=total, count=len(items), items=items,)
 
+    # 查看所有帖子（含软删）
+    def admin_list_all_posts(self, page: int, page_size: int) -> BatchPostsAdminOut:
+        return self._admin_list(page, page_size)
+
     # 查看所有软删除帖子
     def admin_list_deleted_posts(self, page: int, page_size: int) -> BatchPostsAdminOut:
-        base_q = (
-            self.db.query(Post)
-            .filter(Post.deleted_at.is_not(None))
-            .order_by(Post._id.desc())
-        )
-        total = base_q.count()
-
-        posts = (base_q.offset(page * page_size).limit(page_size).all())
-
-        items: List[PostAdminOut] = []
-        items = [PostAdminOut.model_validate(post) for post in posts]
-
-        return BatchPostsAdminOut(total=total, count=len(items), items=items,)
+        return self._admin_list(page, page_size, deleted_only=True)
 
     # 通过作者 ID 查看所有帖子（含软删）
     def admin_list_posts_by_author(self, author_id: str, page: int, page_size: int) -> BatchPostsAdminOut:
-        base_q = (
-            self.db.query(Post)
-            .filter(Post.author_id == author_id)
-            .order_by(Post._id.desc())
-        )
-        total = base_q.count()
-
-        posts = (base_q.offset(page * page_size).limit(page_size).all())
-
-        items: List[PostAdminOut] = []
-        items = [PostAdminOut.model_validate(post) for post in posts]
-
-        return BatchPostsAdminOut(total=total, count=len(items), items=items,)
+        return self._admin_list(page, page_size, author_id=author_id)
 
     # 只有管理员才可以使用的帖子硬删除
     def hard_delete_post(self, pid: str) -> bool:
         """
         硬删除：直接从 posts 表删除
-        - 注意：关联的内容 / 统计 / 评论等，
-          推荐在业务层或外键级联 / relationship.cascade 中一并处理
+        - 内容 / 统计 / 评论（及评论内容）由外键 ON DELETE CASCADE 一并删除
         """
-        # 包括已软删的帖子
-        post: Optional[Post] = (
-            self.db.query(Post)
-            .filter(Post.pid == pid)
-            .first()
-        )
-        if not post:
-            return False
-
+        # 包括已软删的帖子；直接 DELETE，不先把帖子及其内容 / 统计加载进会话
         with transaction(self.db):
-            self.db.delete(post)
-
-        return True
+            deleted = self.db.execute(delete(Post).where(Post.pid == pid)).rowcount
+        return bool(deleted)
 
     def restore_post(self, pid: str) -> bool:
         """
         恢复帖子软删除：deleted_at → NULL
+        - 一条 UPDATE ... WHERE pid = ? AND deleted_at IS NOT NULL
+        - 帖子不存在 / 未软删都返回 False，需要区分时再调 post_exists
         """
-        post = (
-            self.db.query(Post)   # 管理员可见软删除
-            .filter(Post.pid == pid)
-            .first()
-        )
-        if not post:
-            return False
-
-        if post.deleted_at is None:
-            return False
-
         with transaction(self.db):
-            post.deleted_at = None
-
-        return True
+            updated = (
+                self.db.query(Post)   # 管理员可见软删除
+                .filter(Post.pid == pid, Post.deleted_at.is_not(None))
+                .update({Post.deleted_at: None}, synchronize_session=False)
+            )
+        return bool(updated)
 
     #----------------------------------- 热榜用 ----------------------------------------
     def get_top_liked_posts(self, limit: int = 10, since_days: int = 7) -> list[dict]:
@@ -445,7 +495,7 @@ class SQLAlchemyPostRepository(IPostRepository):
         TODO: Implement this method with joins
         """
 
-        cutoff_time = now_utc8() - datetime.timedelta(days=since_days)
+        cutoff_time = now_utc() - timedelta(days=since_days)
 
         rows = (
             self.db.query(
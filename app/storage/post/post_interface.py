@@ -1,7 +1,8 @@
 # app/storage/post/post_interface.py
 
-from typing import Optional, Protocol
+from typing import Iterator, Optional, Protocol, Sequence, Tuple
 
+from app.models.post import PostReviewStatus
 from app.schemas.post import (
     PostOnlyCreate,
     PostOut,
@@ -13,6 +14,7 @@ from app.schemas.post import (
     PostAdminOut,
     BatchPostsAdminOut,
     PostGet,
+    BatchFeedOut,
 )
 
 
@@ -61,19 +63,30 @@ class IPostRepository(Protocol):
         """
         ...
 
-    def get_batch_posts(self, page: int, page_size: int) -> BatchPostsOut:
+    def get_batch_posts(self, page: int, page_size: int, cursor: Optional[str] = None) -> BatchPostsOut:
         """
         分页获取帖子列表（通常为公开帖子）
         - 当前实现：只过滤 deleted_at IS NULL，其它条件由业务层控制或后续扩展
         - page: 页码（建议从 0 开始）
         - page_size: 每页数量
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
         """
         ...
     
-    def get_posts_by_author(self, data: PostGet, page: int, page_size: int,) -> BatchPostsOut:
+    def get_feed(self, page: int, page_size: int, cursor: Optional[str] = None) -> BatchFeedOut:
+        """
+        分页获取首页信息流（读 feed_items 物化表）
+        - 只包含对他人可见的帖子，顺序与 get_batch_posts 一致
+        - 每条只有卡片字段（标题 + 计数），不含正文
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
+        """
+        ...
+
+    def get_posts_by_author(self, data: PostGet, page: int, page_size: int, cursor: Optional[str] = None,) -> BatchPostsOut:
         """
         根据作者 ID 分页获取该作者的帖子列表
         - 响应体为 BatchPostsOut
+        - cursor: 上一页返回的 next_cursor，传了就按游标分页（忽略 page）
         """
         ...
 
@@ -84,20 +97,30 @@ class IPostRepository(Protocol):
         """
         ...
 
-    def update_review(self, pid: str, data: PostReviewUpdate) -> bool:
+    def update_review(
+        self,
+        pid: str,
+        data: PostReviewUpdate,
+        allowed_from: Optional[Sequence[PostReviewStatus]] = None,
+    ) -> bool:
         """
         审核员 / 管理员更新帖子审核状态
-        - 返回是否更新成功
+        - allowed_from：只有当前审核状态在其中时才更新（条件更新，一条语句完成），None 表示不限制
+        - 返回是否更新成功（帖子不存在 / 当前状态不允许时都为 False）
         """
         ...
 
     def soft_delete_post(self, pid: str) -> bool:
         """
         软删除帖子（设置 deleted_at）
-        - 返回是否操作成功
+        - 返回是否操作成功（帖子不存在 / 已软删时为 False）
         """
         ...
 
+    def post_exists(self, pid: str) -> bool:
+        """帖子是否存在（含软删），用于条件更新 / 删除失败后区分“不存在”和“状态不符”"""
+        ...
+
     #----------------------------------- 管理员用 ----------------------------------------
     def hard_delete_post(self, pid: str) -> bool:
         """
@@ -106,6 +129,13 @@ class IPostRepository(Protocol):
         - 返回是否删除成功
         """
         ...
+
+    def restore_post(self, pid: str) -> bool:
+        """
+        恢复软删除的帖子（deleted_at 置 NULL）
+        - 返回是否恢复成功（帖子不存在 / 未软删时为 False）
+        """
+        ...
     
     # 通过帖子id获取帖子信息
     def admin_get_post_by_pid(self, pid: str) -> Optional[PostAdminOut]:
@@ -115,6 +145,21 @@ class IPostRepository(Protocol):
         """
         ...
     
+    # 管理员分页列表的流式版本
+    def admin_iter_posts(
+        self,
+        page: int,
+        page_size: int,
+        deleted_only: bool = False,
+        author_id: Optional[str] = None,
+    ) -> Tuple[int, Iterator[PostAdminOut]]:
+        """
+        管理员分页列表（含软删）的流式版本：
+        - 返回 (total, 逐条产出 PostAdminOut 的迭代器)，供接口层边查边写响应
+        - deleted_only: 只看软删除帖子；author_id: 只看该作者的帖子
+        """
+        ...
+
     # 查看所有帖子（含软删）
     def admin_list_all_posts(self, page: int, page_size: int) -> BatchPostsAdminOut:
         ...
@@ -1,7 +1,7 @@
 # app/storage/post_content/SQLAlchemyPostContentRepository.py
 
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.models.post_content import PostContent
 from app.schemas.post_content import (
@@ -11,6 +11,7 @@ from app.schemas.post_content import (
     BatchPostContentsOut,
 )
 from app.storage.post_content.post_content_interface import IPostContentRepository
+from app.schemas.types import dataclass_payload
 from app.core.db import transaction
 
 
@@ -24,8 +25,8 @@ class SQLAlchemyPostContentRepository(IPostContentRepository):
         self.db = db
 
     def _base_query(self):
-        """内部基础查询入口（目前没有软删除字段，预留封装）"""
-        return self.db.query(PostContent)
+        """内部基础查询入口（目前没有软删除字段，预留封装）；这里的返回值都带正文，取回 deferred 的 content"""
+        return self.db.query(PostContent).options(undefer_group("body"))
 
     def get_by_pcid(self, pcid: str) -> Optional[PostContentOut]:
         orm_obj = self._base_query().filter(PostContent.pcid == pcid).first()
@@ -66,7 +67,7 @@ class SQLAlchemyPostContentRepository(IPostContentRepository):
         """
         创建帖子内容
         """
-        payload = data.model_dump(exclude_none=True)
+        payload = dataclass_payload(data, exclude_none=True)
         orm_obj = PostContent(**payload)
 
         with transaction(self.db):
@@ -83,7 +84,7 @@ class SQLAlchemyPostContentRepository(IPostContentRepository):
         if not orm_obj:
             return None
 
-        update_data = data.model_dump(exclude_none=True)
+        update_data = dataclass_payload(data, exclude_none=True)
         if not update_data:
             # 没有任何需要更新的字段，直接返回当前结果
             return PostContentOut.model_validate(orm_obj)
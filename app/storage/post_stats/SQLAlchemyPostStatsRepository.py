@@ -1,9 +1,14 @@
 # app/storage/post_stats/SQLAlchemyPostStatsRepository.py
 
-from typing import Optional
+import zlib
+from collections import defaultdict
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from app.models.post_stats import PostStats
+from app.models.post_like_shard import PostLikeCounterShard, POST_LIKE_SHARD_COUNT
 from app.schemas.post_stats import (
     PostStatsCreate,
     PostStatsUpdate,
@@ -11,9 +16,22 @@ from app.schemas.post_stats import (
     BatchPostStatsOut,
 )
 from app.storage.post_stats.post_stats_interface import IPostStatsRepository
+from app.schemas.types import dataclass_payload
 from app.core.db import transaction
 
 
+# 分片增量语句只构造一次：分片行不存在就插入，存在就 delta = delta + 本次增量
+_like_shard_stmt = mysql_insert(PostLikeCounterShard)
+_like_shard_stmt = _like_shard_stmt.on_duplicate_key_update(
+    delta=PostLikeCounterShard.delta + _like_shard_stmt.inserted.delta,
+)
+
+
+def _like_shard_of(user_id: str) -> int:
+    """按 user_id 的 crc32 取模选分片，同一用户的点赞 / 取消总落在同一分片"""
+    return zlib.crc32(user_id.encode()) % POST_LIKE_SHARD_COUNT
+
+
 class SQLAlchemyPostStatsRepository(IPostStatsRepository):
     """
     使用 SQLAlchemy 实现的帖子统计仓库
@@ -66,7 +84,7 @@ class SQLAlchemyPostStatsRepository(IPostStatsRepository):
         """
         直接按传入数据创建统计记录
         """
-        payload = data.model_dump(exclude_none=True)
+        payload = dataclass_payload(data, exclude_none=True)
         orm_obj = PostStats(**payload)
 
         with transaction(self.db):
@@ -103,7 +121,7 @@ class SQLAlchemyPostStatsRepository(IPostStatsRepository):
         if stats is None:
             return None
 
-        update_data = data.model_dump(exclude_none=True)
+        update_data = dataclass_payload(data, exclude_none=True)
         if not update_data:
             # 没有任何需要更新的字段
             return PostStatsOut.model_validate(stats)
@@ -115,55 +133,104 @@ class SQLAlchemyPostStatsRepository(IPostStatsRepository):
         self.db.refresh(stats)
         return PostStatsOut.model_validate(stats)
 
-    def update_likes(self, post_id: str, step: int = 1) -> PostStatsOut:
+    def _incr_counter(self, post_id: str, column, step: int) -> PostStatsOut:
         """
-        点赞数自增/自减，限制不小于 0
+        计数器原子自增/自减，限制不小于 0：
+        - 直接执行 UPDATE ... SET col = GREATEST(col + step, 0)，由数据库行锁保证并发安全
+        - 不再先 SELECT 再在 Python 里加减（热门帖子并发点赞时会丢失更新）
+        - 统计记录不存在时补建一条
         """
-        stats = self._get_stats_orm_by_post_id(post_id)
-        if stats is None:
-            # 如果希望在第一次点赞时自动创建统计记录，可以：
-            stats = PostStats(
-                post_id=post_id,
-                like_count=0,
-                comment_count=0,
+        with transaction(self.db):
+            updated = (
+                self._base_query()
+                .filter(PostStats.post_id == post_id)
+                .update(
+                    {column: func.greatest(column + step, 0)},
+                    synchronize_session=False,
+                )
             )
-            with transaction(self.db):
+            if not updated:
+                stats = PostStats(post_id=post_id, like_count=0, comment_count=0)
+                setattr(stats, column.key, max(step, 0))
                 self.db.add(stats)
-            self.db.refresh(stats)
 
-        new_value = stats.like_count + step
-        stats.like_count = max(new_value, 0)
+        return PostStatsOut.model_validate(self._get_stats_orm_by_post_id(post_id))
 
-        with transaction(self.db):
-            # 已在 stats 上修改，transaction 结束时会 flush/commit
-            pass
-
-        self.db.refresh(stats)
-        return PostStatsOut.model_validate(stats)
+    def update_likes(self, post_id: str, step: int = 1) -> PostStatsOut:
+        """
+        点赞数自增/自减，限制不小于 0
+        """
+        return self._incr_counter(post_id, PostStats.like_count, step)
 
-    def update_comments(self, post_id: str, step: int = 1) -> PostStatsOut:
+    def add_like_delta(self, post_id: str, user_id: str, step: int = 1) -> None:
         """
-        评论数自增/自减，限制不小于 0
+        点赞数增量写入分片表，不直接更新 post_stats：
+        - 按 user_id 的 crc32 取模选分片，同一用户的点赞 / 取消总落在同一分片，增量能互相抵消
+        - 并发点赞分散到 16 行上，不再抢 post_stats 的同一把行锁
         """
-        stats = self._get_stats_orm_by_post_id(post_id)
-        if stats is None:
-            stats = PostStats(
-                post_id=post_id,
-                like_count=0,
-                comment_count=0,
-            )
-            with transaction(self.db):
-                self.db.add(stats)
-            self.db.refresh(stats)
+        shard_id = _like_shard_of(user_id)
+        with transaction(self.db):
+            self.db.execute(_like_shard_stmt, {"post_id": post_id, "shard_id": shard_id, "delta": step})
 
-        new_value = stats.comment_count + step
-        stats.comment_count = max(new_value, 0)
+    def add_like_deltas(self, deltas: List[Tuple[str, str, int]]) -> None:
+        """
+        批量点赞 / 取消的分片增量：
+        - 按 (post_id, shard_id) 合并后一条多行 INSERT ... ON DUPLICATE KEY UPDATE，一次提交
+        - 合并后为 0 的分片不写
+        """
+        totals = defaultdict(int)
+        for post_id, user_id, step in deltas:
+            totals[(post_id, _like_shard_of(user_id))] += step
+
+        params = [
+            {"post_id": post_id, "shard_id": shard_id, "delta": step}
+            for (post_id, shard_id), step in totals.items()
+            if step
+        ]
+        if not params:
+            return
+        with transaction(self.db):
+            self.db.execute(_like_shard_stmt, params)
 
+    def flush_like_shards(self, limit: int = 1000) -> int:
+        """
+        把分片表里的点赞增量汇总进 post_stats.like_count：
+        - SKIP LOCKED：正在被点赞请求占用的分片行跳过，下一轮再汇总，不和点赞互相等待
+        - 在同一事务里给 post_stats 加上增量（不小于 0）并把对应分片扣减掉，不会重复或丢失
+        - 返回本次处理的帖子数
+        """
         with transaction(self.db):
-            pass
+            shards = (
+                self.db.query(PostLikeCounterShard)
+                .filter(PostLikeCounterShard.delta != 0)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            totals = defaultdict(int)
+            for shard in shards:
+                totals[shard.post_id] += shard.delta
+                shard.delta = 0
+
+            for post_id, step in totals.items():
+                updated = (
+                    self._base_query()
+                    .filter(PostStats.post_id == post_id)
+                    .update(
+                        {PostStats.like_count: func.greatest(PostStats.like_count + step, 0)},
+                        synchronize_session=False,
+                    )
+                )
+                if not updated:
+                    self.db.add(PostStats(post_id=post_id, like_count=max(step, 0), comment_count=0))
+
+        return len(totals)
 
-        self.db.refresh(stats)
-        return PostStatsOut.model_validate(stats)
+    def update_comments(self, post_id: str, step: int = 1) -> PostStatsOut:
+        """
+        评论数自增/自减，限制不小于 0
+        """
+        return self._incr_counter(post_id, PostStats.comment_count, step)
 
 
     def delete_by_post_id(self, post_id: str) -> bool:
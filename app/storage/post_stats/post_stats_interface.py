@@ -1,6 +1,6 @@
 # app/storage/post_stats/post_stats_interface.py
 
-from typing import Optional, Protocol
+from typing import List, Optional, Protocol, Tuple
 
 from app.schemas.post_stats import (
     PostStatsCreate,
@@ -66,6 +66,27 @@ class IPostStatsRepository(Protocol):
         """
         ...
 
+    def add_like_delta(self, post_id: str, user_id: str, step: int = 1) -> None:
+        """
+        点赞数增量写入分片计数（热门帖子并发点赞时不争抢 post_stats 同一行）：
+        - 由 flush_like_shards 定期汇总进 like_count
+        """
+        ...
+
+    def add_like_deltas(self, deltas: List[Tuple[str, str, int]]) -> None:
+        """
+        批量写入点赞分片增量，deltas 为 (post_id, user_id, step)：
+        - 同一帖子同一分片的增量先在内存里合并，再一条多行语句写入
+        """
+        ...
+
+    def flush_like_shards(self, limit: int = 1000) -> int:
+        """
+        把分片计数的增量汇总进 post_stats.like_count 并清零分片
+        - 返回本次汇总的帖子数
+        """
+        ...
+
     def update_comments(self, post_id: str, step: int = 1) -> PostStatsOut:
         """
         评论数自增 / 自减：
@@ -1,5 +1,4 @@
-from typing import List, Optional
-from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.user import User, UserRole, UserStatus
 from app.schemas.user import ( 
@@ -11,12 +10,32 @@ from app.schemas.user import (
     UserUpdate,
     AdminUserUpdate,
     BatchUsersAllOut,
-
+    AuthorSnippetOut,
+    USER_OUT_LIST_TA,
+    USER_ALL_OUT_LIST_TA,
 )
 from app.storage.user.user_interface import IUserRepository
 from app.core.exceptions import UserNotFound
 from app.core.db import transaction
-from sqlalchemy import or_
+from app.core.time import now_utc
+from sqlalchemy import or_, select, exists
+
+# 正常用户条件：未软删 + 状态正常；点赞等其它仓库做存在性校验时复用
+USER_ACTIVE_FILTERS = (
+    User.deleted_at.is_(None),
+    User.status == UserStatus.NORMAL.value,
+)
+
+# 按 uid / phone 取单个用户的热点点查走纯 Core：直接查 users 表的列，不经过 ORM 编译 / 实体实例化 / identity map，
+# 结果行直接交给 Pydantic；列与 UserAllOut 字段一一对应（UserAllOut 为 extra="forbid"）
+# 注意条件也要用表列写，混入 User.xxx 这类 ORM 属性会让语句重新走 ORM 路径
+_users = User.__table__
+_USER_ALL_COLUMNS = tuple(_users.c[name] for name in UserAllOut.model_fields)
+_USER_ACTIVE_CORE_FILTERS = (
+    _users.c.deleted_at.is_(None),
+    _users.c.status == UserStatus.NORMAL.value,
+)
+
 class SQLAlchemyUserRepository(IUserRepository):
     """
     使用 SQLAlchemy 实现的用户仓库
@@ -28,14 +47,42 @@ class SQLAlchemyUserRepository(IUserRepository):
 
     def _base_query(self):
         """内部封装一个基础查询（过滤软删除和状态不正常的用户）"""
-        return self.db.query(User).filter(
-            User.deleted_at.is_(None),
-            User.status == 0,
-            )
+        return self.db.query(User).filter(*USER_ACTIVE_FILTERS)
+
+    def _get_active_row(self, *conditions):
+        """单用户点查：正常用户条件 + 额外条件，返回列元组（Row）或 None"""
+        stmt = select(*_USER_ALL_COLUMNS).where(*_USER_ACTIVE_CORE_FILTERS, *conditions).limit(1)
+        return self.db.execute(stmt).first()
 
     def get_user_by_uid(self, uid: str) -> Optional[UserAllOut]:
-        user = self._base_query().filter(User.uid == uid).first()
-        return UserAllOut.model_validate(user) if user else None
+        row = self._get_active_row(_users.c.uid == uid)
+        return UserAllOut.model_validate(row) if row else None
+
+    def check_users_active(self, *uids: str) -> Tuple[bool, ...]:
+        """
+        一次查询校验多个用户是否存在且正常：
+        - SELECT EXISTS(...), EXISTS(...)，每个 uid 一列，按传入顺序返回
+        - 只判断存在与否，不取用户列
+        """
+        if not uids:
+            return ()
+        checks = [exists().where(_users.c.uid == uid, *_USER_ACTIVE_CORE_FILTERS) for uid in uids]
+        return tuple(bool(ok) for ok in self.db.execute(select(*checks)).one())
+
+    def get_author_snippets(self, uids: List[str]) -> Dict[str, AuthorSnippetOut]:
+        """
+        批量获取作者精简信息：
+        - 只查 uid / username / avatar_url / role 四列，不构造 User 实体
+        - 一页里的作者合并成一次 uid IN (...) 查询
+        """
+        if not uids:
+            return {}
+        rows = (
+            self.db.query(User.uid, User.username, User.avatar_url, User.role)
+            .filter(User.deleted_at.is_(None), User.uid.in_(uids))
+            .all()
+        )
+        return {row.uid: AuthorSnippetOut.model_validate(row) for row in rows}
 
     def get_user_detail_by_uid(self, uid: str) -> Optional[UserDetailOut]:
         """
@@ -43,12 +90,12 @@ class SQLAlchemyUserRepository(IUserRepository):
         这里先按和 get_user_by_uid 一样的处理方式返回。
         将来你在 UserDetailOut 里加统计字段时，可以在这里做 join/聚合。
         """
-        user = self._base_query().filter(User.uid == uid).first()
-        return UserDetailOut.model_validate(user) if user else None
+        row = self._get_active_row(_users.c.uid == uid)
+        return UserDetailOut.model_validate(row) if row else None
 
     def get_user_by_phone(self, phone: str) -> Optional[UserOut]:
-        user = self._base_query().filter(User.phone == phone).first()
-        return UserOut.model_validate(user) if user else None
+        row = self._get_active_row(_users.c.phone == phone)
+        return UserOut.model_validate(row) if row else None
 
     def get_users_by_username(self, username: str, page: int, page_size: int) -> BatchUsersOut:
         """
@@ -69,9 +116,9 @@ class SQLAlchemyUserRepository(IUserRepository):
             .all()
         )
 
-        users_out = [UserOut.model_validate(u) for u in users_orm]
+        users_out = USER_OUT_LIST_TA.validate_python(users_orm)
 
-        return BatchUsersOut(
+        return BatchUsersOut.model_construct(
             total=total,
             count=len(users_out),
             users=users_out,
@@ -93,11 +140,11 @@ class SQLAlchemyUserRepository(IUserRepository):
             .all()
         )
 
-        # 把 ORM 对象转换为 Pydantic 模型
-        users_out = [UserOut.model_validate(u) for u in users_orm]
+        # 把 ORM 对象整页转换为 Pydantic 模型
+        users_out = USER_OUT_LIST_TA.validate_python(users_orm)
 
         # 返回 BatchUsersOut（业务层/接口层如需 dict，可调用 .model_dump()）
-        return BatchUsersOut(
+        return BatchUsersOut.model_construct(
             total=total,
             count=len(users_out),
             users=users_out,
@@ -136,7 +183,7 @@ class SQLAlchemyUserRepository(IUserRepository):
         with transaction(self.db):
             for field, value in update_data.items():
                 setattr(user, field, value)
-            user.updated_at = datetime.now(timezone(timedelta(hours=8)))
+            user.updated_at = now_utc()
 
         self.db.refresh(user)
         return UserOut.model_validate(user)
@@ -155,7 +202,7 @@ class SQLAlchemyUserRepository(IUserRepository):
         with transaction(self.db):
             for field, value in update_data.items():
                 setattr(user, field, value)
-            user.updated_at = datetime.utcnow()
+            user.updated_at = now_utc()
 
         self.db.refresh(user)
         return UserOut.model_validate(user)
@@ -171,7 +218,7 @@ class SQLAlchemyUserRepository(IUserRepository):
 
         with transaction(self.db):
             user.password = new_password_hash
-            user.updated_at = datetime.now(timezone(timedelta(hours=8)))
+            user.updated_at = now_utc()
 
         self.db.refresh(user)
         return True
@@ -186,7 +233,7 @@ class SQLAlchemyUserRepository(IUserRepository):
             raise UserNotFound(f"user {uid} not found")
 
         with transaction(self.db):
-            user.deleted_at = datetime.now(timezone(timedelta(hours=8)))
+            user.deleted_at = now_utc()
 
         return True
     
@@ -222,9 +269,9 @@ class SQLAlchemyUserRepository(IUserRepository):
             .all()
         )
 
-        items = [UserAllOut.model_validate(u) for u in users_orm]
+        items = USER_ALL_OUT_LIST_TA.validate_python(users_orm)
 
-        return BatchUsersAllOut(
+        return BatchUsersAllOut.model_construct(
             total=total,
             count=len(items),
             users=items,
@@ -250,9 +297,9 @@ class SQLAlchemyUserRepository(IUserRepository):
             .all()
         )
 
-        users_out = [UserAllOut.model_validate(u) for u in users_orm]
+        users_out = USER_ALL_OUT_LIST_TA.validate_python(users_orm)
 
-        return BatchUsersAllOut(
+        return BatchUsersAllOut.model_construct(
             total=total,
             count=len(users_out),
             users=users_out,
@@ -268,10 +315,9 @@ class SQLAlchemyUserRepository(IUserRepository):
 
         users = (base_q.offset(page * page_size).limit(page_size).all())
 
-        items: List[UserAllOut] = []
-        items = [UserAllOut.model_validate(user) for user in users]
+        items = USER_ALL_OUT_LIST_TA.validate_python(users)
 
-        return BatchUsersAllOut(total=total, count=len(items), users=items,)
+        return BatchUsersAllOut.model_construct(total=total, count=len(items), users=items,)
     
     def admin_list_abnormal_status_users(self, page: int, page_size: int) -> BatchUsersAllOut:
         base_q = (
@@ -284,7 +330,6 @@ class SQLAlchemyUserRepository(IUserRepository):
 
         users = (base_q.offset(page * page_size).limit(page_size).all())
 
-        items: List[UserAllOut] = []
-        items = [UserAllOut.model_validate(user) for user in users]
+        items = USER_ALL_OUT_LIST_TA.validate_python(users)
 
-        return BatchUsersAllOut(total=total, count=len(items), users=items,)
\ No newline at end of file
+        return BatchUsersAllOut.model_construct(total=total, count=len(items), users=items,)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional, Protocol
+from typing import Dict, List, Optional, Protocol, Tuple
 from datetime import datetime
 
 from app.schemas.user import (  
@@ -10,7 +10,8 @@ from app.schemas.user import (
     UserUpdate,
     AdminUserUpdate,
     BatchUsersAllOut,
-    UserAllOut
+    UserAllOut,
+    AuthorSnippetOut,
 )
 
 class IUserRepository(Protocol):
@@ -23,6 +24,14 @@ class IUserRepository(Protocol):
         """根据业务主键 uid 查询用户（已过滤软删除）"""
         ...
 
+    def check_users_active(self, *uids: str) -> Tuple[bool, ...]:
+        """一次查询校验多个用户是否存在且正常，按传入顺序返回每个 uid 的结果"""
+        ...
+
+    def get_author_snippets(self, uids: List[str]) -> Dict[str, AuthorSnippetOut]:
+        """批量获取作者精简信息：一次 IN 查询，只取展示需要的列；已删除或不存在的用户不在结果里"""
+        ...
+
     def get_user_detail_by_uid(self, uid: str) -> Optional[UserDetailOut]:
         """查询用户详情（预留聚合字段扩展，比如关注数/粉丝数/发帖数等）"""
         ...
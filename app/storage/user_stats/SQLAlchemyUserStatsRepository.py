@@ -1,6 +1,8 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from app.models.user_stats import UserStats
 from app.models.user import User
@@ -11,7 +13,9 @@ from app.schemas.user_stats import (
 )
 from app.schemas.user import UserOut
 from app.storage.user_stats.user_stats_interface import IUserStatsRepository
+from app.schemas.types import dataclass_payload
 from app.core.db import transaction 
+from app.core.time import now_utc
 
 class SQLAlchemyUserStatsRepository(IUserStatsRepository):
     """
@@ -87,7 +91,7 @@ class SQLAlchemyUserStatsRepository(IUserStatsRepository):
         if stats is None:
             return None
 
-        update_data = data.model_dump(exclude_none=True)
+        update_data = dataclass_payload(data, exclude_none=True)
 
         with transaction(self.db):
             for field, value in update_data.items():
@@ -122,6 +126,33 @@ class SQLAlchemyUserStatsRepository(IUserStatsRepository):
         self.db.refresh(stats)
         return UserStatsOut.model_validate(stats)
 
+    def apply_deltas(self, deltas: Dict[str, Tuple[int, int]]) -> int:
+        """
+        把一批累计的 (关注数增量, 粉丝数增量) 合并写入，整批一个事务：
+        - INSERT ... ON DUPLICATE KEY UPDATE col = GREATEST(col + delta, 0)
+        - 统计记录不存在时顺带补建
+        - 返回写入的用户数
+        """
+        if not deltas:
+            return 0
+
+        now = now_utc()
+        with transaction(self.db):
+            for user_id, (following_delta, followers_delta) in deltas.items():
+                stmt = mysql_insert(UserStats).values(
+                    user_id=user_id,
+                    following_count=max(following_delta, 0),
+                    followers_count=max(followers_delta, 0),
+                    updated_at=now,
+                ).on_duplicate_key_update(
+                    following_count=func.greatest(UserStats.following_count + following_delta, 0),
+                    followers_count=func.greatest(UserStats.followers_count + followers_delta, 0),
+                    updated_at=now,
+                )
+                self.db.execute(stmt)
+
+        return len(deltas)
+
     def delete_by_user_id(self, user_id: str) -> bool:
         """
         硬删除统计记录（一般在用户硬删除时调用）
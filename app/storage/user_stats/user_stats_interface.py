@@ -1,4 +1,4 @@
-from typing import Optional, Protocol
+from typing import Dict, Optional, Protocol, Tuple
 from datetime import datetime
 
 from app.schemas.user_stats import (
@@ -55,6 +55,14 @@ class IUserStatsRepository(Protocol):
         """
         ...
 
+    def apply_deltas(self, deltas: Dict[str, Tuple[int, int]]) -> int:
+        """
+        批量累加统计：deltas 为 user_id -> (following 增量, followers 增量)
+        - 结果不会小于 0；记录不存在时先创建
+        - 返回写入的用户数
+        """
+        ...
+
     def delete_by_user_id(self, user_id: str) -> bool:
         """
         删除指定用户的统计记录（一般配合用户硬删除使用）
@@ -1,17 +1,3 @@
-from fastapi import FastAPI
-from app.routers import users, follows, posts, comments, likes
-
-app = FastAPI(title="Forum Management System")
-
-# 注册路由
-app.include_router(users.users_router)
-app.include_router(follows.follows_router)
-app.include_router(posts.posts_router)
-app.include_router(comments.comments_router)
-app.include_router(likes.likes_router)
-
-# uvicorn main:app
-# uvicorn main:app --reload
-@app.get("/")
-def root():
-    return {"message": "Welcome to Forum Management System"}
\ No newline at end of file
+# 唯一的应用入口在 app/main.py（异常处理、计数回写后台任务、gzip 等都在那里注册）；
+# 这里只做转发，保证 uvicorn main:app 与 uvicorn app.main:app 跑的是同一个应用
+from app.main import app  # noqa: F401
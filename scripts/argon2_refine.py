@@ -0,0 +1,59 @@
+"""
+在当前机器上测量不同 Argon2 参数的哈希耗时，帮助选出合适的 ARGON2_T / ARGON2_M / ARGON2_P
+
+用法：
+    python3 scripts/argon2_refine.py [目标耗时毫秒，默认 100]
+
+输出耗时不超过目标值、且代价最高的一组参数（代价越高越安全）
+"""
+import sys
+import time
+
+from argon2 import PasswordHasher, Type
+
+TIME_COSTS = [1, 2, 3, 4]
+MEMORY_COSTS = [19456, 32768, 47104, 65536]  # KiB
+PARALLELISM = [1, 2]
+ROUNDS = 5
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int) -> float:
+    """返回单次哈希的平均耗时（毫秒）"""
+    hasher = PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        hash_len=32,
+        type=Type.ID,
+    )
+    hasher.hash("x")  # 预热
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        hasher.hash("x")
+    return (time.perf_counter() - start) * 1000 / ROUNDS
+
+
+def refine(target_ms: float):
+    best = None
+    for p in PARALLELISM:
+        for m in MEMORY_COSTS:
+            for t in TIME_COSTS:
+                cost_ms = measure(t, m, p)
+                print(f"t={t} m={m} p={p}: {cost_ms:.1f} ms")
+                if cost_ms > target_ms:
+                    break
+                # 在预算内优先选择 t*m 更大的组合
+                if best is None or t * m > best[0] * best[1]:
+                    best = (t, m, p, cost_ms)
+    return best
+
+
+if __name__ == "__main__":
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 100.0
+    best = refine(target)
+    if best is None:
+        print(f"没有参数组合能在 {target} ms 内完成，请放宽目标耗时")
+        sys.exit(1)
+    t, m, p, cost_ms = best
+    print(f"\n推荐参数（{cost_ms:.1f} ms）:")
+    print(f"ARGON2_T={t} ARGON2_M={m} ARGON2_P={p}")
@@ -5,7 +5,7 @@ USE forumhub;
 -- 1. 创建用户表
 CREATE TABLE IF NOT EXISTS users (
     _id INT AUTO_INCREMENT PRIMARY KEY,        -- 系统主键 ID
-    uid VARCHAR(36) UNIQUE,                   -- 用户的业务主键（UUID）
+    uid BINARY(16) UNIQUE DEFAULT (UUID_TO_BIN(UUID(), 1)),  -- 用户的业务主键（时间有序 UUID，由数据库生成）
     username VARCHAR(100) NOT NULL,           -- 用户昵称
     role SMALLINT DEFAULT 0,                  -- 用户角色（0: 普通用户，1: 审核员，2: 管理员）
     status SMALLINT DEFAULT 0,                -- 用户状态（0: 正常，1: 封禁，2: 冻结）
@@ -18,7 +18,9 @@ CREATE TABLE IF NOT EXISTS users (
     last_login_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- 最后登录时间
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,    -- 创建时间
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,    -- 更新时间
-    deleted_at TIMESTAMP NULL                 -- 软删除时间戳
+    deleted_at TIMESTAMP NULL,                -- 软删除时间戳
+
+    INDEX idx_users_deleted_created (deleted_at, created_at)  -- 未删除用户按注册时间列表 / 已删除用户列表
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
@@ -26,14 +28,13 @@ CREATE TABLE IF NOT EXISTS users (
 -- 创建表时直接内嵌索引
 CREATE TABLE IF NOT EXISTS user_stats (
     _id INT AUTO_INCREMENT PRIMARY KEY,          -- 系统主键（自增）
-    user_id VARCHAR(36) NOT NULL,               -- 用户 ID (FK -> users.uid)
+    user_id BINARY(16)  NOT NULL,               -- 用户 ID (FK -> users.uid)
     following_count INT DEFAULT 0,              -- 用户的关注数
     followers_count INT DEFAULT 0,              -- 用户的粉丝数
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 更新时间
     
     CONSTRAINT fk_user_stats_user FOREIGN KEY (user_id) REFERENCES users(uid),  -- 外键：关联用户表
-    UNIQUE (user_id),   -- 保证每个用户只有一条记录
-    INDEX idx_user_stats_user_id (user_id)
+    UNIQUE (user_id)    -- 保证每个用户只有一条记录（同时充当按 user_id 查询的索引）
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
@@ -41,24 +42,24 @@ CREATE TABLE IF NOT EXISTS user_stats (
 -- 3. 创建关注表
 CREATE TABLE IF NOT EXISTS follows (
     _id INT AUTO_INCREMENT PRIMARY KEY,              -- 系统主键（自增）
-    user_id VARCHAR(36) NOT NULL,                    -- 关注者ID (FK -> users.uid)
-    followed_user_id VARCHAR(36) NOT NULL,           -- 被关注者ID (FK -> users.uid)
+    user_id BINARY(16)  NOT NULL,                    -- 关注者ID (FK -> users.uid)
+    followed_user_id BINARY(16)  NOT NULL,           -- 被关注者ID (FK -> users.uid)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- 创建时间
     deleted_at TIMESTAMP NULL,                       -- 软删除时间戳（用于取消关注）
 
     CONSTRAINT fk_follow_user FOREIGN KEY (user_id) REFERENCES users(uid),            -- 外键：关注者
     CONSTRAINT fk_followed_user FOREIGN KEY (followed_user_id) REFERENCES users(uid), -- 外键：被关注者
     CONSTRAINT uq_user_follow UNIQUE (user_id, followed_user_id),    -- 联合唯一约束：防止用户重复关注
-    INDEX idx_follow_user (user_id),
-    INDEX idx_followed_user (followed_user_id)
+    INDEX idx_follow_user (user_id, deleted_at, created_at),
+    INDEX idx_followed_user (followed_user_id, deleted_at, created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
 -- 4. 创建帖子表
 CREATE TABLE IF NOT EXISTS posts (
     _id INT AUTO_INCREMENT PRIMARY KEY,           -- 系统主键ID（自增）
-    pid VARCHAR(36) UNIQUE,                       -- 业务主键PID（UUID）
-    author_id VARCHAR(36) NOT NULL,               -- 作者 ID (Fk->users.uid)
+    pid BINARY(16)  UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键PID（UUID，由数据库生成）
+    author_id BINARY(16)  NOT NULL,               -- 作者 ID (Fk->users.uid)
     visibility SMALLINT DEFAULT 0,                -- 可见性（0:公开, 1:仅作者）
     publish_status SMALLINT DEFAULT 1,            -- 发布状态（0:草稿, 1:发布）
     review_status SMALLINT DEFAULT 0,             -- 审核状态（0:待审, 1:通过, 2:拒绝）
@@ -66,45 +67,57 @@ CREATE TABLE IF NOT EXISTS posts (
     deleted_at TIMESTAMP NULL,                    -- 软删除时间戳
 
     FOREIGN KEY (author_id) REFERENCES users(uid),   -- 外键关联到用户表
-    INDEX idx_posts_author_id (author_id),
-    INDEX idx_posts_visibility_review_status (visibility, review_status),
-    INDEX idx_posts_author_visibility (author_id, visibility)
+    CONSTRAINT ck_posts_review_status CHECK (review_status IN (0, 1, 2)),  -- 审核状态只能是三种取值之一
+    INDEX idx_posts_author_id (author_id, deleted_at),
+    INDEX idx_posts_visibility_review_status (visibility, review_status, deleted_at),
+    INDEX idx_posts_author_visibility (author_id, visibility, deleted_at),
+    INDEX idx_posts_deleted_at (deleted_at),
+    INDEX idx_posts_review_status (review_status, deleted_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
 -- 5. 创建帖子内容表
 CREATE TABLE IF NOT EXISTS post_contents (
     _id INT AUTO_INCREMENT PRIMARY KEY,           -- 系统主键（自增）
-    pcid VARCHAR(36) UNIQUE,                      -- 业务主键PID（UUID）
-    post_id VARCHAR(36) NOT NULL UNIQUE,          -- 帖子 ID (FK -> posts.pid)
-    title VARCHAR(255) NOT NULL,                  -- 帖子标题
+    pcid BINARY(16)  UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+    post_id BINARY(16)  NOT NULL UNIQUE,          -- 帖子 ID (FK -> posts.pid)
+    title VARCHAR(160) NOT NULL,                  -- 帖子标题
     content TEXT NOT NULL,                        -- 帖子内容
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,    -- 创建时间
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,    -- 更新时间
-    FOREIGN KEY (post_id) REFERENCES posts(pid)        -- 外键关联到帖子表
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 外键关联到帖子表
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci ROW_FORMAT=DYNAMIC;
 
 
 -- 6. 创建帖子统计表
 CREATE TABLE IF NOT EXISTS post_stats (
     _id INT AUTO_INCREMENT PRIMARY KEY,                -- 系统主键（自增）
-    psid VARCHAR(36) NOT NULL UNIQUE,                  -- 业务主键（UUID，对外使用）
-    post_id VARCHAR(36) NOT NULL UNIQUE,               -- 帖子业务主键（FK -> posts.pid）
+    psid BINARY(16)  NOT NULL UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+    post_id BINARY(16)  NOT NULL UNIQUE,               -- 帖子业务主键（FK -> posts.pid）
     like_count INT DEFAULT 0,                          -- 点赞数
     comment_count INT DEFAULT 0,                       -- 帖子总评论数
-    FOREIGN KEY (post_id) REFERENCES posts(pid)        -- 外键关联到帖子表
+    FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 外键关联到帖子表
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 帖子点赞分片计数：点赞增量按用户分散到 16 个分片，后台任务定期汇总进 post_stats.like_count
+CREATE TABLE IF NOT EXISTS post_like_counter_shards (
+    post_id BINARY(16) NOT NULL,                     -- 帖子业务主键（FK -> posts.pid）
+    shard_id SMALLINT NOT NULL,                      -- 分片编号 0 ~ 15
+    delta INT NOT NULL DEFAULT 0,                    -- 尚未汇总进 post_stats 的点赞增量
+    PRIMARY KEY (post_id, shard_id),
+    FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 硬删帖子时一并删除
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
 -- 7. 创建评论表
 CREATE TABLE IF NOT EXISTS comments (
     _id INT AUTO_INCREMENT PRIMARY KEY,               -- 系统主键（自增）
-    cid VARCHAR(36) NOT NULL UNIQUE,                  -- 业务主键（UUID，对外使用）
-    post_id VARCHAR(36) NOT NULL,                     -- 评论ID（FK -> posts.pid）
+    cid BINARY(16) NOT NULL UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID 二进制存储，由数据库生成）
+    post_id BINARY(16)  NOT NULL,                     -- 评论ID（FK -> posts.pid）
     comment_count INT DEFAULT 0,                      -- 评论的评论数
-    author_id VARCHAR(36) NOT NULL,                   -- 评论作者业务主键（FK -> users.uid）
-    parent_id VARCHAR(36) NULL,                       -- 父评论业务主键
-    root_id VARCHAR(36) NULL,                         -- 顶级评论业务主键（整楼聚合）
+    author_id BINARY(16)  NOT NULL,                   -- 评论作者业务主键（FK -> users.uid）
+    parent_id BINARY(16) NULL,                        -- 父评论业务主键
+    root_id BINARY(16) NULL,                          -- 顶级评论业务主键（整楼聚合）
     like_count INT NOT NULL DEFAULT 0,                -- 评论点赞数（物化计数）
     status TINYINT NOT NULL DEFAULT 0,                -- 0 正常 / 1 折叠
     review_status TINYINT NOT NULL DEFAULT 0,         -- 0 待审 / 1 通过 / 2 拒绝
@@ -112,40 +125,128 @@ CREATE TABLE IF NOT EXISTS comments (
     reviewed_at TIMESTAMP NULL,                                                           -- 审核时间
     deleted_at TIMESTAMP NULL,                                                            -- 软删除
 
-    FOREIGN KEY (post_id) REFERENCES posts(pid),      -- 外键关联到帖子表
+    FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE,  -- 外键关联到帖子表（硬删帖子时级联删除评论）
     FOREIGN KEY (author_id) REFERENCES users(uid),     -- 外键关联到用户表
     INDEX idx_comments_author (author_id),
     INDEX idx_comments_parent (parent_id),
-    INDEX idx_comments_root (root_id)
+    INDEX idx_comments_post_cover (post_id, deleted_at, created_at, status, review_status),
+    INDEX idx_comments_root_cover (root_id, deleted_at, created_at, status, review_status),
+    INDEX idx_comments_listing (post_id, parent_id, status, deleted_at, created_at, review_status)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
 -- 8. 创建评论内容表
 CREATE TABLE IF NOT EXISTS comment_contents (
     _id INT AUTO_INCREMENT PRIMARY KEY,             -- 系统主键（自增）
-    ccid VARCHAR(36) NOT NULL UNIQUE,               -- 业务主键（UUID，对外使用）
-    comment_id VARCHAR(36) NOT NULL,                -- 评论ID（FK -> comments.cid)
+    ccid BINARY(16) NOT NULL UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+    comment_id BINARY(16) NOT NULL,                 -- 评论ID（FK -> comments.cid)
     content TEXT NOT NULL,                          -- 评论内容
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,                              -- 创建时间
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 更新时间
-    FOREIGN KEY (comment_id) REFERENCES comments(cid)  -- 外键关联评论内容表
+    FOREIGN KEY (comment_id) REFERENCES comments(cid) ON DELETE CASCADE  -- 外键关联评论表
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
 -- 9. 创建点赞表
 CREATE TABLE IF NOT EXISTS likes (
     _id INT AUTO_INCREMENT PRIMARY KEY,              -- 系统主键（自增）
-    lid VARCHAR(36) UNIQUE,                          -- 业务主键（UUID）
-    user_id VARCHAR(36) NOT NULL,                    -- 用户 ID (FK -> users.id)
+    lid BINARY(16)  UNIQUE DEFAULT (UUID_TO_BIN(UUID())),  -- 业务主键（UUID，由数据库生成）
+    user_id BINARY(16)  NOT NULL,                    -- 用户 ID (FK -> users.uid)
     target_type SMALLINT,                            -- 点赞目标类型（0: 帖子, 1: 评论）
-    target_id VARCHAR(36) NOT NULL,                  -- 点赞目标 ID（帖子 ID 或 评论 ID）
+    target_id BINARY(16)  NOT NULL,                  -- 点赞目标 ID（帖子 ID 或 评论 ID）
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- 点赞时间
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 更新时间
     deleted_at TIMESTAMP NULL,                       -- 软删除时间戳
     
     CONSTRAINT uq_likes_user_target UNIQUE (user_id, target_type, target_id),
     CONSTRAINT fk_likes_user FOREIGN KEY (user_id) REFERENCES users(uid),
-    INDEX idx_likes_user_target_type (user_id, target_type),
-    INDEX idx_likes_target_type_id   (target_type, target_id),
-    INDEX idx_likes_created_at       (created_at)
+    INDEX idx_likes_user_target_type (user_id, target_type, deleted_at),
+    INDEX idx_likes_target_type_id_user (target_type, target_id, user_id, deleted_at),
+    INDEX idx_likes_created_at       (created_at),
+    INDEX idx_likes_target_created   (target_type, target_id, deleted_at, created_at),
+    INDEX idx_likes_user_created     (user_id, deleted_at, created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- 10. 创建首页信息流物化表（只存对他人可见的帖子，由下面的触发器维护）
+CREATE TABLE IF NOT EXISTS feed_items (
+    _id INT AUTO_INCREMENT PRIMARY KEY,              -- 系统主键（自增）
+    pid BINARY(16)  NOT NULL UNIQUE,                 -- 帖子业务主键（FK -> posts.pid）
+    post_seq INT NOT NULL,                           -- 帖子系统主键 posts._id，用于与原列表一致的排序
+    author_id BINARY(16)  NOT NULL,                  -- 作者 ID
+    title VARCHAR(160) NOT NULL DEFAULT '',          -- 帖子标题
+    like_count INT NOT NULL DEFAULT 0,               -- 点赞数
+    comment_count INT NOT NULL DEFAULT 0,            -- 评论数
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,  -- 最近一次同步时间
+    FOREIGN KEY (pid) REFERENCES posts(pid) ON DELETE CASCADE,  -- 硬删帖子时一并删除
+    INDEX idx_feed_items_post_seq (post_seq)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 触发器：posts 可见性变化时加入 / 移出信息流，内容和统计变化时同步卡片字段
+-- 可见 = 未软删 + 已发布(1) + 审核通过(1) + 公开(0)，与 SQLAlchemyPostRepository._viewer_query 保持一致
+DROP TRIGGER IF EXISTS trg_posts_feed_ai;
+DROP TRIGGER IF EXISTS trg_posts_feed_au;
+DROP TRIGGER IF EXISTS trg_post_contents_feed_ai;
+DROP TRIGGER IF EXISTS trg_post_contents_feed_au;
+DROP TRIGGER IF EXISTS trg_post_stats_feed_ai;
+DROP TRIGGER IF EXISTS trg_post_stats_feed_au;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_posts_feed_ai AFTER INSERT ON posts FOR EACH ROW
+BEGIN
+    IF NEW.deleted_at IS NULL AND NEW.publish_status = 1 AND NEW.review_status = 1 AND NEW.visibility = 0 THEN
+        INSERT INTO feed_items (pid, post_seq, author_id, title, like_count, comment_count)
+        SELECT NEW.pid, NEW._id, NEW.author_id,
+               COALESCE((SELECT pc.title FROM post_contents pc WHERE pc.post_id = NEW.pid LIMIT 1), ''),
+               COALESCE((SELECT ps.like_count FROM post_stats ps WHERE ps.post_id = NEW.pid), 0),
+               COALESCE((SELECT ps.comment_count FROM post_stats ps WHERE ps.post_id = NEW.pid), 0)
+        ON DUPLICATE KEY UPDATE post_seq = VALUES(post_seq);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_posts_feed_au AFTER UPDATE ON posts FOR EACH ROW
+BEGIN
+    IF NEW.deleted_at IS NULL AND NEW.publish_status = 1 AND NEW.review_status = 1 AND NEW.visibility = 0 THEN
+        INSERT INTO feed_items (pid, post_seq, author_id, title, like_count, comment_count)
+        SELECT NEW.pid, NEW._id, NEW.author_id,
+               COALESCE((SELECT pc.title FROM post_contents pc WHERE pc.post_id = NEW.pid LIMIT 1), ''),
+               COALESCE((SELECT ps.like_count FROM post_stats ps WHERE ps.post_id = NEW.pid), 0),
+               COALESCE((SELECT ps.comment_count FROM post_stats ps WHERE ps.post_id = NEW.pid), 0)
+        ON DUPLICATE KEY UPDATE post_seq = VALUES(post_seq);
+    ELSE
+        DELETE FROM feed_items WHERE pid = NEW.pid;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_post_contents_feed_ai AFTER INSERT ON post_contents FOR EACH ROW
+BEGIN
+    UPDATE feed_items SET title = NEW.title WHERE pid = NEW.post_id;
+END$$
+
+CREATE TRIGGER trg_post_contents_feed_au AFTER UPDATE ON post_contents FOR EACH ROW
+BEGIN
+    IF NOT (NEW.title <=> OLD.title) THEN
+        UPDATE feed_items SET title = NEW.title WHERE pid = NEW.post_id;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_post_stats_feed_ai AFTER INSERT ON post_stats FOR EACH ROW
+BEGIN
+    UPDATE feed_items SET like_count = NEW.like_count, comment_count = NEW.comment_count WHERE pid = NEW.post_id;
+END$$
+
+CREATE TRIGGER trg_post_stats_feed_au AFTER UPDATE ON post_stats FOR EACH ROW
+BEGIN
+    UPDATE feed_items SET like_count = NEW.like_count, comment_count = NEW.comment_count WHERE pid = NEW.post_id;
+END$$
+
+DELIMITER ;
+
+-- 回填：已有库重新执行本脚本时，把当前可见的帖子补进信息流
+INSERT IGNORE INTO feed_items (pid, post_seq, author_id, title, like_count, comment_count)
+SELECT p.pid, p._id, p.author_id, COALESCE(pc.title, ''), COALESCE(ps.like_count, 0), COALESCE(ps.comment_count, 0)
+FROM posts p
+LEFT JOIN post_contents pc ON pc.post_id = p.pid
+LEFT JOIN post_stats ps ON ps.post_id = p.pid
+WHERE p.deleted_at IS NULL AND p.publish_status = 1 AND p.review_status = 1 AND p.visibility = 0;
@@ -8,6 +8,15 @@ def load_json(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+# 以 BINARY(16) 存储 UUID 的列，插入时需要用 UUID_TO_BIN 转换
+BINARY_UUID_COLUMNS = {
+    'users': {'uid'},
+    'user_stats': {'user_id'},
+    'posts': {'pid', 'author_id'},
+    'post_contents': {'pcid', 'post_id'},
+    'post_stats': {'psid', 'post_id'},
+}
+
 def generate_sql():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     mock_dir = os.path.join(script_dir, 'mock_data')
@@ -29,12 +38,16 @@ def generate_sql():
         for row in data:
             columns = ", ".join([f"`{k}`" for k in row.keys()])
             
+            binary_columns = BINARY_UUID_COLUMNS.get(table, set())
             values = []
-            for v in row.values():
+            for k, v in row.items():
                 if isinstance(v, str):
                     # 处理 SQL 注入需要的单引号等转义问题
                     escaped_v = v.replace("\\", "\\\\").replace("'", "''")
-                    values.append(f"'{escaped_v}'")
+                    if k in binary_columns:
+                        values.append(f"UUID_TO_BIN('{escaped_v}')")
+                    else:
+                        values.append(f"'{escaped_v}'")
                 elif v is None:
                     values.append("NULL")
                 else:
@@ -0,0 +1,47 @@
+-- 帖子 / 评论的子表外键改为 ON DELETE CASCADE（新建库见 init_db.sql）
+-- ORM 关系已改成 passive_deletes，硬删帖子 / 评论只发一条 DELETE，子表行交给数据库级联删除；
+-- 旧库上这几条外键没有 CASCADE，硬删会因外键约束失败
+-- 涉及：post_contents.post_id / post_stats.post_id / comments.post_id -> posts.pid
+--       comment_contents.comment_id -> comments.cid
+-- 需要用 mysql 命令行客户端执行（用到 DELIMITER）；执行前请先备份
+
+USE forumhub;
+
+DROP PROCEDURE IF EXISTS recreate_fk_cascade;
+
+DELIMITER //
+-- 按列找到原外键（建表时未命名，名字由 MySQL 生成）删掉，再以固定名字重建为 ON DELETE CASCADE
+CREATE PROCEDURE recreate_fk_cascade(
+    IN p_table VARCHAR(64), IN p_column VARCHAR(64),
+    IN p_ref_table VARCHAR(64), IN p_ref_column VARCHAR(64), IN p_fk_name VARCHAR(64)
+)
+BEGIN
+    SET @fk := (
+        SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = p_table
+          AND COLUMN_NAME = p_column AND REFERENCED_TABLE_NAME = p_ref_table
+        LIMIT 1
+    );
+    IF @fk IS NOT NULL THEN
+        SET @sql := CONCAT('ALTER TABLE ', p_table, ' DROP FOREIGN KEY ', @fk);
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+
+    SET @sql := CONCAT(
+        'ALTER TABLE ', p_table, ' ADD CONSTRAINT ', p_fk_name,
+        ' FOREIGN KEY (', p_column, ') REFERENCES ', p_ref_table, '(', p_ref_column, ') ON DELETE CASCADE'
+    );
+    PREPARE stmt FROM @sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+END //
+DELIMITER ;
+
+CALL recreate_fk_cascade('post_contents',    'post_id',    'posts',    'pid', 'fk_post_contents_post');
+CALL recreate_fk_cascade('post_stats',       'post_id',    'posts',    'pid', 'fk_post_stats_post');
+CALL recreate_fk_cascade('comments',         'post_id',    'posts',    'pid', 'fk_comments_post');
+CALL recreate_fk_cascade('comment_contents', 'comment_id', 'comments', 'cid', 'fk_comment_contents_comment');
+
+DROP PROCEDURE recreate_fk_cascade;
@@ -0,0 +1,7 @@
+-- 前台帖子评论列表专用索引：(post_id, parent_id, status, deleted_at) 等值定位后按 created_at 顺序读取
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+ALTER TABLE comments
+    ADD INDEX idx_comments_listing (post_id, parent_id, status, deleted_at, created_at, review_status);
@@ -0,0 +1,61 @@
+-- 将 comments / comment_contents 的 UUID 业务主键从 VARCHAR(36) 迁移到 BINARY(16)
+-- 适用于按旧版 init_db.sql 建表、已有数据的库（需要 MySQL 8.0+，依赖 UUID_TO_BIN）
+-- 执行前请先备份：mysqldump -u root forumhub comments comment_contents > backup.sql
+
+USE forumhub;
+
+-- 1. 先解除 comment_contents -> comments 的外键，否则无法修改被引用列的类型
+SET @fk := (
+    SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = 'forumhub' AND TABLE_NAME = 'comment_contents'
+      AND COLUMN_NAME = 'comment_id' AND REFERENCED_TABLE_NAME = 'comments'
+    LIMIT 1
+);
+SET @sql := CONCAT('ALTER TABLE comment_contents DROP FOREIGN KEY ', @fk);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 2. 新增二进制列并回填
+ALTER TABLE comments
+    ADD COLUMN cid_bin BINARY(16) NULL,
+    ADD COLUMN parent_id_bin BINARY(16) NULL,
+    ADD COLUMN root_id_bin BINARY(16) NULL;
+
+UPDATE comments SET
+    cid_bin = UUID_TO_BIN(cid),
+    parent_id_bin = IF(parent_id IS NULL, NULL, UUID_TO_BIN(parent_id)),
+    root_id_bin = IF(root_id IS NULL, NULL, UUID_TO_BIN(root_id));
+
+ALTER TABLE comment_contents
+    ADD COLUMN ccid_bin BINARY(16) NULL,
+    ADD COLUMN comment_id_bin BINARY(16) NULL;
+
+UPDATE comment_contents SET
+    ccid_bin = UUID_TO_BIN(ccid),
+    comment_id_bin = UUID_TO_BIN(comment_id);
+
+-- 3. 用二进制列替换原列（索引随旧列一起删除，随后按 init_db.sql 重建）
+ALTER TABLE comments
+    DROP INDEX idx_comments_parent,
+    DROP INDEX idx_comments_root,
+    DROP COLUMN cid,
+    DROP COLUMN parent_id,
+    DROP COLUMN root_id,
+    RENAME COLUMN cid_bin TO cid,
+    RENAME COLUMN parent_id_bin TO parent_id,
+    RENAME COLUMN root_id_bin TO root_id,
+    MODIFY cid BINARY(16) NOT NULL,
+    ADD UNIQUE KEY unique_cid (cid),
+    ADD INDEX idx_comments_parent (parent_id),
+    ADD INDEX idx_comments_root (root_id);
+
+ALTER TABLE comment_contents
+    DROP COLUMN ccid,
+    DROP COLUMN comment_id,
+    RENAME COLUMN ccid_bin TO ccid,
+    RENAME COLUMN comment_id_bin TO comment_id,
+    MODIFY ccid BINARY(16) NOT NULL,
+    MODIFY comment_id BINARY(16) NOT NULL,
+    ADD UNIQUE KEY (ccid),
+    ADD FOREIGN KEY (comment_id) REFERENCES comments(cid) ON DELETE CASCADE;  -- 硬删评论时由数据库级联删除内容
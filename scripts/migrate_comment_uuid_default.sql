@@ -0,0 +1,8 @@
+-- comments.cid 改由数据库生成后，给已有库补上列默认值（新建库见 init_db.sql）
+-- migrate_comment_uuid_binary.sql 只把 cid 改成 BINARY(16) NOT NULL，没有默认值，
+-- 应用插入评论时不再传 cid，不补默认值会直接插入失败
+-- 需要 MySQL 8.0.13+（列默认值支持表达式）；要求已先执行 migrate_comment_uuid_binary.sql
+
+USE forumhub;
+
+ALTER TABLE comments MODIFY cid BINARY(16) NOT NULL DEFAULT (UUID_TO_BIN(UUID()));
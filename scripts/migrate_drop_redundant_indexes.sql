@@ -0,0 +1,7 @@
+-- 删除与唯一约束重复的普通索引
+-- user_stats.user_id 已有 UNIQUE (user_id)，idx_user_stats_user_id 只会增加写入成本
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+ALTER TABLE user_stats DROP INDEX idx_user_stats_user_id;
@@ -0,0 +1,12 @@
+-- 列表查询的排序索引：点赞列表（按目标 / 按用户）按 created_at 倒序、待审帖子队列按 _id 倒序，
+-- 等值列 + deleted_at 定位后直接按索引顺序读取，不再 filesort
+-- 作者帖子列表已由 idx_posts_author_id (author_id, deleted_at) + 隐含主键 _id 覆盖，不再新增
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+ALTER TABLE likes
+    ADD INDEX idx_likes_target_created (target_type, target_id, deleted_at, created_at),
+    ADD INDEX idx_likes_user_created (user_id, deleted_at, created_at);
+
+ALTER TABLE posts ADD INDEX idx_posts_review_status (review_status, deleted_at);
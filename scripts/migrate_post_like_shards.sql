@@ -0,0 +1,12 @@
+-- 新增帖子点赞分片计数表：点赞 / 取消点赞只写分片增量，由应用后台任务每 5 秒汇总进 post_stats.like_count
+-- 已有的 post_stats.like_count 保持不变，作为汇总基数，无需回填
+
+USE forumhub;
+
+CREATE TABLE IF NOT EXISTS post_like_counter_shards (
+    post_id BINARY(16) NOT NULL,                     -- 帖子业务主键（FK -> posts.pid）
+    shard_id SMALLINT NOT NULL,                      -- 分片编号 0 ~ 15
+    delta INT NOT NULL DEFAULT 0,                    -- 尚未汇总进 post_stats 的点赞增量
+    PRIMARY KEY (post_id, shard_id),
+    FOREIGN KEY (post_id) REFERENCES posts(pid) ON DELETE CASCADE  -- 硬删帖子时一并删除
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
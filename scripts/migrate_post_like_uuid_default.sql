@@ -0,0 +1,23 @@
+-- pid / pcid / psid / lid / ccid 改由数据库生成后，给已有库补上列默认值（新建库见 init_db.sql）
+-- migrate_post_uuid_binary.sql / migrate_comment_uuid_binary.sql 只改了列类型，没有默认值：
+-- 应用插入时不再传这些列，可空列会写入 NULL，NOT NULL 列会直接插入失败
+-- 需要 MySQL 8.0.13+（列默认值支持表达式）；要求已先执行上述两个迁移脚本
+
+USE forumhub;
+
+-- 只改默认值、不改类型，外键引用的 posts.pid 也可以直接 MODIFY；保险起见迁移期间关闭外键检查
+SET FOREIGN_KEY_CHECKS = 0;
+
+ALTER TABLE posts            MODIFY pid  BINARY(16) NULL     DEFAULT (UUID_TO_BIN(UUID()));
+ALTER TABLE post_contents    MODIFY pcid BINARY(16) NULL     DEFAULT (UUID_TO_BIN(UUID()));
+ALTER TABLE post_stats       MODIFY psid BINARY(16) NOT NULL DEFAULT (UUID_TO_BIN(UUID()));
+ALTER TABLE likes            MODIFY lid  BINARY(16) NULL     DEFAULT (UUID_TO_BIN(UUID()));
+ALTER TABLE comment_contents MODIFY ccid BINARY(16) NOT NULL DEFAULT (UUID_TO_BIN(UUID()));
+
+-- 补默认值之前已经写进去的 NULL 业务主键补生成一个
+-- （posts.pid 为 NULL 的帖子插不进内容 / 统计行，这里只保证之后能按 pid 定位到它）
+UPDATE posts         SET pid  = UUID_TO_BIN(UUID()) WHERE pid  IS NULL;
+UPDATE post_contents SET pcid = UUID_TO_BIN(UUID()) WHERE pcid IS NULL;
+UPDATE likes         SET lid  = UUID_TO_BIN(UUID()) WHERE lid  IS NULL;
+
+SET FOREIGN_KEY_CHECKS = 1;
@@ -0,0 +1,9 @@
+-- 帖子审核状态加 CHECK 约束：只能是 0 待审 / 1 通过 / 2 拒绝（MySQL 8.0.16+ 才会真正校验）
+-- 审核接口改为条件更新 UPDATE ... WHERE review_status IN (...)，非法取值由数据库直接拒绝
+-- 执行前请先确认没有越界数据：SELECT COUNT(*) FROM posts WHERE review_status NOT IN (0, 1, 2);
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+ALTER TABLE posts
+    ADD CONSTRAINT ck_posts_review_status CHECK (review_status IN (0, 1, 2));
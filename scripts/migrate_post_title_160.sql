@@ -0,0 +1,11 @@
+-- 将帖子标题从 VARCHAR(255) 收紧到 VARCHAR(160)，并把 post_contents 设为 DYNAMIC 行格式
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+-- 1. 校验：超过 160 字符的标题需要先人工处理，结果不为 0 时不要继续执行后面的 ALTER
+SELECT COUNT(*) AS too_long_titles FROM post_contents WHERE CHAR_LENGTH(title) > 160;
+
+-- 2. 收紧列宽（严格模式下如果仍有超长标题会直接报错，不会静默截断）
+ALTER TABLE post_contents MODIFY title VARCHAR(160) NOT NULL, ROW_FORMAT=DYNAMIC;
+ALTER TABLE feed_items    MODIFY title VARCHAR(160) NOT NULL DEFAULT '';
@@ -0,0 +1,33 @@
+-- 将帖子相关表与点赞表的 UUID 列从 VARCHAR(36) 迁移到 BINARY(16)
+-- 涉及：posts.pid / post_contents.pcid, post_id / post_stats.psid, post_id /
+--       comments.post_id / likes.lid, target_id
+-- 需要 MySQL 8.0+；要求已先执行 migrate_comment_uuid_binary.sql
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+-- 迁移期间关闭外键检查，保证 posts.pid 与引用它的各列可以逐个修改类型
+SET FOREIGN_KEY_CHECKS = 0;
+
+-- 1. 先改成 VARBINARY(36)：保留原字节，避免把二进制写回 utf8mb4 列时报字符集错误
+ALTER TABLE posts         MODIFY pid VARBINARY(36) NULL;
+ALTER TABLE post_contents MODIFY pcid VARBINARY(36) NULL, MODIFY post_id VARBINARY(36) NOT NULL;
+ALTER TABLE post_stats    MODIFY psid VARBINARY(36) NOT NULL, MODIFY post_id VARBINARY(36) NOT NULL;
+ALTER TABLE comments      MODIFY post_id VARBINARY(36) NOT NULL;
+ALTER TABLE likes         MODIFY lid VARBINARY(36) NULL, MODIFY target_id VARBINARY(36) NOT NULL;
+
+-- 2. 文本 UUID 转成 16 字节（与 UUID_TO_BIN(uuid) 结果一致）
+UPDATE posts         SET pid = UNHEX(REPLACE(pid, '-', ''));
+UPDATE post_contents SET pcid = UNHEX(REPLACE(pcid, '-', '')), post_id = UNHEX(REPLACE(post_id, '-', ''));
+UPDATE post_stats    SET psid = UNHEX(REPLACE(psid, '-', '')), post_id = UNHEX(REPLACE(post_id, '-', ''));
+UPDATE comments      SET post_id = UNHEX(REPLACE(post_id, '-', ''));
+UPDATE likes         SET lid = UNHEX(REPLACE(lid, '-', '')), target_id = UNHEX(REPLACE(target_id, '-', ''));
+
+-- 3. 定长 BINARY(16)
+ALTER TABLE posts         MODIFY pid BINARY(16) NULL;
+ALTER TABLE post_contents MODIFY pcid BINARY(16) NULL, MODIFY post_id BINARY(16) NOT NULL;
+ALTER TABLE post_stats    MODIFY psid BINARY(16) NOT NULL, MODIFY post_id BINARY(16) NOT NULL;
+ALTER TABLE comments      MODIFY post_id BINARY(16) NOT NULL;
+ALTER TABLE likes         MODIFY lid BINARY(16) NULL, MODIFY target_id BINARY(16) NOT NULL;
+
+SET FOREIGN_KEY_CHECKS = 1;
@@ -0,0 +1,12 @@
+-- 让 deleted_at IS NULL 参与索引定位：评论覆盖索引把 deleted_at 提到等值列之后，用户表新增 (deleted_at, created_at)
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+ALTER TABLE comments
+    DROP INDEX idx_comments_post_cover,
+    DROP INDEX idx_comments_root_cover,
+    ADD INDEX idx_comments_post_cover (post_id, deleted_at, created_at, status, review_status),
+    ADD INDEX idx_comments_root_cover (root_id, deleted_at, created_at, status, review_status);
+
+ALTER TABLE users ADD INDEX idx_users_deleted_created (deleted_at, created_at);
@@ -0,0 +1,7 @@
+-- 新用户的 uid 改为时间有序：UUID_TO_BIN(UUID(), 1) 把 v1 UUID 的时间高位换到最前面
+-- 已有用户的 uid 保持不变（它们已被各表外键引用），只影响之后新建的用户
+-- 应用侧统一按 16 字节原样转成字符串（与 BIN_TO_UUID(uid) 不带交换参数的结果一致），新旧 uid 可以混用
+
+USE forumhub;
+
+ALTER TABLE users MODIFY uid BINARY(16) NULL DEFAULT (UUID_TO_BIN(UUID(), 1));
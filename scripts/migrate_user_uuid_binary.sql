@@ -0,0 +1,46 @@
+-- 将 users.uid 及所有引用它的列从 VARCHAR(36) 迁移到 BINARY(16)
+-- 涉及：users.uid / user_stats.user_id / follows.user_id, followed_user_id /
+--       posts.author_id / comments.author_id / likes.user_id
+-- 需要 MySQL 8.0+；要求已先执行 migrate_post_uuid_binary.sql
+-- 要求现有 uid 都是标准 UUID 字符串（非 UUID 的测试账号需先改成 UUID，否则会被转成 NULL）
+-- 执行前请先备份：mysqldump -u root forumhub > backup.sql
+
+USE forumhub;
+
+-- 迁移期间关闭外键检查，保证 users.uid 与引用它的各列可以逐个修改类型
+SET FOREIGN_KEY_CHECKS = 0;
+
+-- 1. 先改成 VARBINARY(36)：保留原字节，避免把二进制写回 utf8mb4 列时报字符集错误
+ALTER TABLE users      MODIFY uid VARBINARY(36) NULL;
+ALTER TABLE user_stats MODIFY user_id VARBINARY(36) NOT NULL;
+ALTER TABLE follows    MODIFY user_id VARBINARY(36) NOT NULL, MODIFY followed_user_id VARBINARY(36) NOT NULL;
+ALTER TABLE posts      MODIFY author_id VARBINARY(36) NOT NULL;
+ALTER TABLE comments   MODIFY author_id VARBINARY(36) NOT NULL;
+ALTER TABLE likes      MODIFY user_id VARBINARY(36) NOT NULL;
+
+-- 2. 文本 UUID 转成 16 字节（与 UUID_TO_BIN(uuid) 结果一致）
+UPDATE users      SET uid = UNHEX(REPLACE(uid, '-', ''));
+UPDATE user_stats SET user_id = UNHEX(REPLACE(user_id, '-', ''));
+UPDATE follows    SET user_id = UNHEX(REPLACE(user_id, '-', '')), followed_user_id = UNHEX(REPLACE(followed_user_id, '-', ''));
+UPDATE posts      SET author_id = UNHEX(REPLACE(author_id, '-', ''));
+UPDATE comments   SET author_id = UNHEX(REPLACE(author_id, '-', ''));
+UPDATE likes      SET user_id = UNHEX(REPLACE(user_id, '-', ''));
+
+-- 3. 定长 BINARY(16)，uid 改由数据库生成
+ALTER TABLE users      MODIFY uid BINARY(16) NULL DEFAULT (UUID_TO_BIN(UUID()));
+ALTER TABLE user_stats MODIFY user_id BINARY(16) NOT NULL;
+ALTER TABLE follows    MODIFY user_id BINARY(16) NOT NULL, MODIFY followed_user_id BINARY(16) NOT NULL;
+ALTER TABLE posts      MODIFY author_id BINARY(16) NOT NULL;
+ALTER TABLE comments   MODIFY author_id BINARY(16) NOT NULL;
+ALTER TABLE likes      MODIFY user_id BINARY(16) NOT NULL;
+
+SET FOREIGN_KEY_CHECKS = 1;
+
+-- 4. 校验：所有引用 users.uid 的外键列类型都应与 users.uid 一致，结果应为 0
+SELECT COUNT(*) AS mistyped_user_fks
+FROM information_schema.KEY_COLUMN_USAGE k
+JOIN information_schema.COLUMNS c
+  ON c.TABLE_SCHEMA = k.TABLE_SCHEMA AND c.TABLE_NAME = k.TABLE_NAME AND c.COLUMN_NAME = k.COLUMN_NAME
+WHERE k.TABLE_SCHEMA = 'forumhub'
+  AND k.REFERENCED_TABLE_NAME = 'users'
+  AND c.COLUMN_TYPE <> 'binary(16)';
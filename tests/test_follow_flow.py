@@ -0,0 +1,93 @@
+"""
+关注接口的状态流转：首次关注 200 → 重复关注 400 → 取关后再关注 200
+
+- 用内存 sqlite 代替 MySQL，关掉 insert RETURNING，和 MySQL 一样走“无 RETURNING”的执行路径
+- MySQL 的 INSERT IGNORE 在 sqlite 上编译成等价的 INSERT OR IGNORE
+- 计数增量写 Redis 的部分用一个只记录调用的假 pipeline 代替，不需要真的 Redis
+"""
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.mysql.dml import Insert as MySQLInsert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  注册全部映射
+from app.core.redis_client import get_redis
+from app.main import app
+from app.models.base import Base
+from app.models.user import User
+from app.storage.database import get_db
+
+
+@compiles(MySQLInsert, "sqlite")
+def _insert_ignore_on_sqlite(element, compiler, **kw):
+    return compiler.visit_insert(element, **kw).replace("INSERT IGNORE", "INSERT OR IGNORE", 1)
+
+
+class _FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+    def execute(self):
+        return []
+
+
+class _FakeRedis:
+    def pipeline(self, transaction=True):
+        return _FakePipeline()
+
+
+def _make_client():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    # 与 MySQL 一致：INSERT 不支持 RETURNING
+    engine.dialect.insert_returning = False
+
+    @event.listens_for(engine, "connect")
+    def _register_functions(dbapi_conn, _):
+        dbapi_conn.create_function("UUID", 0, lambda: str(uuid.uuid4()))
+        dbapi_conn.create_function("UUID_TO_BIN", 1, lambda s: uuid.UUID(s).bytes)
+        dbapi_conn.create_function("UUID_TO_BIN", 2, lambda s, _flag: uuid.UUID(s).bytes)
+
+    Base.metadata.create_all(engine)
+
+    uids = [str(uuid.uuid4()) for _ in range(2)]
+    with Session(engine) as db:
+        for i, uid in enumerate(uids):
+            db.add(User(uid=uid, username=f"user{i}", phone=f"1380000000{i}", password="x"))
+        db.commit()
+
+    def _get_db():
+        db = Session(engine)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_redis] = lambda: _FakeRedis()
+    return TestClient(app), uids
+
+
+def test_follow_duplicate_and_refollow():
+    client, (uid, target) = _make_client()
+    body = {"user_id": uid, "followed_user_id": target}
+    try:
+        # 首次关注
+        assert client.post("/follows/", json=body).status_code == 200
+        # 重复关注
+        assert client.post("/follows/", json=body).status_code == 400
+        # 取关后再关注
+        assert client.request("DELETE", "/follows/soft", json=body).status_code == 200
+        assert client.post("/follows/", json=body).status_code == 200
+    finally:
+        app.dependency_overrides.clear()
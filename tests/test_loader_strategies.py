@@ -0,0 +1,32 @@
+"""
+关系加载策略的防回退检查（不需要数据库）：
+
+- 任何关系都不允许 lazy="subquery"：会把父查询（含分页 / JOIN）再套一层派生表重跑
+- 一对多 / 多对多集合不允许 lazy="joined"：结果集按子记录数放大，分页也会被打乱
+"""
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.orm.interfaces import MANYTOMANY, ONETOMANY
+
+import app.models  # noqa: F401  注册全部映射
+from app.models.base import Base
+
+
+def _relationships():
+    configure_mappers()
+    for mapper in Base.registry.mappers:
+        for rel in mapper.relationships:
+            yield mapper, rel
+
+
+def test_no_subquery_loading():
+    offenders = [f"{m.class_.__name__}.{r.key}" for m, r in _relationships() if r.lazy == "subquery"]
+    assert not offenders, f'lazy="subquery" is not allowed: {offenders}'
+
+
+def test_no_joined_loading_on_collections():
+    offenders = [
+        f"{m.class_.__name__}.{r.key}"
+        for m, r in _relationships()
+        if r.lazy == "joined" and r.direction in (ONETOMANY, MANYTOMANY)
+    ]
+    assert not offenders, f'lazy="joined" on a collection is not allowed: {offenders}'